@@ -0,0 +1,79 @@
+"""entity_memory.py
+
+Measure the memory footprint of GTM entity wrappers, excluding the API
+representations they wrap, which are retained by the version body anyway.
+
+Usage::
+
+    PYTHONPATH=. python benchmarks/entity_memory.py [number of entities]
+"""
+
+import os
+import sys
+import json
+import tracemalloc
+
+from httplib2 import Http
+from googleapiclient.discovery import build_from_document
+
+from gtm_manager.tag import GTMTag
+from gtm_manager.trigger import GTMTrigger
+from gtm_manager.variable import GTMVariable
+from gtm_manager.parameter import GTMParameter
+from gtm_manager.built_in_variable import GTMBuiltInVariable
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "data")
+PARENT = "accounts/1234/containers/1234/workspaces/1"
+
+
+def load(file_name):
+    """load"""
+    with open(os.path.join(DATA_DIR, file_name)) as file:
+        return json.load(file)
+
+
+def measure(factory, bodies):
+    """Return the average number of bytes allocated per entity."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    entities = [factory(x) for x in bodies]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(x.size_diff for x in after.compare_to(before, "filename"))
+    del entities
+    return size / len(bodies)
+
+
+def main(count):
+    """main"""
+    service = build_from_document(load("tagmanager_v2_discovery.json"), http=Http())
+    version = load("version_get.json")
+
+    cases = [
+        (
+            "GTMTag",
+            lambda x: GTMTag(tag=x, parent=PARENT, service=service),
+            version["tag"][0],
+        ),
+        (
+            "GTMTrigger",
+            lambda x: GTMTrigger(trigger=x, parent=PARENT, service=service),
+            version["trigger"][0],
+        ),
+        (
+            "GTMVariable",
+            lambda x: GTMVariable(variable=x, parent=PARENT, service=service),
+            version["variable"][0],
+        ),
+        ("GTMParameter", GTMParameter, version["tag"][0]["parameter"][0]),
+        ("GTMBuiltInVariable", GTMBuiltInVariable, version["builtInVariable"][0]),
+    ]
+
+    for name, factory, body in cases:
+        bodies = [json.loads(json.dumps(body)) for _ in range(count)]
+        print("{:<20} {:>10.0f} bytes/entity".format(name, measure(factory, bodies)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -31,12 +31,16 @@ SERVICE_VERSION = "v2"
 CREDENTIALS_FILE_NAME = "_auth_credentials.json"
 CLIENT_SECRET_FILE = "client_secret.json"
 HEADLESS_AUTH = False
+# Validate asset bodies against the discovery document before they are sent
+VALIDATE_BODIES = True
 
 GENERIC_REQUEST_ERROR = "Returned an error response for your request."
 NO_LIVE_VERSION_ERROR = "Published container version not found"
 BACKEND_ERROR = "Backend Error"
 RATE_LIMIT_ERROR = "Quota exceeded for quota group"
 
+ALL_PAGES_TRIGGER_ID = "2147479553"
+
 DEFAULT_HTTP_TIMEOUT_SEC = 60
 RATE_LIMIT_CALLS = 24
 RATE_LIMIT_PERIOD = 100
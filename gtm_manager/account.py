@@ -2,6 +2,7 @@
 import gtm_manager.base
 import gtm_manager.container
 import gtm_manager.permission
+from gtm_manager.path import GTMPath
 
 
 class GTMAccount(gtm_manager.base.GTMBase):
@@ -34,7 +35,7 @@ class GTMAccount(gtm_manager.base.GTMBase):
         self._shareData = account.get("shareData", False)
         self._tagManagerUrl = account.get("tagManagerUrl")
         self._fingerprint = account.get("fingerprint")
-        self._path = account.get("path")
+        self._path = GTMPath(account["path"]) if account.get("path") else None
         self._accountId = account.get("accountId")
 
         self._list_containers = None
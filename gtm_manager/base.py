@@ -6,16 +6,62 @@ from gtm_manager.utils_auth import build_http
 from gtm_manager import SERVICE_NAME, SERVICE_VERSION
 
 
+def build_service(service=None, credentials=None):
+    """Return the given Tag Manager API service or build a new one.
+
+    Args:
+        service (obj): An existing Tag Manager API service to reuse.
+        credentials (obj): Credentials used to build a new service, if :code:`service` is not set.
+
+    Returns:
+        The Tag Manager API service.
+    """
+    if service:
+        return service
+    return discovery.build(
+        SERVICE_NAME,
+        SERVICE_VERSION,
+        http=build_http(credentials=credentials),
+        cache_discovery=False,
+    )
+
+
+def restore(cls, view):
+    """Recreate a pickled resource from its view. The API service is not pickled, the resource
+    builds a new one on first use.
+
+    Args:
+        cls (type): The resource class, a subclass of the view class and :class:`GTMBase`.
+        view (obj): The view holding the API representation of the resource.
+
+    Returns:
+        The resource.
+    """
+    resource = cls.__new__(cls)
+    for klass in cls.__mro__:
+        for slot in getattr(klass, "__slots__", ()):
+            setattr(resource, slot, getattr(view, slot, None))
+    return resource
+
+
 class GTMBase(object):
-    """GTMBase"""
+    """GTMBase
+
+    Subclasses, that define :code:`__slots__`, need the slot :code:`_service`.
+    """
+
+    __slots__ = ()
 
     def __init__(self, service=None, credentials=None):
-        if service:
-            self.service = service
-        else:
-            self.service = discovery.build(
-                SERVICE_NAME,
-                SERVICE_VERSION,
-                http=build_http(credentials=credentials),
-                cache_discovery=False,
-            )
+        self.service = build_service(service=service, credentials=credentials)
+
+    @property
+    def service(self):
+        """obj: The Tag Manager API service. Unpickled resources build it on first use."""
+        if self._service is None:
+            self._service = build_service()
+        return self._service
+
+    @service.setter
+    def service(self, service):
+        self._service = service
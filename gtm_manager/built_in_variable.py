@@ -8,46 +8,49 @@ class GTMBuiltInVariable(object):
         - built_in_variable (dict): An API representation of the GTM Built In Variable.
     """
 
+    __slots__ = ("_raw_body",)
+
     def __init__(self, built_in_variable):
-        self._path = built_in_variable.get("path")
-        self._accountId = built_in_variable.get("accountId")
-        self._containerId = built_in_variable.get("containerId")
-        self._workspaceId = built_in_variable.get("workspaceId")
-        self._type = built_in_variable.get("type")
-        self._name = built_in_variable.get("name")
+        self._raw_body = built_in_variable
 
     @property
     def path(self):
         """str: Account display name
         """
-        return self._path
+        return self._raw_body.get("path")
 
     @property
     def accountId(self):
         """str: Account display name
         """
-        return self._accountId
+        return self._raw_body.get("accountId")
 
     @property
     def containerId(self):
         """str: Account display name
         """
-        return self._containerId
+        return self._raw_body.get("containerId")
 
     @property
     def workspaceId(self):
         """str: Account display name
         """
-        return self._workspaceId
+        return self._raw_body.get("workspaceId")
 
     @property
     def name(self):
         """str: Account display name
         """
-        return self._name
+        return self._raw_body.get("name")
 
     @property
     def type(self):
         """str: Account display name
         """
-        return self._type
+        return self._raw_body.get("type")
+
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
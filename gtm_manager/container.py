@@ -6,6 +6,7 @@ import gtm_manager.workspace
 import gtm_manager.version
 
 from gtm_manager import NO_LIVE_VERSION_ERROR
+from gtm_manager.path import GTMPath
 
 
 class GTMContainer(gtm_manager.base.GTMBase):
@@ -43,7 +44,7 @@ class GTMContainer(gtm_manager.base.GTMBase):
         self._tagManagerUrl = container.get("tagManagerUrl")
         self._usageContext = container.get("usageContext")
         self._fingerprint = container.get("fingerprint")
-        self._path = container.get("path")
+        self._path = GTMPath(container["path"]) if container.get("path") else None
         self._accountId = container.get("accountId")
         self._name = container.get("name")
 
@@ -223,3 +224,54 @@ class GTMContainer(gtm_manager.base.GTMBase):
                 for x in response.get("containerVersionHeader") or []
             ]
         return self._version_headers
+
+    def bisect(self, predicate, cache=None, refresh=True):
+        """Binary search the versions of the container for the version, that introduced a change.
+
+        The versions are ordered by their container version id, deleted versions are skipped. The
+        predicate has to be false for all versions before the change and true for all versions
+        after it. Only about log2(N) of the N versions are loaded.
+
+        Args:
+            predicate (callable): Called with a :class:`gtm_manager.version.GTMVersionView`,
+                returns whether the change is present in the version.
+            cache (dict): The version paths as keys and versions as values. Versions in the cache
+                are not loaded from the API, loaded versions are added to it as
+                :class:`gtm_manager.version.GTMVersionView` s, which hold no API service. A
+                persistent mapping, i.e. a :mod:`shelve`, keeps the versions between runs.
+            refresh (bool): Load the version headers from the API, see
+                :meth:`list_version_headers`.
+
+        Returns:
+            The :class:`gtm_manager.version.GTMVersionHeader` of the first version the predicate
+            is true for, or :code:`None` if it is false for the latest version.
+        """
+        headers = sorted(
+            (x for x in self.list_version_headers(refresh=refresh) if not x.deleted),
+            key=lambda x: int(x.containerVersionId),
+        )
+        cache = {} if cache is None else cache
+
+        def test(header):
+            version = cache.get(header.path)
+            if version is None:
+                version = gtm_manager.version.GTMVersionView(
+                    gtm_manager.version.GTMVersion(
+                        path=header.path, service=self.service
+                    ).raw_body
+                )
+                cache[header.path] = version
+            return predicate(version)
+
+        if not headers or not test(headers[-1]):
+            return None
+
+        # the predicate is true for headers[high]
+        low, high = 0, len(headers) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if test(headers[middle]):
+                high = middle
+            else:
+                low = middle + 1
+        return headers[high]
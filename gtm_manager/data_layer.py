@@ -0,0 +1,47 @@
+"""data_layer.py"""
+
+
+def merge(model, push):
+    """Merge a dataLayer push into the data model, like the GTM data layer does: objects are merged
+    recursively, all other values are overwritten. The model is changed in place, the push is not
+    referenced by the model.
+
+    Args:
+        model (dict): The data model.
+        push (dict): The pushed object.
+
+    Returns:
+        The data model.
+    """
+    for key, value in push.items():
+        if isinstance(value, dict):
+            current = model.get(key)
+            model[key] = merge(current if isinstance(current, dict) else {}, value)
+        else:
+            model[key] = value
+    return model
+
+
+def get(model, key):
+    """Read a key from the data model. Dots in the key address nested objects and array items,
+    i.e. "ecommerce.purchase.products.0.id".
+
+    Args:
+        model (dict): The data model.
+        key (str): The data layer variable name.
+
+    Returns:
+        The value or :code:`None`, if the key is not set.
+    """
+    if key in model:
+        return model[key]
+
+    value = model
+    for part in key.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
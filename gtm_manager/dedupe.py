@@ -0,0 +1,206 @@
+"""dedupe.py"""
+import re
+import zlib
+
+from gtm_manager.search import parameter_values
+from gtm_manager.utils import canonical_hash
+
+# Fields, that differ between copies of the same tag in different containers
+IGNORED_FIELDS = (
+    "name",
+    "notes",
+    "parentFolderId",
+    "firingTriggerId",
+    "blockingTriggerId",
+    "firingRuleId",
+    "blockingRuleId",
+    "setupTag",
+    "teardownTag",
+)
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_MASK = (1 << 64) - 1
+_EMPTY = _MASK + 1
+
+
+def canonical_tag_hash(tag):
+    """Hash a tag independent of its ids, fingerprint, path, name, folder and triggers."""
+    return canonical_hash({k: v for k, v in tag.items() if k not in IGNORED_FIELDS})
+
+
+def shingles(tag, size=3):
+    """The set of hashed token shingles of the type and parameter values of a tag."""
+    tokens = [tag.get("type") or ""]
+    for key, value in parameter_values(tag.get("parameter")):
+        tokens.append(key)
+        tokens.extend(_TOKEN.findall(value))
+
+    if len(tokens) < size:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))}
+    return {
+        zlib.crc32(" ".join(tokens[i : i + size]).encode("utf-8"))
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+def minhash(hashes, num_perm=128):
+    """Compute a one permutation MinHash signature: every hash is mixed into 64 bits, its bin is
+    selected by the high bits and each bin keeps its minimum. Empty bins are filled from the next
+    non-empty bin, so that signatures of small sets stay comparable. This costs a single pass over
+    the hashes instead of one pass per permutation.
+
+    Args:
+        hashes (set): Integer hashes, i.e. from :func:`shingles`.
+        num_perm (int): The signature length.
+
+    Returns:
+        A tuple of :code:`num_perm` ints.
+    """
+    bins = [_EMPTY] * num_perm
+    for value in hashes:
+        mixed = (value * 0x9E3779B97F4A7C15 + 0x632BE59BD9B4E019) & _MASK
+        index = (mixed >> 32) * num_perm >> 32
+        if mixed < bins[index]:
+            bins[index] = mixed
+
+    if all(x == _EMPTY for x in bins):
+        return tuple(bins)
+
+    # rotation densification: an empty bin borrows the next filled bin, offset by the distance
+    for index in range(num_perm):
+        if bins[index] == _EMPTY:
+            distance = 1
+            while bins[(index + distance) % num_perm] == _EMPTY:
+                distance += 1
+            bins[index] = bins[(index + distance) % num_perm] + distance * _EMPTY
+    return tuple(bins)
+
+
+def jaccard(first, second):
+    """The Jaccard similarity of two sets."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+class GTMDedupe(object):
+    """Find duplicate and near-duplicate tags across container versions and workspaces.
+
+    Exact duplicates have the same canonical body, ignoring ids, fingerprints, paths, names,
+    notes, folders and triggers. Near-duplicates are found with MinHash signatures of the token
+    shingles of their parameter values and locality sensitive hashing: only tags sharing a band
+    of their signatures are compared, so the work grows linearly with the number of tags. The
+    candidates are verified with their exact Jaccard similarity.
+
+    Args:
+        threshold (float): The minimum Jaccard similarity of near-duplicates.
+        num_perm (int): The MinHash signature length.
+        bands (int): The number of LSH bands, :code:`num_perm` has to be a multiple of it. More
+            bands find pairs with a lower similarity at the cost of more candidates.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32):
+        if num_perm % bands:
+            raise ValueError("num_perm has to be a multiple of bands.")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        # canonical hash -> tags with that body
+        self._groups = {}
+        # canonical hash -> shingles of the body
+        self._shingles = {}
+
+    def add(self, parent, tag):
+        """Add a tag.
+
+        Args:
+            parent (str): The path of the version or workspace of the tag.
+            tag (dict): The API representation of the tag.
+        """
+        key = canonical_tag_hash(tag)
+        if key not in self._groups:
+            self._groups[key] = []
+            self._shingles[key] = shingles(tag)
+        self._groups[key].append(
+            {"parent": parent, "id": tag.get("tagId"), "name": tag.get("name")}
+        )
+
+    def add_version(self, version):
+        """Add all tags of a version or workspace.
+
+        Args:
+            version (:class:`gtm_manager.version.GTMVersionView`): The version, i.e. a live
+                version or the :code:`quick_preview` of a workspace.
+        """
+        for tag in version.raw_body.get("tag") or []:
+            self.add(version.path, tag)
+
+    def exact_duplicates(self):
+        """Find tags with the same canonical body.
+
+        Returns:
+            A list of groups of at least two tags, each tag a dict with the keys :code:`parent`,
+            :code:`id` and :code:`name`. The largest groups come first.
+        """
+        groups = [x for x in self._groups.values() if len(x) > 1]
+        return sorted(groups, key=len, reverse=True)
+
+    def near_duplicates(self):
+        """Find clusters of tags with similar parameter values.
+
+        Returns:
+            A list of clusters with at least two different canonical bodies, each cluster a dict
+            with the keys :code:`similarity` (the lowest verified similarity of the cluster) and
+            :code:`tags` (the tag dicts, see :meth:`exact_duplicates`). The largest clusters come
+            first.
+        """
+        keys = list(self._groups)
+        rows = self.num_perm // self.bands
+        buckets = {}
+        for position, key in enumerate(keys):
+            signature = minhash(self._shingles[key], self.num_perm)
+            for band in range(self.bands):
+                band_key = (band, signature[band * rows : (band + 1) * rows])
+                buckets.setdefault(band_key, []).append(position)
+
+        parents = list(range(len(keys)))
+
+        def find(position):
+            while parents[position] != position:
+                parents[position] = parents[parents[position]]
+                position = parents[position]
+            return position
+
+        similarities = {}
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1 :]:
+                    root_first, root_second = find(first), find(second)
+                    if root_first == root_second:
+                        continue
+                    similarity = jaccard(
+                        self._shingles[keys[first]], self._shingles[keys[second]]
+                    )
+                    if similarity < self.threshold:
+                        continue
+                    parents[root_second] = root_first
+                    similarities[root_first] = min(
+                        similarity,
+                        similarities.get(root_first, 1.0),
+                        similarities.pop(root_second, 1.0),
+                    )
+
+        clusters = {}
+        for position in range(len(keys)):
+            clusters.setdefault(find(position), []).append(position)
+
+        results = [
+            {
+                "similarity": similarities[root],
+                "tags": [tag for x in members for tag in self._groups[keys[x]]],
+            }
+            for root, members in clusters.items()
+            if len(members) > 1
+        ]
+        return sorted(results, key=lambda x: len(x["tags"]), reverse=True)
@@ -0,0 +1,175 @@
+"""estate.py"""
+import logging
+import datetime
+import collections
+import concurrent.futures
+
+
+def _count(value):
+    """Parse a count, that the API returns as a string."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def header_counts(header):
+    """The entity counts of a version header.
+
+    Args:
+        header (:class:`gtm_manager.version.GTMVersionHeader`): The version header.
+
+    Returns:
+        A dict with the keys :code:`containerVersionId`, :code:`tags`, :code:`triggers`,
+        :code:`variables` and :code:`zones`. Headers of old versions count triggers and variables
+        as rules and macros.
+    """
+    return {
+        "containerVersionId": header.containerVersionId,
+        "tags": _count(header.numTags),
+        "triggers": _count(header.numTriggers or header.numRules),
+        "variables": _count(header.numVariables or header.numMacros),
+        "zones": _count(header.numZones),
+    }
+
+
+def load_version_headers(containers, max_workers=4):
+    """Load the version headers of many containers concurrently.
+
+    The underlying http clients are not thread safe. Every container therefore needs to be
+    initialized with its own :code:`service` or :code:`credentials`.
+
+    Args:
+        containers (list): :class:`gtm_manager.container.GTMContainer` s.
+        max_workers (int): Number of containers processed in parallel.
+
+    Returns:
+        A dict with the container paths as keys and lists of their
+        :class:`gtm_manager.version.GTMVersionHeader` s as values. If a container failed, the
+        value is the raised exception.
+    """
+    results = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(container.list_version_headers): container
+            for container in containers
+        }
+        for future in concurrent.futures.as_completed(futures):
+            container = futures[future]
+            try:
+                results[container.path] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error(error)
+                results[container.path] = error
+
+    return results
+
+
+class GTMEstateReport(object):
+    """Statistics of all containers computed from their version headers only, without loading a
+    single version.
+
+    Version headers do not carry timestamps. Versions are therefore dated by the date they were
+    first seen, see :meth:`gtm_manager.ledger.GTMLedger.first_seen`, which is only accurate for
+    versions created after the ledger started recording.
+
+    Args:
+        version_headers (dict): The container paths as keys and lists of their
+            :class:`gtm_manager.version.GTMVersionHeader` s as values, i.e. the result of
+            :func:`load_version_headers`. Containers that failed to load are ignored.
+        first_seen (dict): The version paths as keys and their ISO dates as values.
+    """
+
+    def __init__(self, version_headers, first_seen=None):
+        self.first_seen = first_seen or {}
+        self.version_headers = {
+            path: sorted(
+                (x for x in headers if not x.deleted),
+                key=lambda x: _count(x.containerVersionId),
+            )
+            for path, headers in version_headers.items()
+            if isinstance(headers, list)
+        }
+        self._deleted = {
+            path: sum(bool(x.deleted) for x in headers)
+            for path, headers in version_headers.items()
+            if isinstance(headers, list)
+        }
+
+    def entity_counts(self):
+        """Count the entities of the latest version of every container.
+
+        Returns:
+            A dict with the container paths as keys and dicts with the keys of
+            :func:`header_counts` and :code:`versions` and :code:`deleted` (the number of versions
+            and deleted versions) as values. Containers without versions have no
+            :code:`containerVersionId` and no entities.
+        """
+        results = {}
+        for path, headers in self.version_headers.items():
+            counts = (
+                header_counts(headers[-1])
+                if headers
+                else {
+                    "containerVersionId": None,
+                    "tags": 0,
+                    "triggers": 0,
+                    "variables": 0,
+                    "zones": 0,
+                }
+            )
+            counts["versions"] = len(headers)
+            counts["deleted"] = self._deleted[path]
+            results[path] = counts
+        return results
+
+    def growth_curves(self):
+        """The entity counts of every version of every container.
+
+        Returns:
+            A dict with the container paths as keys and lists of :func:`header_counts`, ordered by
+            container version id, as values. Each count also has the key :code:`date`, the date
+            the version was first seen or :code:`None`.
+        """
+        return {
+            path: [
+                dict(header_counts(x), date=self.first_seen.get(x.path))
+                for x in headers
+            ]
+            for path, headers in self.version_headers.items()
+        }
+
+    def versions_per_week(self):
+        """Count the versions created per week, by the dates they were first seen.
+
+        Returns:
+            An :class:`collections.OrderedDict` with ISO weeks, i.e. "2020-W07", as keys and the
+            number of versions as values, ordered by week. Versions without a date are not counted.
+        """
+        weeks = {}
+        for headers in self.version_headers.values():
+            for header in headers:
+                date = self.first_seen.get(header.path)
+                if not date:
+                    continue
+                year, week, _ = (
+                    datetime.datetime.strptime(date, "%Y-%m-%d").date().isocalendar()
+                )
+                key = "{}-W{:02d}".format(year, week)
+                weeks[key] = weeks.get(key, 0) + 1
+        return collections.OrderedDict(sorted(weeks.items()))
+
+    def summary(self):
+        """Summarize the estate.
+
+        Returns:
+            A dict with the keys :code:`containers`, :code:`versions`, :code:`tags`,
+            :code:`triggers`, :code:`variables` and :code:`zones`, the totals over the latest
+            versions of all containers.
+        """
+        counts = self.entity_counts().values()
+        summary = {"containers": len(counts)}
+        for key in ("versions", "tags", "triggers", "variables", "zones"):
+            summary[key] = sum(x[key] for x in counts)
+        return summary
@@ -55,3 +55,15 @@ class RateLimitExceeded(GTMManagerException):
     """RateLimitExceeded"""
 
     pass
+
+
+class ValidationError(GTMManagerException):
+    """ValidationError"""
+
+    def __init__(self, schema, errors):
+        super(ValidationError, self).__init__()
+        self.schema = schema
+        self.errors = errors
+
+    def __str__(self):
+        return "Invalid {} body: {}".format(self.schema, "; ".join(self.errors))
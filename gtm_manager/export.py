@@ -0,0 +1,207 @@
+"""export.py"""
+import os
+import gzip
+import json
+import itertools
+import logging
+import concurrent.futures
+import threading
+
+from googleapiclient.errors import HttpError
+
+import gtm_manager.base
+from gtm_manager import NO_LIVE_VERSION_ERROR
+
+WORKSPACE_ENTITIES = (
+    ("tag", "tags", "tag"),
+    ("trigger", "triggers", "trigger"),
+    ("variable", "variables", "variable"),
+    ("folder", "folders", "folder"),
+    ("builtInVariable", "built_in_variables", "builtInVariable"),
+)
+
+
+def _list_all(method, item_key, **kwargs):
+    """Yield all items of a paginated list method."""
+    page_token = None
+    while True:
+        if page_token:
+            kwargs["pageToken"] = page_token
+        response = method(**kwargs).execute()
+        yield from response.get(item_key) or []
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            break
+
+
+def _record(record_type, data):
+    """Serialize a single NDJSON line."""
+    return json.dumps({"type": record_type, "data": data}, separators=(",", ":")) + "\n"
+
+
+class GTMExporter(object):
+    """Export all accounts, containers, live versions and workspace entities a user has access to
+    as newline delimited JSON.
+
+    Every line is an object with the keys :code:`type` ("account", "container", "version",
+    "workspace", "tag", "trigger", "variable", "folder" or "builtInVariable") and :code:`data`,
+    the API representation as returned from the API. API responses are written as they are loaded
+    without creating GTM objects. Only the responses of the containers in progress are held in
+    memory.
+
+    Args:
+        service_factory (callable): Returns a new Tag Manager API service. The underlying http
+            clients are not thread safe, therefore every worker uses its own service. Defaults to
+            building a service from :code:`credentials`.
+        credentials (obj): Credentials used to build the services, if no :code:`service_factory`
+            is set.
+        max_workers (int): Number of containers exported in parallel.
+    """
+
+    def __init__(self, service_factory=None, credentials=None, max_workers=4):
+        if service_factory is None:
+
+            def service_factory():
+                return gtm_manager.base.build_service(credentials=credentials)
+
+        self._service_factory = service_factory
+        self._max_workers = max_workers
+        self._local = threading.local()
+
+    @property
+    def service(self):
+        """obj: The Tag Manager API service of the current thread, created on first use."""
+        if getattr(self._local, "service", None) is None:
+            self._local.service = self._service_factory()
+        return self._local.service
+
+    def export(self, output, checkpoint=None):
+        """Export the GTM estate.
+
+        Args:
+            output (str): The file path to write to. If the path ends with ".gz", the output is
+                gzip compressed.
+            checkpoint (str): Optional path of a JSON file to record finished accounts and
+                containers in. If the checkpoint exists, the export resumes: finished accounts and
+                containers are skipped and the output is appended to.
+
+        Returns:
+            A dict with the container paths as keys and the number of exported records as values.
+            If a container failed, the value is the raised exception. Failed containers are not
+            recorded in the checkpoint and are retried on the next run.
+        """
+        completed = self._load_checkpoint(checkpoint)
+        mode = "at" if completed else "wt"
+
+        if output.endswith(".gz"):
+            file = gzip.open(output, mode, encoding="utf-8")
+        else:
+            file = open(output, mode, encoding="utf-8")
+
+        with file:
+            containers = []
+            accounts_service = self.service.accounts()  # pylint: disable=E1101
+
+            for account in _list_all(accounts_service.list, "account"):
+                account_containers = list(
+                    _list_all(
+                        accounts_service.containers().list,
+                        "container",
+                        parent=account["path"],
+                    )
+                )
+                if account["path"] not in completed:
+                    file.write(_record("account", account))
+                    file.writelines(_record("container", x) for x in account_containers)
+                    self._save_checkpoint(checkpoint, completed, account["path"], file)
+
+                containers.extend(
+                    x["path"] for x in account_containers if x["path"] not in completed
+                )
+
+            return self._export_containers(containers, file, checkpoint, completed)
+
+    def _export_containers(self, containers, file, checkpoint, completed):
+        """Export containers in parallel and write their records as they finish. Only
+        :code:`max_workers` containers are in flight and every future is dropped as soon as its
+        records are written, so that the records of finished containers are not held in memory.
+        """
+        results = {}
+        containers = iter(containers)
+        futures = {}
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self._max_workers
+        ) as executor:
+            while True:
+                for path in itertools.islice(
+                    containers, self._max_workers - len(futures)
+                ):
+                    futures[executor.submit(self._container_records, path)] = path
+                if not futures:
+                    break
+
+                done, _ = concurrent.futures.wait(
+                    futures, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    path = futures.pop(future)
+                    try:
+                        records = future.result()
+                    except Exception as error:  # pylint: disable=broad-except
+                        logging.error(error)
+                        results[path] = error
+                        continue
+
+                    file.writelines(records)
+                    self._save_checkpoint(checkpoint, completed, path, file)
+                    results[path] = len(records)
+
+        return results
+
+    def _container_records(self, path):
+        """Load the live version and all workspace entities of a container as NDJSON lines."""
+        accounts_service = self.service.accounts()  # pylint: disable=E1101
+        containers_service = accounts_service.containers()
+        records = []
+
+        try:
+            version = containers_service.versions().live(parent=path).execute()
+            records.append(_record("version", version))
+        except HttpError as error:
+            if NO_LIVE_VERSION_ERROR not in str(error):
+                raise error
+
+        workspaces_service = containers_service.workspaces()
+        for workspace in _list_all(workspaces_service.list, "workspace", parent=path):
+            records.append(_record("workspace", workspace))
+
+            for record_type, resource, item_key in WORKSPACE_ENTITIES:
+                method = getattr(workspaces_service, resource)().list
+                records.extend(
+                    _record(record_type, x)
+                    for x in _list_all(method, item_key, parent=workspace["path"])
+                )
+
+        return records
+
+    @staticmethod
+    def _load_checkpoint(checkpoint):
+        """_load_checkpoint"""
+        if not checkpoint or not os.path.exists(checkpoint):
+            return set()
+        with open(checkpoint) as file:
+            return set(json.load(file).get("completed") or [])
+
+    @staticmethod
+    def _save_checkpoint(checkpoint, completed, path, output):
+        """Record a finished path, after its records have been flushed to the output."""
+        completed.add(path)
+        if not checkpoint:
+            return
+
+        output.flush()
+        tmp = "{}.tmp".format(checkpoint)
+        with open(tmp, "w") as file:
+            json.dump({"completed": sorted(completed)}, file)
+        os.replace(tmp, checkpoint)
@@ -1,101 +1,184 @@
 """folder.py"""
+from googleapiclient.errors import HttpError
 
 import gtm_manager.base
+from gtm_manager.utils import canonical_hash, is_fingerprint_conflict
+from gtm_manager.path import GTMPath
 
 
-class GTMFolder(gtm_manager.base.GTMBase):
-    """Open a specific GTM Folder.
+class GTMFolderView(object):
+    """Read-only view of a GTM Folder API representation. The view does not hold an API service
+    and can be pickled, i.e. to analyse exported versions in a process pool. A pickled
+    :class:`GTMFolder` is unpickled without its API service, which is built again on first use.
 
     Args:
-        folder (dict): An API representation of the GTM Folder. If provided, the resource will be not be
-            loaded from the API. :code:`folder` or :code:`path` argument must be set.
-        path (str): The API path to the resource, i.e.
-            "accounts/1234/containers/1234/workspaces/1234/folders/123". If provided instead of
-            :code:`folder`, the representation will be loaded from the API. :code:`path` or
-            :code:`folder` argument must be set.
-        parent (str): Required, when the instance is initialized with a :code:`folder` argument to
-            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
-        **kwargs: Additional keyword args to initialize the base class.
+        folder (dict): An API representation of the GTM Folder.
+        path (str): The API path to the resource. Defaults to the :code:`path` of the
+            representation.
+        parent (str): The parent path used to build the resource path, if :code:`path` is not set,
+            i.e. "accounts/1234/containers/1234/workspaces/1234"
     """
 
-    def __init__(self, folder=None, path=None, parent=None, **kwargs):
-        super().__init__(**kwargs)
+    __slots__ = ("_raw_body", "_path")
 
-        self.folders_service = (
-            self.service.accounts().containers().workspaces().folders()
-        )  # pylint: disable=E1101
+    def __init__(self, folder, path=None, parent=None):
+        self._raw_body = folder
+        self._path = GTMPath(
+            path
+            or folder.get("path")
+            or "{}/folders/{}".format(parent, folder.get("folderId"))
+        )
 
-        if folder:
-            pass
-        elif path:
-            folder = self._get_folder(path)
-        else:
-            raise ValueError("Please pass either a folder obj or folder path.")
-
-        self._containerId = folder.get("containerId")
-        self._notes = folder.get("notes", "")
-        self._workspaceId = folder.get("workspaceId")
-        self._tagManagerUrl = folder.get("tagManagerUrl")
-        self._fingerprint = folder.get("fingerprint")
-        self._folderId = folder.get("folderId")
-        self._accountId = folder.get("accountId")
-        self._name = folder.get("name")
-        self._path = path or "{}/folders/{}".format(parent, self.folderId)
+    def __reduce__(self):
+        return (GTMFolderView, (self._raw_body, self._path))
 
     @property
     def containerId(self):
         """str: The container that this version was taken from.
         """
-        return self._containerId
+        return self._raw_body.get("containerId")
 
     @property
     def notes(self):
         """str: The container that this version was taken from.
         """
-        return self._notes
+        return self._raw_body.get("notes", "")
 
     @property
     def workspaceId(self):
         """str: The container that this version was taken from.
         """
-        return self._workspaceId
+        return self._raw_body.get("workspaceId")
 
     @property
     def tagManagerUrl(self):
         """str: The container that this version was taken from.
         """
-        return self._tagManagerUrl
+        return self._raw_body.get("tagManagerUrl")
 
     @property
     def fingerprint(self):
         """str: The container that this version was taken from.
         """
-        return self._fingerprint
+        return self._raw_body.get("fingerprint")
 
     @property
     def folderId(self):
         """str: The container that this version was taken from.
         """
-        return self._folderId
+        return self._raw_body.get("folderId")
 
     @property
     def accountId(self):
         """str: The container that this version was taken from.
         """
-        return self._accountId
+        return self._raw_body.get("accountId")
 
     @property
     def name(self):
         """str: The container that this version was taken from.
         """
-        return self._name
+        return self._raw_body.get("name")
 
     @property
     def path(self):
-        """str: The container that this version was taken from.
+        """:class:`gtm_manager.path.GTMPath`: GTM Folder's API relative path.
         """
         return self._path
 
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
+
+
+class GTMFolder(GTMFolderView, gtm_manager.base.GTMBase):
+    """Open a specific GTM Folder.
+
+    Args:
+        folder (dict): An API representation of the GTM Folder. If provided, the resource will be not be
+            loaded from the API. :code:`folder` or :code:`path` argument must be set.
+        path (str): The API path to the resource, i.e.
+            "accounts/1234/containers/1234/workspaces/1234/folders/123". If provided instead of
+            :code:`folder`, the representation will be loaded from the API. :code:`path` or
+            :code:`folder` argument must be set.
+        parent (str): Required, when the instance is initialized with a :code:`folder` argument to
+            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
+        **kwargs: Additional keyword args to initialize the base class.
+    """
+
+    __slots__ = ("_service", "_folders_service")
+
+    def __init__(self, folder=None, path=None, parent=None, **kwargs):
+        gtm_manager.base.GTMBase.__init__(self, **kwargs)
+
+        self._folders_service = None
+
+        if folder:
+            pass
+        elif path:
+            folder = self._get_folder(path)
+        else:
+            raise ValueError("Please pass either a folder obj or folder path.")
+
+        super().__init__(folder, path=path, parent=parent)
+
+    def __reduce__(self):
+        return (
+            gtm_manager.base.restore,
+            (GTMFolder, GTMFolderView(self._raw_body, self._path)),
+        )
+
+    @property
+    def folders_service(self):
+        """obj: The Tag Manager API resource for folders, created on first use.
+        """
+        if self._folders_service is None:
+            self._folders_service = (
+                self.service.accounts().containers().workspaces().folders()
+            )  # pylint: disable=E1101
+        return self._folders_service
+
+    def update(self, refresh=False, **kwargs):
+        """Update the current folder. The folder's API representation as cached in
+        :attr:`raw_body` is sent, patched with the fields explicitly set as keyword arguments.
+
+        Args:
+            refresh (bool): The update is sent with the cached fingerprint. If the API rejects it
+                as stale, reload the folder, re-apply the update and send it again. Otherwise, the
+                API error is raised.
+            **kwargs: Resource properties to update with this call, i.e. :code:`name` or
+                :code:`notes`.
+
+        Returns:
+            :code:`True` if the folder was written, :code:`False` if the API request was skipped
+            because the update body did not differ from the cached state.
+
+        Raises:
+            :class:`googleapiclient.errors.HttpError`: If the update failed, i.e. because the
+                cached fingerprint is stale and :code:`refresh` is not set.
+        """
+        update_asset = {**self._raw_body, **kwargs}
+        update_asset = {k: v for k, v in update_asset.items() if v is not None}
+
+        if canonical_hash(update_asset) == canonical_hash(self._raw_body):
+            return False
+
+        request = self.folders_service.update(
+            path=self.path, body=update_asset, fingerprint=self.fingerprint
+        )
+        try:
+            response = request.execute()
+        except HttpError as error:
+            if not refresh or not is_fingerprint_conflict(error):
+                raise error
+            self.__init__(path=self._path, service=self.service)
+            return self.update(**kwargs)
+
+        self.__init__(folder=response, service=self.service)
+        return True
+
     def _get_folder(self, path):
         """_get_container"""
         request = self.folders_service.get(path=path)
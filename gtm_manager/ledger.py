@@ -0,0 +1,145 @@
+"""ledger.py"""
+import os
+import json
+import logging
+import datetime
+
+import gtm_manager.manager
+
+
+class GTMLedger(object):
+    """A persistent record of the last seen state of containers: their :code:`fingerprint` and the
+    id of their latest container version. It also records the date every container version was
+    first seen, as version headers do not carry timestamps.
+
+    Args:
+        path (str): The JSON file the ledger is stored in. It is created on the first
+            :meth:`save`.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._containers = {}
+        self._versions = {}
+
+        if os.path.exists(path):
+            with open(path) as file:
+                state = json.load(file)
+            self._containers = state.get("containers") or {}
+            self._versions = state.get("versions") or {}
+
+    @staticmethod
+    def _state(container, version_headers):
+        """_state"""
+        version_ids = [
+            int(x.raw_body.get("containerVersionId")) for x in version_headers
+        ]
+        return {
+            "fingerprint": container.fingerprint,
+            "latestVersionId": str(max(version_ids)) if version_ids else None,
+        }
+
+    def changed(self, container, version_headers):
+        """Whether a container changed since it was recorded.
+
+        Args:
+            container (:class:`gtm_manager.container.GTMContainer`): The container.
+            version_headers (list): The container's
+                :class:`gtm_manager.version.GTMVersionHeader` s.
+
+        Returns:
+            :code:`True` if the container was not recorded yet or its fingerprint or latest version
+            differ from the recorded state.
+        """
+        return self._containers.get(container.path) != self._state(
+            container, version_headers
+        )
+
+    def record(self, container, version_headers):
+        """Record the current state of a container. Call :meth:`save` to persist it."""
+        self._containers[container.path] = self._state(container, version_headers)
+
+    def first_seen(self, version_headers, today=None):
+        """Record the date versions were first seen. Versions seen for the first time are recorded
+        with today's date, so that the dates of versions created before the first call are the date
+        of the first call. Call :meth:`save` to persist them.
+
+        Args:
+            version_headers (list): :class:`gtm_manager.version.GTMVersionHeader` s.
+            today (:class:`datetime.date`): The current date, defaults to the system date.
+
+        Returns:
+            A dict with the version paths as keys and the ISO dates they were first seen as
+            values.
+        """
+        today = (today or datetime.date.today()).isoformat()
+        return {
+            x.path: self._versions.setdefault(x.path, today)
+            for x in version_headers
+            if x.path
+        }
+
+    def save(self):
+        """Write the ledger to its file."""
+        tmp = "{}.tmp".format(self.path)
+        with open(tmp, "w") as file:
+            json.dump(
+                {"containers": self._containers, "versions": self._versions},
+                file,
+                sort_keys=True,
+            )
+        os.replace(tmp, self.path)
+
+
+class GTMCrawler(object):
+    """Crawl all containers a user has access to and only visit containers, that changed since the
+    last crawl.
+
+    Listing the containers of an account and their version headers is cheap compared to loading
+    versions or workspace entities. The crawler compares both with its ledger and skips unchanged
+    containers.
+
+    Args:
+        ledger (:class:`GTMLedger` or str): The ledger or the path of its file.
+        manager (:class:`gtm_manager.manager.GTMManager`): The manager used to load the accounts.
+            If not provided, a new manager is initialized with the additional keyword args.
+        **kwargs: Additional keyword args to initialize the manager.
+    """
+
+    def __init__(self, ledger, manager=None, **kwargs):
+        self.ledger = ledger if isinstance(ledger, GTMLedger) else GTMLedger(ledger)
+        self.manager = manager or gtm_manager.manager.GTMManager(**kwargs)
+
+    def crawl(self, visit):
+        """Visit all changed containers.
+
+        A container is recorded in the ledger after it has been visited successfully. If the visit
+        raises an exception, it is logged and the container is visited again on the next crawl.
+
+        Args:
+            visit (callable): Called with every changed
+                :class:`gtm_manager.container.GTMContainer`.
+
+        Returns:
+            A dict with the paths of the visited containers as keys and the return values of
+            :code:`visit` or the raised exceptions as values.
+        """
+        results = {}
+
+        for account in self.manager.list_accounts():
+            for container in account.list_containers():
+                version_headers = container.list_version_headers()
+                if not self.ledger.changed(container, version_headers):
+                    continue
+
+                try:
+                    results[container.path] = visit(container)
+                except Exception as error:  # pylint: disable=broad-except
+                    logging.error(error)
+                    results[container.path] = error
+                    continue
+
+                self.ledger.record(container, version_headers)
+                self.ledger.save()
+
+        return results
@@ -0,0 +1,312 @@
+"""lint.py"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import concurrent.futures
+
+import gtm_manager.version
+from gtm_manager.resolver import REFERENCE
+from gtm_manager.search import entity_values, parameter_values
+
+LINTED_ENTITIES = (
+    ("tag", "tagId"),
+    ("trigger", "triggerId"),
+    ("variable", "variableId"),
+    ("folder", "folderId"),
+)
+
+RULES = {}
+
+
+def lint_rule(entity_type, name=None):
+    """Register a lint rule.
+
+    A rule is a function taking the API representation of an entity and a
+    :class:`GTMLintContext` and returning a message, if the entity violates the rule, or
+    :code:`None`. Rules linted in a process pool have to be defined at module level, so that they
+    can be pickled.
+
+    Args:
+        entity_type (str): "tag", "trigger", "variable" or "folder".
+        name (str): The rule name. Defaults to the function name with dashes.
+
+    Returns:
+        A decorator registering the function in :data:`RULES`.
+    """
+
+    def register(function):
+        function.entity_type = entity_type
+        function.rule_name = name or function.__name__.replace("_", "-")
+        RULES[function.rule_name] = function
+        return function
+
+    return register
+
+
+class GTMLintContext(object):
+    """The references between the entities of a version, collected in a single pass before the
+    rules are run.
+
+    Args:
+        version (:class:`gtm_manager.version.GTMVersionView`): The version or workspace snapshot.
+        now (int): The current time in milliseconds, defaults to the system time.
+
+    Attributes:
+        version: The linted version.
+        now (int): The current time in milliseconds.
+        variable_references (set): The names of all variables referenced with :code:`{{}}`.
+        trigger_references (set): The ids of all triggers tags fire or are blocked on, including
+            the triggers of trigger groups.
+        folder_references (set): The ids of all folders containing tags, triggers or variables.
+    """
+
+    def __init__(self, version, now=None):
+        self.version = version
+        self.now = int(time.time() * 1000) if now is None else now
+        self.variable_references = set()
+        self.trigger_references = set()
+        self.folder_references = set()
+
+        body = version.raw_body
+        for entity_type, _ in LINTED_ENTITIES[:3]:
+            for entity in body.get(entity_type) or []:
+                for _, value in entity_values(entity):
+                    self.variable_references.update(REFERENCE.findall(value))
+                if entity.get("parentFolderId"):
+                    self.folder_references.add(entity["parentFolderId"])
+
+        for tag in body.get("tag") or []:
+            self.trigger_references.update(tag.get("firingTriggerId") or [])
+            self.trigger_references.update(tag.get("blockingTriggerId") or [])
+        for trigger in body.get("trigger") or []:
+            if trigger.get("type") == "triggerGroup":
+                self.trigger_references.update(
+                    x for _, x in parameter_values(trigger.get("parameter"))
+                )
+
+
+def _ms(value):
+    """Parse a millisecond timestamp, that the API returns as a string."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@lint_rule("variable")
+def unused_variable(variable, context):
+    """Variables, that are not referenced by any tag, trigger or variable."""
+    if variable.get("name") not in context.variable_references:
+        return "Variable is not referenced."
+    return None
+
+
+@lint_rule("tag")
+def tag_without_trigger(tag, context):
+    """Tags without a firing trigger never fire."""
+    if not tag.get("firingTriggerId"):
+        return "Tag has no firing trigger."
+    return None
+
+
+@lint_rule("tag")
+def expired_schedule(tag, context):
+    """Active tags, whose schedule ended, never fire again."""
+    end = _ms(tag.get("scheduleEndMs"))
+    if not tag.get("paused") and end is not None and end < context.now:
+        return "Tag schedule ended at {}.".format(end)
+    return None
+
+
+@lint_rule("tag")
+def paused_expired_tag(tag, context):
+    """Paused tags, whose schedule ended, can be deleted."""
+    end = _ms(tag.get("scheduleEndMs"))
+    if tag.get("paused") and end is not None and end < context.now:
+        return "Tag is paused and its schedule ended at {}.".format(end)
+    return None
+
+
+@lint_rule("trigger")
+def unused_trigger(trigger, context):
+    """Triggers, that no tag fires or is blocked on."""
+    if trigger.get("triggerId") not in context.trigger_references:
+        return "Trigger is not referenced."
+    return None
+
+
+@lint_rule("folder")
+def empty_folder(folder, context):
+    """Folders without tags, triggers or variables."""
+    if folder.get("folderId") not in context.folder_references:
+        return "Folder is empty."
+    return None
+
+
+class GTMLinter(object):
+    """Lint container versions and workspace snapshots with pluggable rules.
+
+    The rules are grouped by entity type, every entity type is iterated once and all of its rules
+    are applied to each entity. The linter only holds the rule functions, so that it can be
+    pickled into the processes of :meth:`lint_mirror`.
+
+    Args:
+        rules (list): The rule functions, see :func:`lint_rule`. Defaults to all registered
+            rules.
+        now (int): The time in milliseconds schedules are checked against, defaults to the
+            system time when linting.
+    """
+
+    def __init__(self, rules=None, now=None):
+        self.rules = list(RULES.values()) if rules is None else list(rules)
+        self.now = now
+
+        self._rules = {}
+        for rule in self.rules:
+            self._rules.setdefault(rule.entity_type, []).append(rule)
+
+    def lint(self, version):
+        """Lint a version.
+
+        Args:
+            version (:class:`gtm_manager.version.GTMVersionView`): The version or workspace
+                snapshot.
+
+        Returns:
+            A list of dicts with the keys :code:`rule`, :code:`type` (the entity type),
+            :code:`id`, :code:`name` and :code:`message`.
+        """
+        context = GTMLintContext(version, self.now)
+        body = version.raw_body
+
+        issues = []
+        for entity_type, id_field in LINTED_ENTITIES:
+            rules = self._rules.get(entity_type)
+            if not rules:
+                continue
+            for entity in body.get(entity_type) or []:
+                for rule in rules:
+                    message = rule(entity, context)
+                    if message:
+                        issues.append(
+                            {
+                                "rule": rule.rule_name,
+                                "type": entity_type,
+                                "id": entity.get(id_field),
+                                "name": entity.get("name"),
+                                "message": message,
+                            }
+                        )
+        return issues
+
+    def lint_mirror(self, database, paths=None, max_workers=None):
+        """Lint snapshots of a :class:`gtm_manager.mirror.GTMMirror` in a process pool. Every
+        process reads the snapshots from the database itself, only paths and issues are passed
+        between the processes.
+
+        Args:
+            database (str): The mirror database file.
+            paths (list): The version and workspace paths to lint. Defaults to the latest version
+                of every container and all workspaces.
+            max_workers (int): Number of processes, defaults to the number of CPUs.
+
+        Returns:
+            A dict with the paths as keys and their issues (see :meth:`lint`) as values. If a
+            snapshot failed, the value is the raised exception.
+        """
+        if paths is None:
+            connection = sqlite3.connect(database)
+            try:
+                paths = latest_snapshots(connection)
+            finally:
+                connection.close()
+
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            futures = {
+                executor.submit(_lint_snapshot, self, database, path): path
+                for path in paths
+            }
+            for future in concurrent.futures.as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    logging.error(error)
+                    results[path] = error
+
+        return results
+
+
+def latest_snapshots(connection):
+    """The paths of the latest mirrored version of every container and of all mirrored
+    workspaces.
+
+    Args:
+        connection (:class:`sqlite3.Connection`): The mirror database connection.
+
+    Returns:
+        A list of paths.
+    """
+    versions = connection.execute(
+        "SELECT path, MAX(CAST(container_version_id AS INTEGER)) FROM versions "
+        "WHERE deleted = 0 GROUP BY parent"
+    )
+    workspaces = connection.execute("SELECT path FROM workspaces")
+    return [x for x, _ in versions] + [x for (x,) in workspaces]
+
+
+def load_snapshot(connection, path):
+    """Load a mirrored version or workspace.
+
+    Args:
+        connection (:class:`sqlite3.Connection`): The mirror database connection.
+        path (str): The version or workspace path.
+
+    Returns:
+        A :class:`gtm_manager.version.GTMVersionView`. The body of a workspace snapshot holds its
+        path and its :code:`tag`, :code:`trigger`, :code:`variable` and :code:`folder` lists.
+
+    Raises:
+        ValueError: If the path is not mirrored.
+    """
+    row = connection.execute(
+        "SELECT body FROM versions WHERE path = ?", (path,)
+    ).fetchone()
+    if row is not None:
+        return gtm_manager.version.GTMVersionView(json.loads(row[0]))
+
+    if (
+        connection.execute(
+            "SELECT 1 FROM workspaces WHERE path = ?", (path,)
+        ).fetchone()
+        is None
+    ):
+        raise ValueError("{} is not mirrored.".format(path))
+
+    body = {"path": path}
+    for entity_type, _ in LINTED_ENTITIES:
+        body[entity_type] = [
+            json.loads(x)
+            for (x,) in connection.execute(
+                "SELECT body FROM {}s WHERE parent = ?".format(entity_type), (path,)
+            )
+        ]
+    return gtm_manager.version.GTMVersionView(body)
+
+
+# one connection per worker process and database, keyed by the process id, because forked
+# workers inherit the connections of their parent, which must not be used across a fork
+_connections = {}
+
+
+def _lint_snapshot(linter, database, path):
+    """Lint a mirrored snapshot in a worker process."""
+    key = (os.getpid(), database)
+    if key not in _connections:
+        _connections[key] = sqlite3.connect(database)
+    return linter.lint(load_snapshot(_connections[key], path))
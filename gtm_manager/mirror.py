@@ -0,0 +1,321 @@
+"""mirror.py"""
+import json
+import sqlite3
+
+import gtm_manager.manager
+import gtm_manager.version
+
+ENTITY_TABLES = (
+    ("tags", "tag", "tagId"),
+    ("triggers", "trigger", "triggerId"),
+    ("variables", "variable", "variableId"),
+    ("folders", "folder", "folderId"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    path TEXT PRIMARY KEY,
+    account_id TEXT,
+    name TEXT,
+    fingerprint TEXT,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS containers (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    account_id TEXT,
+    container_id TEXT,
+    public_id TEXT,
+    name TEXT,
+    fingerprint TEXT,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS versions (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    account_id TEXT,
+    container_id TEXT,
+    container_version_id TEXT,
+    name TEXT,
+    deleted INTEGER,
+    fingerprint TEXT,
+    body TEXT
+);
+CREATE TABLE IF NOT EXISTS workspaces (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    account_id TEXT,
+    container_id TEXT,
+    workspace_id TEXT,
+    name TEXT,
+    fingerprint TEXT,
+    body TEXT
+);
+"""
+
+ENTITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    parent TEXT,
+    id TEXT,
+    name TEXT,
+    type TEXT,
+    parent_folder_id TEXT,
+    fingerprint TEXT,
+    body TEXT,
+    PRIMARY KEY (parent, id)
+);
+"""
+
+
+def _json(body):
+    """_json"""
+    return json.dumps(body, separators=(",", ":"))
+
+
+class GTMMirror(object):
+    """A local SQLite mirror of all accounts, containers, versions and workspaces a user has
+    access to.
+
+    The database has the tables :code:`accounts`, :code:`containers`, :code:`versions`,
+    :code:`workspaces`, :code:`tags`, :code:`triggers`, :code:`variables` and :code:`folders`.
+    Every row holds the API representation as JSON in its :code:`body` column. The entity tables
+    are keyed by their :code:`parent`, which is either a workspace or a version path, and the
+    entity :code:`id`. For example, the tags of all versions of a container are selected with::
+
+        SELECT * FROM tags WHERE parent LIKE 'accounts/1234/containers/1234/versions/%'
+
+    Args:
+        database (str): The SQLite database file.
+        manager (:class:`gtm_manager.manager.GTMManager`): The manager used to load the accounts.
+            If not provided, a new manager is initialized with the additional keyword args.
+        **kwargs: Additional keyword args to initialize the manager.
+    """
+
+    def __init__(self, database, manager=None, **kwargs):
+        self.manager = manager or gtm_manager.manager.GTMManager(**kwargs)
+        self.connection = sqlite3.connect(database)
+
+        with self.connection:
+            self.connection.executescript(
+                SCHEMA
+                + "".join(ENTITY_SCHEMA.format(table=x) for x, _, _ in ENTITY_TABLES)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def sync(self):
+        """Load all changes since the last sync from the API.
+
+        Containers and workspaces are only updated if their :code:`fingerprint` changed. Versions
+        are only loaded, if their version header is not mirrored yet. Accounts, containers,
+        versions and workspaces, that are not returned by the API anymore, are removed.
+
+        Returns:
+            A dict with the number of updated :code:`accounts`, :code:`containers`,
+            :code:`versions` and :code:`workspaces`.
+        """
+        stats = {"accounts": 0, "containers": 0, "versions": 0, "workspaces": 0}
+
+        accounts = self.manager.list_accounts()
+        # list_accounts returns an empty list on API errors, never drop the whole mirror
+        if accounts:
+            known = {x for (x,) in self.connection.execute("SELECT path FROM accounts")}
+            self._remove(known - {x.path for x in accounts})
+
+        for account in accounts:
+            with self.connection:
+                stats["accounts"] += self._upsert(
+                    "accounts",
+                    account.raw_body,
+                    account_id=account.accountId,
+                    name=account.name,
+                )
+
+            containers = account.list_containers()
+            self._remove(
+                set(self._children("containers", account.path))
+                - {x.path for x in containers}
+            )
+
+            for container in containers:
+                self._sync_container(account, container, stats)
+
+        return stats
+
+    def _sync_container(self, account, container, stats):
+        """_sync_container"""
+        # the container fingerprint does not change with new versions or workspace edits, it
+        # only decides whether the container row is rewritten
+        with self.connection:
+            stats["containers"] += self._upsert(
+                "containers",
+                container.raw_body,
+                parent=account.path,
+                account_id=container.accountId,
+                container_id=container.containerId,
+                public_id=container.publicId,
+                name=container.name,
+            )
+
+        headers = [x.raw_body for x in container.list_version_headers()]
+        known = self._children("versions", container.path, column="deleted")
+        self._remove(set(known) - {x["path"] for x in headers})
+
+        for header in headers:
+            deleted = int(bool(header.get("deleted")))
+            if known.get(header["path"]) == deleted:
+                continue
+
+            body = header
+            if not deleted:
+                body = gtm_manager.version.GTMVersion(
+                    path=header["path"], service=container.service
+                ).raw_body
+
+            with self.connection:
+                self._upsert(
+                    "versions",
+                    body,
+                    force=True,
+                    parent=container.path,
+                    account_id=body.get("accountId"),
+                    container_id=body.get("containerId"),
+                    container_version_id=body.get("containerVersionId"),
+                    name=body.get("name"),
+                    deleted=deleted,
+                )
+                self._replace_entities(header["path"], body)
+            stats["versions"] += 1
+
+        workspaces = container.list_workspaces()
+        self._remove(
+            set(self._children("workspaces", container.path))
+            - {x.path for x in workspaces}
+        )
+
+        for workspace in workspaces:
+            # the fingerprint is only stored together with the entities of the workspace
+            with self.connection:
+                if not self._upsert(
+                    "workspaces",
+                    workspace.raw_body,
+                    parent=container.path,
+                    account_id=workspace.accountId,
+                    container_id=workspace.containerId,
+                    workspace_id=workspace.workspaceId,
+                    name=workspace.name,
+                ):
+                    continue
+
+                self._replace_entities(
+                    workspace.path,
+                    {
+                        "tag": [x.raw_body for x in workspace.list_tags(refresh=True)],
+                        "trigger": [
+                            x.raw_body for x in workspace.list_triggers(refresh=True)
+                        ],
+                        "variable": [
+                            x.raw_body for x in workspace.list_variables(refresh=True)
+                        ],
+                        "folder": [
+                            x.raw_body for x in workspace.list_folders(refresh=True)
+                        ],
+                    },
+                )
+            stats["workspaces"] += 1
+
+    def _children(self, table, parent, column="fingerprint"):
+        """Map the paths of the mirrored rows of a parent to a column value."""
+        rows = self.connection.execute(
+            "SELECT path, {} FROM {} WHERE parent = ?".format(column, table), (parent,)
+        )
+        return dict(rows)
+
+    def _upsert(self, table, body, force=False, **columns):
+        """Insert or replace a row, if its fingerprint changed. Return whether it was written."""
+        row = self.connection.execute(
+            "SELECT fingerprint FROM {} WHERE path = ?".format(table), (body["path"],)
+        ).fetchone()
+        if not force and row is not None and row[0] == body.get("fingerprint"):
+            return False
+
+        columns = {
+            "path": body["path"],
+            "fingerprint": body.get("fingerprint"),
+            "body": _json(body),
+            **columns,
+        }
+        self.connection.execute(
+            "INSERT OR REPLACE INTO {} ({}) VALUES ({})".format(
+                table, ", ".join(columns), ", ".join("?" * len(columns))
+            ),
+            list(columns.values()),
+        )
+        return True
+
+    def _replace_entities(self, parent, entities):
+        """Replace the mirrored tags, triggers, variables and folders of a workspace or version."""
+        for table, entity_type, id_field in ENTITY_TABLES:
+            self.connection.execute(
+                "DELETE FROM {} WHERE parent = ?".format(table), (parent,)
+            )
+            self.connection.executemany(
+                "INSERT INTO {} (parent, id, name, type, parent_folder_id, fingerprint, body) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)".format(table),
+                [
+                    (
+                        parent,
+                        x.get(id_field),
+                        x.get("name"),
+                        x.get("type"),
+                        x.get("parentFolderId"),
+                        x.get("fingerprint"),
+                        _json(x),
+                    )
+                    for x in entities.get(entity_type) or []
+                ],
+            )
+
+    def _remove(self, paths):
+        """Delete mirrored rows together with their children."""
+        with self.connection:
+            for path in paths:
+                self._delete(path)
+
+    def _delete(self, path):
+        """_delete"""
+        for table in ("containers", "versions", "workspaces"):
+            children = self.connection.execute(
+                "SELECT path FROM {} WHERE parent = ?".format(table), (path,)
+            ).fetchall()
+            for (child,) in children:
+                self._delete(child)
+
+        for table in ("accounts", "containers", "versions", "workspaces"):
+            self.connection.execute(
+                "DELETE FROM {} WHERE path = ?".format(table), (path,)
+            )
+        for table, _, _ in ENTITY_TABLES:
+            self.connection.execute(
+                "DELETE FROM {} WHERE parent = ?".format(table), (path,)
+            )
+
+    def get_version(self, path):
+        """Load a mirrored version.
+
+        Args:
+            path (str): The API path of the version, i.e.
+                "accounts/1234/containers/1234/versions/1".
+
+        Returns:
+            A :class:`gtm_manager.version.GTMVersionView` or :code:`None`, if the version is not
+            mirrored.
+        """
+        row = self.connection.execute(
+            "SELECT body FROM versions WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None:
+            return None
+        return gtm_manager.version.GTMVersionView(json.loads(row[0]))
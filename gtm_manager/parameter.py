@@ -1,36 +1,170 @@
 """parameter.py"""
 import copy
 
+_UNSET = object()
+
 
 class GTMParameter(object):
-    """GTMParameter"""
+    """A GTM Parameter, wrapping its API representation without copying it.
 
-    def __init__(self, parameter):
-        self.map = parameter.get("map")
-        self.list = parameter.get("list")
-        self.value = parameter.get("value")
-        self.key = parameter.get("key")
-        self.type = parameter.get("type")
+    Changes to :attr:`key`, :attr:`type`, :attr:`value`, :attr:`map` or :attr:`list` are stored on
+    the instance, the wrapped representation is never modified. Several parameters can therefore
+    share the same representation, i.e. the parameters of an entity and the ones returned by its
+    :code:`parameter_dict`.
 
-        if self.list:
-            self.list = [GTMParameter(x) for x in self.list]
+    Args:
+        parameter (dict): An API representation of the GTM Parameter.
+    """
+
+    __slots__ = ("_raw", "_changes", "_list", "_map")
+
+    def __init__(self, parameter):
+        self._raw = parameter
+        self._changes = None
+        self._list = _UNSET
+        self._map = _UNSET
 
     def __repr__(self):
         return "<GTM Parameter: {}>".format(self.key)
 
+    def _get(self, name):
+        """Return a changed attribute or the value of the wrapped representation."""
+        if self._changes and name in self._changes:
+            return self._changes[name]
+        return self._raw.get(name)
+
+    def _set(self, name, value):
+        """Store a changed attribute."""
+        if self._changes is None:
+            self._changes = {}
+        self._changes[name] = value
+
+    @property
+    def key(self):
+        """str: The named key that uniquely identifies a parameter."""
+        return self._get("key")
+
+    @key.setter
+    def key(self, value):
+        self._set("key", value)
+
+    @property
+    def type(self):
+        """str: The parameter type."""
+        return self._get("type")
+
+    @type.setter
+    def type(self, value):
+        self._set("type", value)
+
+    @property
+    def value(self):
+        """str: A parameter's value, may contain variable references such as "{{myVariable}}"."""
+        return self._get("value")
+
+    @value.setter
+    def value(self, value):
+        self._set("value", value)
+
+    @property
+    def map(self):
+        """list: The map entries as dicts. Until the map is changed, these are the entries of the
+        wrapped representation, which must not be modified, see :meth:`edit_map`.
+        """
+        if self._map is _UNSET:
+            return self._raw.get("map")
+        return self._map
+
+    @map.setter
+    def map(self, value):
+        self._map = value
+
+    def edit_map(self):
+        """Return the map entries to be modified in place. The entries are copied on the first
+        call, so that the wrapped representation is not changed.
+
+        Returns:
+            The list of map entries as dicts or :code:`None`, if the parameter has no map.
+        """
+        if self._map is _UNSET:
+            self._map = copy.deepcopy(self._raw.get("map"))
+        return self._map
+
+    def set_map_value(self, key, value):
+        """Set the value of a map entry. A new template entry is added, if no entry has the key.
+
+        Args:
+            key (str): The key of the map entry.
+            value (str): The new value.
+        """
+        entries = self.edit_map()
+        if entries is None:
+            entries = self._map = []
+        for entry in entries:
+            if entry.get("key") == key:
+                entry["value"] = value
+                return
+        entries.append({"type": "template", "key": key, "value": value})
+
+    @property
+    def list(self):
+        """list: The list items as :class:`GTMParameter` s, created on first access."""
+        if self._list is _UNSET:
+            raw_list = self._raw.get("list")
+            self._list = (
+                None if raw_list is None else [GTMParameter(x) for x in raw_list]
+            )
+        return self._list
+
+    @list.setter
+    def list(self, value):
+        self._list = value
+
     def to_obj(self):
-        """to_obj"""
-        if self.list:
-            self.list = [x.to_obj() for x in self.list]
-            # new_list = []
-            # for item in self.list:
-            #     if isinstance(item, GTMParameter):
-            #         new_list.append(item.to_obj())
-            #     else:
-            #         new_list.append(item)
-            # self.list = new_list
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        """Serialize the parameter to its API representation.
+
+        Unchanged parameters and list items return the wrapped representation itself instead of a
+        copy. The result is shared and must not be modified.
+
+        Returns:
+            The API representation as dict.
+        """
+        changed = bool(self._changes)
+
+        obj_list = None
+        if self._list is not _UNSET:
+            raw_list = self._raw.get("list")
+            if self._list is None:
+                changed = changed or raw_list is not None
+            else:
+                obj_list = [x.to_obj() for x in self._list]
+                changed = (
+                    changed
+                    or raw_list is None
+                    or len(obj_list) != len(raw_list)
+                    or any(x is not y for x, y in zip(obj_list, raw_list))
+                )
+
+        # the map is only set, when it was changed or handed out for changes
+        changed = changed or self._map is not _UNSET
+
+        if not changed:
+            return self._raw
+
+        if obj_list is None and self.list is not None:
+            obj_list = [x.to_obj() for x in self.list]
+
+        obj = {
+            "map": self._raw.get("map") if self._map is _UNSET else self._map,
+            "list": obj_list,
+            "value": self.value,
+            "key": self.key,
+            "type": self.type,
+        }
+        return {k: v for k, v in obj.items() if v is not None}
 
     def copy(self):
-        """copy"""
-        return copy.deepcopy(self)
+        """Return an independent parameter with the same state. The serialized state is shared
+        until either parameter is changed.
+        """
+        return GTMParameter(self.to_obj())
@@ -0,0 +1,260 @@
+"""parameter_path.py"""
+import re
+import functools
+
+import gtm_manager.parameter
+
+_KEY = re.compile(r"\s*([^.\[\]\s=]+)\s*")
+_BRACKET = re.compile(
+    r"\[\s*(?:(?P<all>\*)|(?P<index>-?\d+)|"
+    r"(?P<field>[^=\]\s]+)\s*=\s*(?:\"(?P<quoted>(?:[^\"\\]|\\.)*)\"|(?P<value>[^\]]*?)))\s*\]\s*"
+)
+
+
+def _map_entries(node):
+    """The map entries of a parameter or map entry."""
+    if isinstance(node, gtm_manager.parameter.GTMParameter):
+        return node.map or []
+    return node.get("map") or []
+
+
+def _edit_map_entries(node):
+    """The map entries of a parameter or map entry, that may be modified in place."""
+    if isinstance(node, gtm_manager.parameter.GTMParameter):
+        return node.edit_map() or []
+    return node.get("map") or []
+
+
+def _list_items(node):
+    """The list items of a parameter or map entry."""
+    if isinstance(node, gtm_manager.parameter.GTMParameter):
+        return node.list or []
+    return node.get("list") or []
+
+
+def _match_entry(node, field, value):
+    """Whether a map parameter has an entry with key :code:`field` and value :code:`value`."""
+    return any(
+        x.get("key") == field and x.get("value") == value for x in _map_entries(node)
+    )
+
+
+def _compile_key(key):
+    """Select the children with the given key: map entries, or the map entries of all list
+    items if the node is a list.
+    """
+
+    def step(nodes, map_entries=_map_entries):
+        for node in nodes:
+            entries = map_entries(node)
+            if entries:
+                yield from (x for x in entries if x.get("key") == key)
+                continue
+            for item in _list_items(node):
+                yield from (x for x in map_entries(item) if x.get("key") == key)
+
+    return step
+
+
+def _compile_filters(filters):
+    """Select list items by index, :code:`*` or :code:`field=value` matches."""
+
+    def select(items):
+        for kind, arg in filters:
+            if kind == "all":
+                continue
+            if kind == "index":
+                try:
+                    items = [items[arg]]
+                except IndexError:
+                    items = []
+            else:
+                items = [x for x in items if _match_entry(x, *arg)]
+        return items
+
+    def step(nodes, map_entries=_map_entries):  # pylint: disable=unused-argument
+        for node in nodes:
+            yield from select(_list_items(node))
+
+    return step
+
+
+class GTMParameterPath(object):
+    """A compiled query on the nested parameters of a tag, trigger or variable.
+
+    A path is a sequence of parameter keys separated by dots. The first key selects a top level
+    parameter, the following keys select entries of :code:`map` parameters. On a :code:`list`
+    parameter, a key selects the entries of all its map items. Brackets select items of a list
+    parameter:
+
+    - :code:`[0]`, :code:`[-1]`: The list item at the index.
+    - :code:`[*]`: All list items.
+    - :code:`[name=page]`, :code:`[name="a.b"]`: The map items with an entry of the key
+      :code:`name` and the value :code:`page`.
+
+    For example :code:`fieldsToSet[fieldName=anonymizeIp].value` selects the value of the
+    :code:`anonymizeIp` field of a Universal Analytics tag.
+
+    Args:
+        expression (str): The path expression.
+
+    Raises:
+        ValueError: If the expression is invalid.
+    """
+
+    __slots__ = ("expression", "_root", "_steps")
+
+    def __init__(self, expression):
+        self.expression = expression
+        self._root = None
+        self._steps = []
+
+        pos = 0
+        while pos < len(expression):
+            if self._root is not None:
+                if expression[pos] == "[":
+                    pos = self._parse_filters(expression, pos)
+                    continue
+                if expression[pos] != ".":
+                    raise ValueError("Invalid parameter path: {}".format(expression))
+                pos += 1
+
+            match = _KEY.match(expression, pos)
+            if not match:
+                raise ValueError("Invalid parameter path: {}".format(expression))
+            pos = match.end()
+
+            if self._root is None:
+                self._root = match.group(1)
+            else:
+                self._steps.append(_compile_key(match.group(1)))
+
+        if self._root is None:
+            raise ValueError("Invalid parameter path: {}".format(expression))
+
+    def __repr__(self):
+        return "<GTM Parameter Path: {}>".format(self.expression)
+
+    def _parse_filters(self, expression, pos):
+        """Parse a sequence of brackets into a single step and return the end position."""
+        filters = []
+        while pos < len(expression) and expression[pos] == "[":
+            match = _BRACKET.match(expression, pos)
+            if not match:
+                raise ValueError("Invalid parameter path: {}".format(expression))
+            pos = match.end()
+
+            if match.group("all"):
+                filters.append(("all", None))
+            elif match.group("index"):
+                filters.append(("index", int(match.group("index"))))
+            else:
+                value = match.group("quoted")
+                if value is None:
+                    value = match.group("value").strip()
+                else:
+                    value = re.sub(r"\\(.)", r"\1", value)
+                filters.append(("match", (match.group("field"), value)))
+
+        self._steps.append(_compile_filters(filters))
+        return pos
+
+    @staticmethod
+    def _raw_parameters(source):
+        """The API representations of the parameters of an entity or a list of parameters. Queries
+        on the representations do not need to create copies of the map entries.
+        """
+        if isinstance(source, list):
+            return [x.to_obj() for x in source]
+        return source.raw_body.get("parameter") or []
+
+    def _find(self, parameters, map_entries=_map_entries):
+        """Yield (top level parameter, matched node) pairs. Map entries are selected with
+        :code:`map_entries`, :func:`_edit_map_entries` selects entries, that may be modified.
+        """
+        for parameter in parameters:
+            if isinstance(parameter, gtm_manager.parameter.GTMParameter):
+                key = parameter.key
+            else:
+                key = parameter.get("key")
+            if key != self._root:
+                continue
+            nodes = [parameter]
+            for step in self._steps:
+                nodes = step(nodes, map_entries)
+            for node in nodes:
+                yield parameter, node
+
+    def find(self, source):
+        """Find the matching parameters and map entries.
+
+        Args:
+            source: A tag, trigger or variable (or their views) or a list of
+                :class:`gtm_manager.parameter.GTMParameter`.
+
+        Returns:
+            A list of API representations of the matched parameters and map entries as dicts.
+            They are shared with the source and must not be modified, see :meth:`set`.
+        """
+        return [node for _, node in self._find(self._raw_parameters(source))]
+
+    def get(self, source):
+        """Get the values of all matches.
+
+        Args:
+            source: A tag, trigger or variable (or their views) or a list of
+                :class:`gtm_manager.parameter.GTMParameter`.
+
+        Returns:
+            A list of values, :code:`None` for matches without a value (i.e. list parameters).
+        """
+        return [node.get("value") for node in self.find(source)]
+
+    def first(self, source, default=None):
+        """Get the value of the first match or :code:`default`, if nothing matches."""
+        for _, node in self._find(self._raw_parameters(source)):
+            return node.get("value")
+        return default
+
+    def set(self, source, value):
+        """Set the value of all matches.
+
+        An entity's cached parameters are not modified. The changes are applied to a copy
+        of the parameters instead, which is returned to be passed to the entity's :code:`update`
+        method. A list of parameters is changed in place.
+
+        Args:
+            source: A tag, trigger or variable or a list of
+                :class:`gtm_manager.parameter.GTMParameter`.
+            value (str): The new value.
+
+        Returns:
+            The list of changed top level :class:`gtm_manager.parameter.GTMParameter` s.
+        """
+        if isinstance(source, list):
+            parameters = source
+        else:
+            parameters = list(source.parameter_dict.values())
+
+        changed = []
+        for parameter, node in self._find(parameters, _edit_map_entries):
+            if isinstance(node, gtm_manager.parameter.GTMParameter):
+                node.value = value
+            else:
+                node["value"] = value
+            if not any(x is parameter for x in changed):
+                changed.append(parameter)
+        return changed
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_path(expression):
+    """Compile a parameter path expression, reusing earlier compilations of the same expression.
+
+    Args:
+        expression (str): The path expression, see :class:`GTMParameterPath`.
+
+    Returns:
+        The :class:`GTMParameterPath`.
+    """
+    return GTMParameterPath(expression)
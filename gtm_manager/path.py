@@ -0,0 +1,98 @@
+"""path.py"""
+import weakref
+
+
+class GTMPath(str):
+    """An API path, i.e. "accounts/1234/containers/1234/workspaces/1/tags/1".
+
+    GTMPaths are interned: constructing a GTMPath from an equal string returns the same instance
+    as long as it is referenced, so that paths used as cache keys are compared by identity. The
+    path is parsed once on construction. A GTMPath is a :code:`str` and can be used wherever a path
+    string is expected.
+
+    Args:
+        path (str): The API path.
+
+    Raises:
+        TypeError: If path is not a string.
+    """
+
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, path):
+        if type(path) is cls:  # pylint: disable=unidiomatic-typecheck
+            return path
+        if not isinstance(path, str):
+            raise TypeError("GTMPath requires a str, not {}".format(type(path).__name__))
+
+        interned = cls._interned.get(path)
+        if interned is None:
+            interned = super().__new__(cls, path)
+
+            segments = path.split("/")
+            # (collection, id) pairs, parsed from the end so that malformed prefixes are ignored
+            interned._pairs = list(zip(segments[-2::-2], segments[-1::-2]))
+            interned._ids = dict(interned._pairs)
+            interned._parent = None
+
+            interned = cls._interned.setdefault(path, interned)
+        return interned
+
+    def __reduce__(self):
+        return (GTMPath, (str(self),))
+
+    @property
+    def account_id(self):
+        """str: The account id or :code:`None`."""
+        return self._ids.get("accounts")
+
+    @property
+    def container_id(self):
+        """str: The container id or :code:`None`."""
+        return self._ids.get("containers")
+
+    @property
+    def workspace_id(self):
+        """str: The workspace id or :code:`None`."""
+        return self._ids.get("workspaces")
+
+    @property
+    def version_id(self):
+        """str: The container version id or :code:`None`."""
+        return self._ids.get("versions")
+
+    @property
+    def entity_type(self):
+        """str: The type of the resource the path points to, i.e. "tag" or "workspace"."""
+        if not self._pairs:
+            return None
+        collection = self._pairs[0][0]
+        return collection[:-1] if collection.endswith("s") else collection
+
+    @property
+    def entity_id(self):
+        """str: The id of the resource the path points to."""
+        if not self._pairs:
+            return None
+        return self._pairs[0][1]
+
+    @property
+    def parent(self):
+        """:class:`GTMPath`: The path of the parent resource, i.e. the workspace of a tag, or
+        :code:`None` for accounts.
+        """
+        if self._parent is None and len(self._pairs) > 1:
+            self._parent = GTMPath(self.rsplit("/", 2)[0])
+        return self._parent
+
+    def child(self, collection, entity_id):
+        """Build the path of a child resource.
+
+        Args:
+            collection (str): The API collection of the child, i.e. "tags".
+            entity_id (str): The id of the child.
+
+        Returns:
+            A :class:`GTMPath`.
+        """
+        return GTMPath("{}/{}/{}".format(self, collection, entity_id))
@@ -0,0 +1,210 @@
+"""payload.py"""
+import re
+import logging
+import concurrent.futures
+
+from gtm_manager import ALL_PAGES_TRIGGER_ID
+
+DOCUMENT_WRITE = re.compile(r"document\s*\.\s*write(?:ln)?\s*\(")
+SCRIPT_TAG = re.compile(r"<script\b([^>]*)>", re.IGNORECASE)
+ATTRIBUTE_VALUE = re.compile(r"=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+)")
+SCRIPT_SRC = re.compile(r"\ssrc\s*=", re.IGNORECASE)
+SCRIPT_ASYNC = re.compile(r"\s(?:async|defer)(?:\s|=|/|$)", re.IGNORECASE)
+
+
+def _template_size(parameters):
+    """Sum the UTF-8 sizes of all nested template parameter values."""
+    size = 0
+    for parameter in parameters or []:
+        if parameter.get("type") == "template" and parameter.get("value"):
+            size += len(parameter["value"].encode("utf-8"))
+        size += _template_size(parameter.get("list"))
+        size += _template_size(parameter.get("map"))
+    return size
+
+
+def analyze_tag(tag):
+    """Estimate the payload of a tag.
+
+    Args:
+        tag (dict): The API representation of the tag.
+
+    Returns:
+        A dict with the keys :code:`id`, :code:`name`, :code:`type`, :code:`size` (the UTF-8
+        size in bytes of all template parameters, including the HTML of custom HTML tags),
+        :code:`document_write` (whether the HTML calls :code:`document.write`),
+        :code:`blocking_scripts` (the number of external :code:`<script>` elements without
+        :code:`async` or :code:`defer`) and :code:`triggers` (the firing trigger ids).
+    """
+    html = ""
+    for parameter in tag.get("parameter") or []:
+        if parameter.get("key") == "html":
+            html = parameter.get("value") or ""
+
+    blocking_scripts = 0
+    for attributes in SCRIPT_TAG.findall(html):
+        # only attribute names are matched, not the URLs or other attribute values
+        attributes = ATTRIBUTE_VALUE.sub("=", attributes)
+        if SCRIPT_SRC.search(attributes) and not SCRIPT_ASYNC.search(attributes):
+            blocking_scripts += 1
+
+    return {
+        "id": tag.get("tagId"),
+        "name": tag.get("name"),
+        "type": tag.get("type"),
+        "size": _template_size(tag.get("parameter")),
+        "document_write": DOCUMENT_WRITE.search(html) is not None,
+        "blocking_scripts": blocking_scripts,
+        "triggers": list(tag.get("firingTriggerId") or []),
+    }
+
+
+class GTMPayloadAnalyzer(object):
+    """Estimate the payload a container version adds to pages.
+
+    Every tag is analyzed with :func:`analyze_tag`. Paused tags are ignored. The payload of a
+    trigger is the size of all tags firing on it, the payload of *All Pages* is loaded on every
+    page view.
+
+    Args:
+        version (:class:`gtm_manager.version.GTMVersionView`): The container version.
+    """
+
+    def __init__(self, version):
+        body = version.raw_body
+        self.path = version.path
+        self.containerVersionId = body.get("containerVersionId")
+        self.tags = [
+            analyze_tag(x) for x in body.get("tag") or [] if not x.get("paused")
+        ]
+
+        self._trigger_names = {ALL_PAGES_TRIGGER_ID: "All Pages"}
+        for trigger in body.get("trigger") or []:
+            self._trigger_names[trigger.get("triggerId")] = trigger.get("name")
+
+    @property
+    def triggers(self):
+        """dict: The trigger ids as keys and dicts with the keys :code:`name`, :code:`size` and
+        :code:`tags` (the ids of the tags firing on the trigger) as values.
+        """
+        triggers = {}
+        for tag in self.tags:
+            for trigger_id in tag["triggers"]:
+                trigger = triggers.setdefault(
+                    trigger_id,
+                    {
+                        "name": self._trigger_names.get(trigger_id),
+                        "size": 0,
+                        "tags": [],
+                    },
+                )
+                trigger["size"] += tag["size"]
+                trigger["tags"].append(tag["id"])
+        return triggers
+
+    @property
+    def all_pages_size(self):
+        """int: The size of all tags firing on *All Pages*."""
+        return sum(
+            x["size"] for x in self.tags if ALL_PAGES_TRIGGER_ID in x["triggers"]
+        )
+
+    def offenders(self, limit=10):
+        """Rank the tags by their impact on page speed: tags blocking the page with
+        :code:`document.write` or synchronous scripts first, then tags firing on *All Pages*,
+        each by size.
+
+        Args:
+            limit (int): The maximum number of tags returned.
+
+        Returns:
+            A list of the tag dicts, see :func:`analyze_tag`.
+        """
+        return sorted(
+            self.tags,
+            key=lambda x: (
+                x["document_write"] or x["blocking_scripts"] > 0,
+                ALL_PAGES_TRIGGER_ID in x["triggers"],
+                x["size"],
+            ),
+            reverse=True,
+        )[:limit]
+
+    def summary(self):
+        """Summarize the payload of the version.
+
+        Returns:
+            A dict with the keys :code:`path`, :code:`containerVersionId`, :code:`size` (of all
+            tags), :code:`all_pages_size`, :code:`document_write` and :code:`blocking_scripts`
+            (the number of tags with these issues).
+        """
+        return {
+            "path": self.path,
+            "containerVersionId": self.containerVersionId,
+            "size": sum(x["size"] for x in self.tags),
+            "all_pages_size": self.all_pages_size,
+            "document_write": sum(x["document_write"] for x in self.tags),
+            "blocking_scripts": sum(x["blocking_scripts"] > 0 for x in self.tags),
+        }
+
+
+def analyze_containers(containers, max_workers=4):
+    """Analyze the live versions of many containers concurrently.
+
+    The underlying http clients are not thread safe. Every container therefore needs to be
+    initialized with its own :code:`service` or :code:`credentials`.
+
+    Args:
+        containers (list): :class:`gtm_manager.container.GTMContainer` s.
+        max_workers (int): Number of containers processed in parallel.
+
+    Returns:
+        A dict with the container paths as keys and the :meth:`GTMPayloadAnalyzer.summary` of
+        their live versions as values, or :code:`None` if a container has no live version. If a
+        container failed, the value is the raised exception.
+    """
+
+    def analyze(container):
+        version = container.live_version()
+        return GTMPayloadAnalyzer(version).summary() if version else None
+
+    results = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(analyze, container): container for container in containers
+        }
+        for future in concurrent.futures.as_completed(futures):
+            container = futures[future]
+            try:
+                results[container.path] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error(error)
+                results[container.path] = error
+
+    return results
+
+
+def regressions(previous, current, threshold=0):
+    """Compare two results of :func:`analyze_containers`, i.e. of the last and the current run.
+
+    Args:
+        previous (dict): The earlier results.
+        current (dict): The current results.
+        threshold (int): The number of bytes the *All Pages* payload may grow.
+
+    Returns:
+        A dict with the paths of the containers, whose published version changed and whose
+        *All Pages* payload grew by more than :code:`threshold` bytes, as keys and the tuples of
+        the previous and current summary as values.
+    """
+    results = {}
+    for path, summary in current.items():
+        before = previous.get(path)
+        if not isinstance(summary, dict) or not isinstance(before, dict):
+            continue
+        if summary["containerVersionId"] == before["containerVersionId"]:
+            continue
+        if summary["all_pages_size"] - before["all_pages_size"] > threshold:
+            results[path] = (before, summary)
+    return results
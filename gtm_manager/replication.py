@@ -0,0 +1,263 @@
+"""replication.py"""
+import logging
+import concurrent.futures
+
+import gtm_manager.version
+import gtm_manager.workspace
+from gtm_manager.utils import strip_body
+from gtm_manager.simulation import BUILT_IN_TRIGGERS
+
+
+def _remap_ids(ids, id_map):
+    """Map a list of trigger ids, keeping the ids of built-in triggers.
+
+    Raises:
+        ValueError: If an id is neither mapped nor a built-in trigger. It could point at an
+            unrelated trigger with the same id in the target.
+    """
+    remapped = []
+    for trigger_id in ids:
+        if trigger_id in id_map:
+            remapped.append(id_map[trigger_id])
+        elif trigger_id in BUILT_IN_TRIGGERS:
+            remapped.append(trigger_id)
+        else:
+            raise ValueError(
+                "Trigger {} does not exist in the source.".format(trigger_id)
+            )
+    return remapped
+
+
+class GTMReplicator(object):
+    """Replicate the folders, built-in variables, variables, triggers and tags of a source
+    container into other GTM Workspaces.
+
+    Entities are matched by name between source and target. All id references
+    (:code:`parentFolderId`, :code:`firingTriggerId`, :code:`blockingTriggerId`,
+    :code:`enablingTriggerId`, :code:`disablingTriggerId`) are remapped to the ids of the target
+    container. Only the ids of built-in triggers, i.e. *All Pages*, are kept as is, entities
+    referencing triggers, that do not exist in the source, are skipped. Setup and teardown tags are
+    referenced by tag name and stay valid as long as the tag names are replicated. Entities only
+    existing in the target are left untouched.
+
+    Args:
+        source: Either a :class:`gtm_manager.version.GTMVersion` (i.e. a live version), a
+            :class:`gtm_manager.version.GTMVersionView` (i.e. a version loaded from disk) or a
+            :class:`gtm_manager.workspace.GTMWorkspace` whose :code:`quick_preview` is used as
+            replication source.
+    """
+
+    def __init__(self, source):
+        if isinstance(source, gtm_manager.workspace.GTMWorkspace):
+            source = source.quick_preview()
+
+        if not isinstance(source, gtm_manager.version.GTMVersionView):
+            raise ValueError(
+                "Please pass either a GTMVersion or GTMWorkspace as source."
+            )
+
+        self._source = source.raw_body
+
+    def replicate(self, targets, max_workers=4, dry_run=False):
+        """Replicate the source into multiple workspaces concurrently.
+
+        The underlying http clients are not thread safe. Every target workspace therefore needs to
+        be initialized with its own :code:`service` or :code:`credentials`.
+
+        Args:
+            targets (list): :class:`gtm_manager.workspace.GTMWorkspace` s to replicate into.
+            max_workers (int): Number of targets processed in parallel.
+            dry_run (bool): Only compute the changes, do not write to the API.
+
+        Returns:
+            A dict with the target workspace paths as keys and the list of changes returned by
+            :meth:`replicate_to` as values. If a target failed, the value is the raised exception.
+        """
+        results = {}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.replicate_to, target, dry_run=dry_run): target
+                for target in targets
+            }
+            for future in concurrent.futures.as_completed(futures):
+                target = futures[future]
+                try:
+                    results[target.path] = future.result()
+                except Exception as error:  # pylint: disable=broad-except
+                    logging.error(error)
+                    results[target.path] = error
+
+        return results
+
+    def replicate_to(self, workspace, dry_run=False):
+        """Replicate the source into a single workspace.
+
+        The current workspace state is loaded with a single :code:`quick_preview` request. Only
+        entities that are missing or differ from the source are written. Writes are sent in
+        dependency order batches: folders, built-in variables, triggers, variables and finally
+        tags, so that the ids created in one batch can be used in the remapping of the next.
+
+        Args:
+            workspace (:class:`gtm_manager.workspace.GTMWorkspace`): The target workspace.
+            dry_run (bool): Only compute the changes, do not write to the API.
+
+        Returns:
+            A list of changes as dicts with the keys :code:`action` ("create", "update" or
+            "skip"), :code:`type` ("folder", "builtInVariable", "variable", "trigger" or "tag") and
+            :code:`name`.
+        """
+        target = workspace.quick_preview().raw_body
+        changes = []
+
+        folder_map = self._replicate_folders(workspace, target, changes, dry_run)
+        self._replicate_built_ins(workspace, target, changes, dry_run)
+
+        # triggers first, variables and tags reference the trigger ids created in this run
+        trigger_map = self._replicate_entities(
+            workspace,
+            target,
+            changes,
+            dry_run,
+            entity_type="trigger",
+            id_field="triggerId",
+            remap=lambda body: self._remap_folder(body, folder_map),
+        )
+
+        def remap_variable(body):
+            self._remap_folder(body, folder_map)
+            for key in ("enablingTriggerId", "disablingTriggerId"):
+                if body.get(key):
+                    body[key] = _remap_ids(body[key], trigger_map)
+            return body
+
+        self._replicate_entities(
+            workspace,
+            target,
+            changes,
+            dry_run,
+            entity_type="variable",
+            id_field="variableId",
+            remap=remap_variable,
+        )
+
+        def remap_tag(body):
+            self._remap_folder(body, folder_map)
+            for key in ("firingTriggerId", "blockingTriggerId"):
+                if body.get(key):
+                    body[key] = _remap_ids(body[key], trigger_map)
+            return body
+
+        self._replicate_entities(
+            workspace,
+            target,
+            changes,
+            dry_run,
+            entity_type="tag",
+            id_field="tagId",
+            remap=remap_tag,
+        )
+
+        return changes
+
+    @staticmethod
+    def _remap_folder(body, folder_map):
+        """_remap_folder"""
+        if body.get("parentFolderId"):
+            if body["parentFolderId"] in folder_map:
+                body["parentFolderId"] = folder_map[body["parentFolderId"]]
+            else:
+                del body["parentFolderId"]
+        return body
+
+    def _replicate_folders(self, workspace, target, changes, dry_run):
+        """_replicate_folders"""
+        target_folders = {x.get("name"): x for x in target.get("folder") or []}
+        folder_map = {}
+
+        for folder in self._source.get("folder") or []:
+            name = folder.get("name")
+            notes = folder.get("notes", "")
+            existing = target_folders.get(name)
+
+            if existing is None:
+                changes.append({"action": "create", "type": "folder", "name": name})
+                if not dry_run:
+                    created = workspace.create_folder(name, notes=notes)
+                    existing = {"folderId": created.folderId}
+            elif existing.get("notes", "") != notes:
+                changes.append({"action": "update", "type": "folder", "name": name})
+                if not dry_run:
+                    workspace.workspaces_service.folders().update(
+                        path="{}/folders/{}".format(
+                            workspace.path, existing["folderId"]
+                        ),
+                        body={"name": name, "notes": notes},
+                    ).execute()
+
+            if existing is not None:
+                folder_map[folder.get("folderId")] = existing.get("folderId")
+
+        return folder_map
+
+    def _replicate_built_ins(self, workspace, target, changes, dry_run):
+        """_replicate_built_ins"""
+        target_types = {x.get("type") for x in target.get("builtInVariable") or []}
+        missing = [
+            x.get("type")
+            for x in self._source.get("builtInVariable") or []
+            if x.get("type") not in target_types
+        ]
+
+        if not missing:
+            return
+
+        changes.extend(
+            {"action": "create", "type": "builtInVariable", "name": x} for x in missing
+        )
+        if not dry_run:
+            workspace.create_build_ins(missing)
+
+    def _replicate_entities(
+        self, workspace, target, changes, dry_run, entity_type, id_field, remap
+    ):
+        """Write all differing entities of one type and return the source to target id map.
+
+        The map holds the ids after the writes. In a dry run, entities, that would be created, are
+        mapped to :code:`None`. Entities with references, that cannot be remapped, are skipped.
+        """
+        service = getattr(workspace.workspaces_service, "{}s".format(entity_type))()
+        create = getattr(workspace, "create_{}".format(entity_type))
+        target_entities = {x.get("name"): x for x in target.get(entity_type) or []}
+        id_map = {}
+
+        for entity in self._source.get(entity_type) or []:
+            name = entity.get("name")
+            try:
+                body = remap(strip_body(entity))
+            except ValueError as error:
+                logging.error(error)
+                changes.append({"action": "skip", "type": entity_type, "name": name})
+                continue
+            existing = target_entities.get(name)
+
+            if existing is None:
+                changes.append({"action": "create", "type": entity_type, "name": name})
+                id_map[entity.get(id_field)] = (
+                    None if dry_run else getattr(create(body), id_field)
+                )
+                continue
+
+            id_map[entity.get(id_field)] = existing.get(id_field)
+
+            if strip_body(existing) != body:
+                changes.append({"action": "update", "type": entity_type, "name": name})
+                if not dry_run:
+                    service.update(
+                        path="{}/{}s/{}".format(
+                            workspace.path, entity_type, existing[id_field]
+                        ),
+                        body=body,
+                    ).execute()
+
+        return id_map
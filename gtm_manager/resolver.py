@@ -0,0 +1,395 @@
+"""resolver.py"""
+import re
+from urllib.parse import urlsplit, parse_qs
+
+from gtm_manager import data_layer
+
+REFERENCE = re.compile(r"{{(.+?)}}")
+
+# Group references, that a combined pattern of many rows would renumber. Other escapes are
+# consumed, so that escaped backslashes and parentheses are skipped.
+BACKREFERENCE = re.compile(r"\\([1-9][0-9]{0,2})|\\.|\(\?P=|\(\?\(")
+OUTPUT_GROUP = re.compile(r"\$(\d)")
+
+# Built-in variables, that read from the data layer
+DATA_LAYER_VARIABLES = {
+    "_event": "event",
+    "Event": "event",
+    "Click Element": "gtm.element",
+    "Click Classes": "gtm.elementClasses",
+    "Click ID": "gtm.elementId",
+    "Click Target": "gtm.elementTarget",
+    "Click URL": "gtm.elementUrl",
+    "Click Text": "gtm.elementText",
+    "Form Element": "gtm.element",
+    "Form Classes": "gtm.elementClasses",
+    "Form ID": "gtm.elementId",
+    "Form Target": "gtm.elementTarget",
+    "Form URL": "gtm.elementUrl",
+    "Form Text": "gtm.elementText",
+    "Error Message": "gtm.errorMessage",
+    "Error URL": "gtm.errorUrl",
+    "Error Line": "gtm.errorLineNumber",
+    "New History Fragment": "gtm.newUrlFragment",
+    "Old History Fragment": "gtm.oldUrlFragment",
+    "New History State": "gtm.newHistoryState",
+    "Old History State": "gtm.oldHistoryState",
+    "History Source": "gtm.historyChangeSource",
+    "Scroll Depth Threshold": "gtm.scrollThreshold",
+    "Scroll Depth Units": "gtm.scrollUnits",
+    "Scroll Direction": "gtm.scrollDirection",
+    "Percent Visible": "gtm.visibleRatio",
+    "On-Screen Duration": "gtm.visibleTime",
+    "Video Provider": "gtm.videoProvider",
+    "Video Status": "gtm.videoStatus",
+    "Video URL": "gtm.videoUrl",
+    "Video Title": "gtm.videoTitle",
+    "Video Duration": "gtm.videoDuration",
+    "Video Current Time": "gtm.videoCurrentTime",
+    "Video Percent": "gtm.videoPercent",
+    "Video Visible": "gtm.videoVisible",
+}
+
+# Built-in variables, that read from the page state
+PAGE_VARIABLES = {
+    "Page URL": ("url", "URL"),
+    "Page Hostname": ("url", "HOST"),
+    "Page Path": ("url", "PATH"),
+    "Referrer": ("referrer", "URL"),
+}
+
+
+def to_string(value):
+    """Convert a value to a string the way GTM does in templates and conditions."""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return "undefined"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def url_component(url, component, query_key=None):
+    """Read a component of a URL like the URL variable type does.
+
+    Args:
+        url (str): The URL.
+        component (str): "URL", "PROTOCOL", "HOST", "PORT", "PATH", "QUERY" or "FRAGMENT".
+        query_key (str): The query parameter to read, if the component is "QUERY".
+
+    Returns:
+        The component or :code:`None`.
+    """
+    if url is None:
+        return None
+    if component == "URL":
+        return url
+
+    parts = urlsplit(url)
+    if component == "QUERY":
+        if not query_key:
+            return parts.query
+        values = parse_qs(parts.query).get(query_key)
+        return values[0] if values else None
+
+    return {
+        "PROTOCOL": parts.scheme,
+        "HOST": parts.hostname,
+        "PORT": str(parts.port) if parts.port else None,
+        "PATH": parts.path,
+        "FRAGMENT": parts.fragment,
+    }.get(component)
+
+
+def has_backreference(pattern):
+    """Whether a regular expression references its own groups, i.e. with :code:`\\1`."""
+    for match in BACKREFERENCE.finditer(pattern):
+        digits = match.group(1)
+        if digits is None and match.group(0).startswith("\\"):
+            continue
+        # three octal digits are an octal escape, not a group reference
+        if digits is not None and len(digits) == 3 and set(digits) <= set("01234567"):
+            continue
+        return True
+    return False
+
+
+def _params(variable):
+    """Map the top-level parameter keys of a variable to their raw parameters."""
+    return {x.get("key"): x for x in variable.get("parameter") or []}
+
+
+def _rows(table):
+    """Read the (key, value) rows of a lookup or regex table parameter."""
+    rows = []
+    for row in (table or {}).get("list") or []:
+        cells = {x.get("key"): x.get("value") for x in row.get("map") or []}
+        rows.append((cells.get("key") or "", cells.get("value")))
+    return rows
+
+
+class GTMVariableResolver(object):
+    """Resolve the values of the variables of a container version offline, for a given data model
+    and page state.
+
+    Variables are compiled once on first use: templates are split into their literals and
+    references, lookup tables into dicts and regex tables into a single combined pattern. Nested
+    :code:`{{}}` references are resolved at most once per state, see :meth:`resolve`.
+
+    Supported are data layer ("v"), constant ("c"), lookup table ("smm"), regex table ("remm") and
+    URL ("u") variables, the built-in data layer variables, i.e. "Click URL", and the page
+    variables "Page URL", "Page Hostname", "Page Path" and "Referrer". Other variable types resolve
+    to :code:`None`. Names, that are not defined in the version, are read from the data model key
+    of the same name.
+
+    Args:
+        version (:class:`gtm_manager.version.GTMVersionView`): The container version.
+    """
+
+    def __init__(self, version):
+        self._variables = {
+            x.get("name"): x for x in version.raw_body.get("variable") or []
+        }
+        self._compiled = {}
+
+    def resolve(self, name, model, page=None, memo=None):
+        """Resolve a variable.
+
+        Args:
+            name (str): The variable name, without curly braces.
+            model (dict): The data model, see :func:`gtm_manager.data_layer.merge`.
+            page (dict): The page state with the keys :code:`url` and :code:`referrer`.
+            memo (dict): Values resolved for the same state. Pass the same dict to resolve many
+                variables for one state, so that shared references are resolved once.
+
+        Returns:
+            The value or :code:`None`, if the variable is undefined.
+        """
+        return self.reference(name)(model, page or {}, {} if memo is None else memo)
+
+    def render(self, template, model, page=None, memo=None):
+        """Render a string with :code:`{{}}` references, i.e. "{{Page Path}}?id={{id}}".
+
+        Args:
+            template (str): The template.
+            model (dict): The data model.
+            page (dict): The page state.
+            memo (dict): Values resolved for the same state, see :meth:`resolve`.
+
+        Returns:
+            The rendered string.
+        """
+        return self.template(template)(model, page or {}, {} if memo is None else memo)
+
+    def reference(self, name):
+        """Compile a variable reference.
+
+        Args:
+            name (str): The variable name.
+
+        Returns:
+            A callable taking the data model, the page state and a memo dict and returning the
+            value of the variable.
+        """
+        if name not in self._compiled:
+            # registered before compiling, so that circular references resolve to None
+            self._compiled[name] = lambda model, page, memo: None
+            compiled = self._compile(name)
+
+            def reference(model, page, memo):
+                if name in memo:
+                    return memo[name]
+                memo[name] = None
+                value = memo[name] = compiled(model, page, memo)
+                return value
+
+            self._compiled[name] = reference
+        return self._compiled[name]
+
+    def template(self, text, raw=False):
+        """Compile a template.
+
+        Args:
+            text (str): The template.
+            raw (bool): If the template is a single reference, return the referenced value
+                instead of its string.
+
+        Returns:
+            A callable taking the data model, the page state and a memo dict and returning the
+            rendered value.
+        """
+        if text is None:
+            return lambda model, page, memo: None
+
+        parts = REFERENCE.split(text)
+        if len(parts) == 1:
+            return lambda model, page, memo: text
+
+        references = [self.reference(x) for x in parts[1::2]]
+        if len(parts) == 3 and not parts[0] and not parts[2]:
+            reference = references[0]
+            if raw:
+                return reference
+            return lambda model, page, memo: to_string(reference(model, page, memo))
+
+        literals = parts[::2]
+
+        def template(model, page, memo):
+            values = [to_string(x(model, page, memo)) for x in references] + [""]
+            return "".join(x + y for x, y in zip(literals, values))
+
+        return template
+
+    def _compile(self, name):
+        """_compile"""
+        if name in DATA_LAYER_VARIABLES:
+            key = DATA_LAYER_VARIABLES[name]
+            return lambda model, page, memo: data_layer.get(model, key)
+
+        if name in PAGE_VARIABLES:
+            source, component = PAGE_VARIABLES[name]
+            return lambda model, page, memo: url_component(page.get(source), component)
+
+        variable = self._variables.get(name)
+        if variable is None:
+            return lambda model, page, memo: model.get(name)
+
+        params = _params(variable)
+        compile_type = {
+            "v": self._compile_data_layer,
+            "c": self._compile_constant,
+            "smm": self._compile_lookup_table,
+            "remm": self._compile_regex_table,
+            "u": self._compile_url,
+        }.get(variable.get("type"))
+        if compile_type is None:
+            return lambda model, page, memo: None
+
+        resolve = compile_type(params)
+        default = None
+        if (params.get("setDefaultValue") or {}).get("value") == "true":
+            default = self.template(
+                (params.get("defaultValue") or {}).get("value"), raw=True
+            )
+        if default is None:
+            return resolve
+
+        def with_default(model, page, memo):
+            value = resolve(model, page, memo)
+            return default(model, page, memo) if value is None else value
+
+        return with_default
+
+    @staticmethod
+    def _value(params, key):
+        """_value"""
+        return (params.get(key) or {}).get("value")
+
+    def _compile_data_layer(self, params):
+        """Data layer variable"""
+        key = self._value(params, "name") or ""
+        if self._value(params, "dataLayerVersion") == "1":
+            return lambda model, page, memo: model.get(key)
+        return lambda model, page, memo: data_layer.get(model, key)
+
+    def _compile_constant(self, params):
+        """Constant variable"""
+        return self.template(self._value(params, "value"), raw=True)
+
+    def _compile_url(self, params):
+        """URL variable"""
+        component = self._value(params, "component") or "URL"
+        query_key = self._value(params, "queryKey")
+        source = self._value(params, "customUrlSource")
+        url = self.template(source) if source else None
+
+        def resolve(model, page, memo):
+            value = url(model, page, memo) if url else page.get("url")
+            return url_component(value, component, query_key)
+
+        return resolve
+
+    def _compile_lookup_table(self, params):
+        """Lookup table variable, compiled into a dict. The first row of a key wins."""
+        source = self.template(self._value(params, "input") or "")
+        table = {}
+        for key, value in _rows(params.get("map")):
+            table.setdefault(key, self.template(value, raw=True))
+
+        def resolve(model, page, memo):
+            output = table.get(source(model, page, memo))
+            return None if output is None else output(model, page, memo)
+
+        return resolve
+
+    def _compile_regex_table(self, params):
+        """Regex table variable. The rows are combined into a single pattern of alternatives, that
+        selects the first matching row in row order. Rows with group references would be
+        renumbered in the combined pattern, they are matched one by one instead.
+        """
+        source = self.template(self._value(params, "input") or "")
+        full_match = self._value(params, "fullMatch") == "true"
+        replace = self._value(params, "replaceAfterMatch") == "true"
+        flags = re.IGNORECASE if self._value(params, "ignoreCase") != "false" else 0
+
+        rows = []
+        for pattern, value in _rows(params.get("map")):
+            try:
+                regex = re.compile(pattern, flags)
+            except re.error:
+                continue
+            rows.append((regex, value, self.template(value, raw=True)))
+
+        if full_match:
+            alternatives = [
+                "(?P<_row{}>(?:{}))".format(i, x.pattern)
+                for i, (x, _, _) in enumerate(rows)
+            ]
+            matcher = "(?:{})\\Z".format("|".join(alternatives))
+        else:
+            # the lookaheads are tried in row order, the leftmost match would ignore it. The
+            # prefix matches newlines without re.DOTALL, which would change the rows' dots
+            alternatives = [
+                "(?=[\\s\\S]*?(?P<_row{}>{}))".format(i, x.pattern)
+                for i, (x, _, _) in enumerate(rows)
+            ]
+            matcher = "|".join(alternatives)
+
+        combined = None
+        if rows and not any(has_backreference(x.pattern) for x, _, _ in rows):
+            try:
+                combined = re.compile(matcher, flags).match
+            except re.error:
+                # i.e. inline flags or group names repeated in many rows
+                pass
+
+        def first_row(value):
+            if combined is not None:
+                match = combined(value)
+                return int(match.lastgroup[4:]) if match else None
+            for index, (regex, _, _) in enumerate(rows):
+                if (regex.fullmatch if full_match else regex.search)(value):
+                    return index
+            return None
+
+        def resolve(model, page, memo):
+            value = source(model, page, memo)
+            index = first_row(value)
+            if index is None:
+                return None
+            regex, output, compiled_output = rows[index]
+            if replace and output is not None:
+                # only $1 to $9 refer to groups, backslashes of the output are literals
+                template = OUTPUT_GROUP.sub(
+                    r"\\g<\1>",
+                    self.render(output, model, page, memo).replace("\\", "\\\\"),
+                )
+                if full_match:
+                    return regex.fullmatch(value).expand(template)
+                return regex.sub(template, value, count=1)
+            return compiled_output(model, page, memo)
+
+        return resolve
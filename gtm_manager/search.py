@@ -0,0 +1,378 @@
+"""search.py"""
+import re
+import json
+import sqlite3
+
+from gtm_manager.path import GTMPath
+
+INDEXED_ENTITIES = (
+    ("tag", "tagId"),
+    ("trigger", "triggerId"),
+    ("variable", "variableId"),
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    parent TEXT PRIMARY KEY,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    parent TEXT,
+    entity_type TEXT,
+    entity_id TEXT,
+    name TEXT,
+    key TEXT,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS documents_parent ON documents (parent);
+CREATE TABLE IF NOT EXISTS trigrams (
+    trigram INTEGER,
+    document INTEGER,
+    PRIMARY KEY (trigram, document)
+) WITHOUT ROWID;
+"""
+
+MAX_QUERY_TRIGRAMS = 32
+
+# Characters, that end a literal run in a regular expression
+_REGEX_SPECIAL = set(".^$()[]{}|\\*+?")
+
+# The number of characters following code point escapes
+_ESCAPE_LENGTHS = {"x": 2, "u": 4, "U": 8}
+
+
+def trigrams(value):
+    """The set of lower case trigrams of a string, each packed into an integer of the three
+    code points, which is smaller and faster to compare in the index than text.
+    """
+    codes = [ord(x) for x in value.lower()]
+    return {a << 42 | b << 21 | c for a, b, c in zip(codes, codes[1:], codes[2:])}
+
+
+def regex_literals(pattern):
+    """Extract literal substrings, that every match of a regular expression contains.
+
+    Only literals outside of groups are considered, a top level alternation has no required
+    literals. The result is used to preselect candidates, it may miss literals but never
+    returns a literal, that is not required.
+
+    Args:
+        pattern (str): The regular expression.
+
+    Returns:
+        A list of literal strings.
+    """
+    literals = []
+    current = []
+    depth = 0
+    index = 0
+
+    def flush():
+        if current and depth == 0:
+            literals.append("".join(current))
+        current.clear()
+
+    while index < len(pattern):
+        char = pattern[index]
+        index += 1
+
+        if char == "\\" and index < len(pattern):
+            escaped = pattern[index]
+            index += 1
+            if escaped.isalnum():
+                # character classes, anchors, backreferences and code point escapes end the
+                # literal, the arguments of code point escapes are skipped
+                flush()
+                if escaped in _ESCAPE_LENGTHS:
+                    index += _ESCAPE_LENGTHS[escaped]
+                elif escaped == "N" and pattern.startswith("{", index):
+                    index = pattern.find("}", index) + 1 or len(pattern)
+                elif escaped.isdigit():
+                    while index < len(pattern) and pattern[index].isdigit():
+                        index += 1
+            else:
+                current.append(escaped)
+        elif char == "[":
+            flush()
+            # skip the character class, a leading "]" is part of the class
+            if pattern.startswith("^", index):
+                index += 1
+            if pattern.startswith("]", index):
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+        elif char in "?*{":
+            # the previous character is optional
+            if current:
+                current.pop()
+            flush()
+            if char == "{":
+                index = pattern.find("}", index) + 1 or len(pattern)
+        elif char == "|":
+            if depth == 0:
+                return []
+            flush()
+        elif char == "(":
+            flush()
+            depth += 1
+        elif char == ")":
+            flush()
+            depth = max(depth - 1, 0)
+        elif char in _REGEX_SPECIAL:
+            flush()
+        else:
+            current.append(char)
+
+    flush()
+    return literals
+
+
+def parameter_values(parameters, prefix=""):
+    """Yield the (key path, value) pairs of all nested parameter values."""
+    for index, parameter in enumerate(parameters or []):
+        key = parameter.get("key")
+        path = (
+            "{}.{}".format(prefix, key)
+            if prefix and key
+            else key or "{}[{}]".format(prefix, index)
+        )
+        if parameter.get("value"):
+            yield path, parameter["value"]
+        yield from parameter_values(parameter.get("list"), path)
+        yield from parameter_values(parameter.get("map"), path)
+
+
+def entity_values(entity):
+    """Yield the (key path, value) pairs of the searchable values of a tag, trigger or variable:
+    its name and all nested parameter values, including trigger conditions.
+    """
+    if entity.get("name"):
+        yield "name", entity["name"]
+    yield from parameter_values(entity.get("parameter"))
+    for field in ("filter", "autoEventFilter", "customEventFilter"):
+        for index, condition in enumerate(entity.get(field) or []):
+            yield from parameter_values(
+                condition.get("parameter"), "{}[{}]".format(field, index)
+            )
+
+
+class GTMSearchIndex(object):
+    """A persistent trigram index of the names and parameter values of the tags, triggers and
+    variables of container versions and workspaces, i.e. the HTML of custom HTML tags.
+
+    Every value is stored as a document together with its lower case trigrams. Substring and
+    regex queries look up the documents containing all trigrams of the query, or of the literals
+    of the regex, and verify only these candidates. Queries are case insensitive.
+
+    Args:
+        database (str): The SQLite database file.
+    """
+
+    def __init__(self, database):
+        self.connection = sqlite3.connect(database)
+
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def index(self, parent, body, fingerprint=None):
+        """Index the tags, triggers and variables of a version or workspace.
+
+        Args:
+            parent (str): The path of the version or workspace.
+            body (dict): A dict with the lists :code:`tag`, :code:`trigger` and :code:`variable`,
+                i.e. the API representation of a container version.
+            fingerprint (str): The fingerprint of the parent. If it did not change since the
+                parent was indexed, the index is not updated.
+
+        Returns:
+            :code:`True` if the parent was (re-)indexed.
+        """
+        row = self.connection.execute(
+            "SELECT fingerprint FROM sources WHERE parent = ?", (parent,)
+        ).fetchone()
+        if fingerprint is not None and row is not None and row[0] == fingerprint:
+            return False
+
+        with self.connection:
+            self._delete(parent)
+            self.connection.execute(
+                "INSERT INTO sources (parent, fingerprint) VALUES (?, ?)",
+                (parent, fingerprint),
+            )
+            postings = []
+            for entity_type, id_field in INDEXED_ENTITIES:
+                for entity in body.get(entity_type) or []:
+                    for key, value in entity_values(entity):
+                        document = self.connection.execute(
+                            "INSERT INTO documents "
+                            "(parent, entity_type, entity_id, name, key, value) "
+                            "VALUES (?, ?, ?, ?, ?, ?)",
+                            (
+                                parent,
+                                entity_type,
+                                entity.get(id_field),
+                                entity.get("name"),
+                                key,
+                                value,
+                            ),
+                        ).lastrowid
+                        postings.extend((x, document) for x in trigrams(value))
+
+            # inserting in primary key order keeps the b-tree writes local
+            postings.sort()
+            self.connection.executemany(
+                "INSERT INTO trigrams (trigram, document) VALUES (?, ?)", postings
+            )
+        return True
+
+    def index_version(self, version):
+        """Index a container version.
+
+        Args:
+            version (:class:`gtm_manager.version.GTMVersionView`): The version.
+
+        Returns:
+            :code:`True` if the version was (re-)indexed.
+        """
+        return self.index(
+            version.path, version.raw_body, version.raw_body.get("fingerprint")
+        )
+
+    def index_mirror(self, mirror):
+        """Update the index from a :class:`gtm_manager.mirror.GTMMirror`: index all mirrored
+        versions and workspaces, that changed since they were indexed, and remove the ones, that
+        are not mirrored anymore.
+
+        Args:
+            mirror (:class:`gtm_manager.mirror.GTMMirror`): The mirror.
+
+        Returns:
+            The number of (re-)indexed versions and workspaces.
+        """
+        count = 0
+        indexed = dict(
+            self.connection.execute("SELECT parent, fingerprint FROM sources")
+        )
+        connection = mirror.connection
+
+        versions = connection.execute(
+            "SELECT path, fingerprint, body FROM versions WHERE deleted = 0"
+        )
+        for path, fingerprint, body in versions:
+            if path not in indexed or indexed.pop(path) != fingerprint:
+                count += self.index(path, json.loads(body), fingerprint)
+
+        workspaces = connection.execute("SELECT path, fingerprint FROM workspaces")
+        for path, fingerprint in workspaces.fetchall():
+            if path in indexed and indexed.pop(path) == fingerprint:
+                continue
+            body = {
+                entity_type: [
+                    json.loads(x)
+                    for (x,) in connection.execute(
+                        "SELECT body FROM {}s WHERE parent = ?".format(entity_type),
+                        (path,),
+                    )
+                ]
+                for entity_type, _ in INDEXED_ENTITIES
+            }
+            count += self.index(path, body, fingerprint)
+
+        # the remaining sources are not mirrored anymore
+        with self.connection:
+            for parent in indexed:
+                self._delete(parent)
+
+        return count
+
+    def remove(self, parent):
+        """Remove a version or workspace from the index."""
+        with self.connection:
+            self._delete(parent)
+
+    def _delete(self, parent):
+        """Delete the documents of a parent. Their trigrams are recomputed from the values, so
+        that they are deleted by primary key.
+        """
+        documents = self.connection.execute(
+            "SELECT id, value FROM documents WHERE parent = ?", (parent,)
+        ).fetchall()
+        postings = sorted(
+            (x, document) for document, value in documents for x in trigrams(value)
+        )
+        self.connection.executemany(
+            "DELETE FROM trigrams WHERE trigram = ? AND document = ?", postings
+        )
+        self.connection.execute("DELETE FROM documents WHERE parent = ?", (parent,))
+        self.connection.execute("DELETE FROM sources WHERE parent = ?", (parent,))
+
+    def _candidates(self, literals):
+        """Yield the documents containing all trigrams of the literals. Without trigrams, all
+        documents are candidates.
+        """
+        # a subset of the trigrams is selective enough, the candidates are verified anyway
+        query_trigrams = sorted(set().union(*(trigrams(x) for x in literals)))[
+            :MAX_QUERY_TRIGRAMS
+        ]
+        if not query_trigrams:
+            rows = self.connection.execute(
+                "SELECT id, parent, entity_type, entity_id, name, key, value FROM documents"
+            )
+        else:
+            rows = self.connection.execute(
+                "SELECT id, parent, entity_type, entity_id, name, key, value FROM documents "
+                "WHERE id IN ({})".format(
+                    " INTERSECT ".join(
+                        ["SELECT document FROM trigrams WHERE trigram = ?"]
+                        * len(query_trigrams)
+                    )
+                ),
+                list(query_trigrams),
+            )
+
+        for row in rows:
+            yield {
+                "parent": GTMPath(row[1]),
+                "type": row[2],
+                "id": row[3],
+                "name": row[4],
+                "key": row[5],
+                "value": row[6],
+            }
+
+    def search(self, text):
+        """Find all values containing a string, ignoring the case.
+
+        Args:
+            text (str): The substring.
+
+        Returns:
+            A list of dicts with the keys :code:`parent` (the version or workspace path),
+            :code:`type` ("tag", "trigger" or "variable"), :code:`id`, :code:`name`, :code:`key`
+            (the parameter key path, i.e. "html") and :code:`value`.
+        """
+        text = text.lower()
+        return [x for x in self._candidates([text]) if text in x["value"].lower()]
+
+    def search_regex(self, pattern, flags=re.IGNORECASE):
+        """Find all values matching a regular expression.
+
+        Args:
+            pattern (str): The regular expression, matched with :func:`re.search`.
+            flags (int): The regular expression flags.
+
+        Returns:
+            A list of dicts, see :meth:`search`.
+        """
+        regex = re.compile(pattern, flags)
+        return [
+            x
+            for x in self._candidates(regex_literals(pattern))
+            if regex.search(x["value"])
+        ]
@@ -0,0 +1,260 @@
+"""sequencing.py"""
+import heapq
+
+from gtm_manager.simulation import BUILT_IN_TRIGGERS
+
+
+def _priority(tag):
+    """The tag firing priority, tags with a higher priority fire first."""
+    try:
+        return int((tag.get("priority") or {}).get("value") or 0)
+    except ValueError:
+        return 0
+
+
+class GTMSequencingGraph(object):
+    """The tag sequencing graph of a container version.
+
+    Every tag is a node named by its tag name, as setup and teardown tags are referenced by name.
+    A setup tag has an edge to the tags it is set up for, a tag has an edge to its teardown tags.
+    Tags firing on the same trigger without a sequencing edge between them fire by
+    :attr:`priority`, the higher first. Paused tags do not fire.
+
+    Args:
+        version (:class:`gtm_manager.version.GTMVersionView`): The container version.
+    """
+
+    def __init__(self, version):
+        body = version.raw_body
+        self._tags = {x.get("name"): x for x in body.get("tag") or []}
+        self._trigger_ids = set(BUILT_IN_TRIGGERS) | {
+            x.get("triggerId") for x in body.get("trigger") or []
+        }
+
+        self.edges = {name: [] for name in self._tags}
+        self._setups = {}
+        for name, tag in self._tags.items():
+            for setup in tag.get("setupTag") or []:
+                self.edges.setdefault(setup.get("tagName"), []).append(name)
+                self._setups.setdefault(name, []).append(setup.get("tagName"))
+            for teardown in tag.get("teardownTag") or []:
+                self.edges[name].append(teardown.get("tagName"))
+
+    def dangling(self):
+        """Find references to tags and triggers, that do not exist in the version, and sequencing
+        references to paused tags.
+
+        Returns:
+            A list of dicts with the keys :code:`tag` (the referencing tag name), :code:`field`
+            (i.e. "setupTag" or "firingTriggerId"), :code:`reference` (the tag name or trigger id)
+            and :code:`reason` ("missing" or "paused").
+        """
+        results = []
+        for name, tag in self._tags.items():
+            for field in ("setupTag", "teardownTag"):
+                for reference in tag.get(field) or []:
+                    target = self._tags.get(reference.get("tagName"))
+                    if target is None or target.get("paused"):
+                        results.append(
+                            {
+                                "tag": name,
+                                "field": field,
+                                "reference": reference.get("tagName"),
+                                "reason": "missing" if target is None else "paused",
+                            }
+                        )
+            for field in ("firingTriggerId", "blockingTriggerId"):
+                for trigger_id in tag.get(field) or []:
+                    if trigger_id not in self._trigger_ids:
+                        results.append(
+                            {
+                                "tag": name,
+                                "field": field,
+                                "reference": trigger_id,
+                                "reason": "missing",
+                            }
+                        )
+        return results
+
+    def cycles(self):
+        """Find sequencing cycles, i.e. a tag being its own (indirect) setup tag.
+
+        Returns:
+            A list of cycles, each a sorted list of the tag names in the cycle.
+        """
+        # iterative Tarjan, deep sequencing chains must not hit the recursion limit
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        results = []
+
+        for root in self.edges:
+            if root in index:
+                continue
+            work = [(root, iter(self.edges.get(root) or []))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.edges.get(child) or [])))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in (self.edges.get(node) or []):
+                        results.append(sorted(component))
+
+        return results
+
+    def _trigger_graph(self, trigger_id):
+        """The tags firing on a trigger, including their setup and teardown tags, and the edges
+        between them.
+        """
+        nodes = set()
+        pending = [
+            name
+            for name, tag in self._tags.items()
+            if trigger_id in (tag.get("firingTriggerId") or [])
+        ]
+        while pending:
+            name = pending.pop()
+            tag = self._tags.get(name)
+            if name in nodes or tag is None or tag.get("paused"):
+                continue
+            nodes.add(name)
+            pending.extend(self._setups.get(name) or [])
+            pending.extend(self.edges.get(name) or [])
+
+        edges = {x: [y for y in self.edges.get(x) or [] if y in nodes] for x in nodes}
+        return nodes, edges
+
+    def firing_order(self, trigger_id):
+        """Compute the effective firing order of the tags firing on a trigger.
+
+        Args:
+            trigger_id (str): The trigger id.
+
+        Returns:
+            A list of tag names: setup tags before the tags they are set up for, teardown tags
+            after them and otherwise by priority and name.
+
+        Raises:
+            ValueError: If the tags of the trigger are sequenced in a cycle.
+        """
+        nodes, edges = self._trigger_graph(trigger_id)
+
+        indegree = dict.fromkeys(nodes, 0)
+        for targets in edges.values():
+            for target in targets:
+                indegree[target] += 1
+
+        ready = [(-_priority(self._tags[x]), x) for x in nodes if not indegree[x]]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, name = heapq.heappop(ready)
+            order.append(name)
+            for target in edges[name]:
+                indegree[target] -= 1
+                if not indegree[target]:
+                    heapq.heappush(ready, (-_priority(self._tags[target]), target))
+
+        if len(order) < len(nodes):
+            raise ValueError(
+                "Tags firing on trigger {!r} are sequenced in a cycle: {}".format(
+                    trigger_id, sorted(set(nodes) - set(order))
+                )
+            )
+        return order
+
+    def critical_path(self, trigger_id, weight=None):
+        """Find the longest chain of sequenced tags firing on a trigger. Sequenced tags wait for
+        each other, the chain length is the least number of tags loaded one after another.
+
+        Args:
+            trigger_id (str): The trigger id.
+            weight (callable): Called with a tag name, returns the cost of the tag, i.e. its
+                payload size. Defaults to 1 per tag.
+
+        Returns:
+            A tuple of the chain length and the list of tag names in the chain.
+
+        Raises:
+            ValueError: If the tags of the trigger are sequenced in a cycle.
+        """
+        weight = weight or (lambda name: 1)
+        order = self.firing_order(trigger_id)
+        _, edges = self._trigger_graph(trigger_id)
+
+        lengths = {}
+        previous = {}
+        for name in order:
+            lengths[name] = lengths.get(name, 0) + weight(name)
+            for target in edges[name]:
+                if lengths[name] > lengths.get(target, 0):
+                    lengths[target] = lengths[name]
+                    previous[target] = name
+
+        if not lengths:
+            return 0, []
+
+        end = max(order, key=lambda x: lengths[x])
+        chain = [end]
+        while chain[-1] in previous:
+            chain.append(previous[chain[-1]])
+        return lengths[end], chain[::-1]
+
+    def report(self):
+        """Check the sequencing of the version.
+
+        Returns:
+            A dict with the keys :code:`cycles`, :code:`dangling` and :code:`triggers`. The
+            triggers are a dict with the ids of all triggers tags fire on as keys and dicts with
+            the keys :code:`order` and :code:`critical_path` (the chain length and chain) as
+            values, or the :code:`ValueError` of a cycle.
+        """
+        trigger_ids = sorted(
+            {
+                x
+                for tag in self._tags.values()
+                if not tag.get("paused")
+                for x in tag.get("firingTriggerId") or []
+            }
+        )
+
+        triggers = {}
+        for trigger_id in trigger_ids:
+            try:
+                triggers[trigger_id] = {
+                    "order": self.firing_order(trigger_id),
+                    "critical_path": self.critical_path(trigger_id),
+                }
+            except ValueError as error:
+                triggers[trigger_id] = error
+
+        return {
+            "cycles": self.cycles(),
+            "dangling": self.dangling(),
+            "triggers": triggers,
+        }
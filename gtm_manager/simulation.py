@@ -0,0 +1,419 @@
+"""simulation.py"""
+import re
+import sys
+import functools
+
+from gtm_manager import data_layer, ALL_PAGES_TRIGGER_ID
+from gtm_manager.resolver import GTMVariableResolver, REFERENCE
+
+# The event pushed by GTM, that a trigger type listens to
+TRIGGER_EVENTS = {
+    "pageview": "gtm.js",
+    "domReady": "gtm.dom",
+    "windowLoaded": "gtm.load",
+    "click": "gtm.click",
+    "linkClick": "gtm.linkClick",
+    "formSubmission": "gtm.formSubmit",
+    "timer": "gtm.timer",
+    "historyChange": "gtm.historyChange",
+    "jsError": "gtm.pageError",
+    "scrollDepth": "gtm.scrollDepth",
+    "elementVisibility": "gtm.elementVisibility",
+    "youTubeVideo": "gtm.video",
+}
+
+# Triggers every container has, that are referenced by id but not part of the version
+BUILT_IN_TRIGGERS = {
+    ALL_PAGES_TRIGGER_ID: "gtm.js",
+    "2147479572": "gtm.init_consent",  # Consent Initialization - All Pages
+    "2147479573": "gtm.init",  # Initialization - All Pages
+}
+
+_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _number(value):
+    """_number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_predicate(condition_type, operand, ignore_case=False):
+    """Compile a condition into a predicate over the string value of its first argument.
+
+    Predicates are cached, so that equal conditions of different triggers share a predicate and
+    its regular expression.
+
+    Args:
+        condition_type (str): The condition type, i.e. "equals" or "matchRegex".
+        operand (str): The second argument of the condition.
+        ignore_case (bool): Whether the condition ignores the case.
+
+    Returns:
+        A callable returning :code:`True` if a string matches. Conditions that cannot be evaluated
+        offline, i.e. "cssSelector", never match.
+    """
+    if ignore_case and condition_type not in ("matchRegex", "urlMatches"):
+        operand = operand.lower()
+
+        def fold(predicate):
+            return lambda value: predicate(value.lower())
+
+    else:
+
+        def fold(predicate):
+            return predicate
+
+    if condition_type == "equals":
+        return fold(lambda value: value == operand)
+    if condition_type == "contains":
+        return fold(lambda value: operand in value)
+    if condition_type == "startsWith":
+        return fold(lambda value: value.startswith(operand))
+    if condition_type == "endsWith":
+        return fold(lambda value: value.endswith(operand))
+
+    if condition_type in ("matchRegex", "urlMatches"):
+        try:
+            search = re.compile(operand, re.IGNORECASE if ignore_case else 0).search
+        except re.error:
+            return lambda value: False
+        return lambda value: search(value) is not None
+
+    comparisons = {
+        "greater": lambda a, b: a > b,
+        "greaterOrEquals": lambda a, b: a >= b,
+        "less": lambda a, b: a < b,
+        "lessOrEquals": lambda a, b: a <= b,
+    }
+    number = _number(operand)
+    if condition_type in comparisons and number is not None:
+        compare = comparisons[condition_type]
+
+        def predicate(value):
+            value = _number(value)
+            return value is not None and compare(value, number)
+
+        return predicate
+
+    return lambda value: False
+
+
+def mask_indices(mask):
+    """Convert a bit mask as returned by :meth:`GTMTriggerSimulator.simulate_columns` into a list
+    of push indices.
+    """
+    bits = bin(mask)[:1:-1]
+    return [index for index, bit in enumerate(bits) if bit == "1"]
+
+
+def _mask(flags):
+    """Pack a sequence of 0/1 flags into an int bit mask, the first flag being the lowest bit."""
+    flags = bytes(flags)
+    return int(flags[::-1].translate(_BITS), 2) if flags else 0
+
+
+class _Condition(object):
+    """A compiled condition."""
+
+    __slots__ = (
+        "key",
+        "condition_type",
+        "ignore_case",
+        "arg0",
+        "arg1",
+        "dynamic",
+        "predicate",
+        "negate",
+    )
+
+    def __init__(self, condition):
+        params = {
+            x.get("key"): x.get("value") for x in condition.get("parameter") or []
+        }
+        self.condition_type = condition.get("type")
+        self.ignore_case = params.get("ignore_case") == "true"
+
+        self.arg0 = sys.intern(params.get("arg0") or "")
+        self.arg1 = sys.intern(params.get("arg1") or "")
+        self.negate = params.get("negate") == "true"
+        self.dynamic = REFERENCE.search(self.arg1) is not None
+        self.predicate = None
+        if not self.dynamic:
+            self.predicate = compile_predicate(
+                self.condition_type, self.arg1, self.ignore_case
+            )
+        # equal conditions of different triggers are evaluated once in column mode
+        self.key = (
+            self.condition_type,
+            self.arg0,
+            self.arg1,
+            self.ignore_case,
+            self.negate,
+        )
+
+    def matches(self, value, operand=None):
+        """Whether the string values of the arguments match."""
+        predicate = self.predicate or compile_predicate(
+            self.condition_type, operand, self.ignore_case
+        )
+        return predicate(value) != self.negate
+
+
+class GTMTriggerSimulator(object):
+    """Simulate which triggers match and which tags fire for recorded dataLayer pushes, without
+    loading the container in GTM preview.
+
+    The triggers and tags of the version are compiled once. Every push is merged into the data
+    model and triggers are evaluated on pushes with an :code:`event` key. Trigger types are
+    mapped to the events GTM pushes for them, i.e. "linkClick" to "gtm.linkClick". The conditions
+    of :attr:`filter`, :attr:`autoEventFilter` and :attr:`customEventFilter` have to match.
+    Variable references are resolved from the data model and the page state by a
+    :class:`gtm_manager.resolver.GTMVariableResolver`.
+
+    Not simulated are trigger types without a web event (AMP and Firebase), trigger groups,
+    "cssSelector" conditions, which never match, tag sequencing, tag firing options and schedules.
+    Paused tags never fire.
+
+    Args:
+        version (:class:`gtm_manager.version.GTMVersionView`): The container version.
+        resolver (:class:`gtm_manager.resolver.GTMVariableResolver`): The variable resolver.
+            Defaults to a resolver of the version.
+    """
+
+    def __init__(self, version, resolver=None):
+        body = version.raw_body
+
+        self.resolver = resolver or GTMVariableResolver(version)
+        self._operands = {}
+
+        self._triggers = {}
+        self._by_event = {}
+        for trigger_id, event in BUILT_IN_TRIGGERS.items():
+            self._add_trigger(trigger_id, event, [])
+        for trigger in body.get("trigger") or []:
+            self._compile_trigger(trigger)
+
+        self._tags = [
+            (
+                x.get("tagId"),
+                frozenset(x.get("firingTriggerId") or []),
+                frozenset(x.get("blockingTriggerId") or []),
+            )
+            for x in body.get("tag") or []
+            if not x.get("paused")
+        ]
+
+    def _compile_trigger(self, trigger):
+        """_compile_trigger"""
+        trigger_type = trigger.get("type")
+        conditions = [
+            _Condition(x)
+            for x in (trigger.get("filter") or [])
+            + (trigger.get("autoEventFilter") or [])
+        ]
+
+        if trigger_type == "always":
+            event = None
+        elif trigger_type == "customEvent":
+            event = None
+            for condition in map(_Condition, trigger.get("customEventFilter") or []):
+                # index custom event triggers by their event name instead of testing all events,
+                # case-insensitive names are tested as conditions
+                if (
+                    event is None
+                    and condition.condition_type == "equals"
+                    and condition.arg0 == "{{_event}}"
+                    and not condition.dynamic
+                    and not condition.negate
+                    and not condition.ignore_case
+                ):
+                    event = condition.arg1
+                else:
+                    conditions.append(condition)
+        elif trigger_type in TRIGGER_EVENTS:
+            event = TRIGGER_EVENTS[trigger_type]
+        else:
+            return
+
+        self._add_trigger(trigger.get("triggerId"), event, conditions)
+
+    def _add_trigger(self, trigger_id, event, conditions):
+        """_add_trigger"""
+        for condition in conditions:
+            self._operand(condition.arg0)
+            if condition.dynamic:
+                self._operand(condition.arg1)
+
+        self._triggers[trigger_id] = (event, tuple(conditions))
+        self._by_event.setdefault(event, []).append(trigger_id)
+
+    def _operand(self, text):
+        """Compile an operand into a callable returning its string value for a state."""
+        if text not in self._operands:
+            self._operands[text] = self.resolver.template(text)
+        return self._operands[text]
+
+    def _trigger_matches(self, trigger_id, model, page, values, memo):
+        """Whether a trigger matches the current state. Operand values are memoized in
+        :code:`values`, variable values in :code:`memo`.
+        """
+        for condition in self._triggers[trigger_id][1]:
+            if condition.arg0 not in values:
+                values[condition.arg0] = self._operands[condition.arg0](
+                    model, page, memo
+                )
+            operand = None
+            if condition.dynamic:
+                if condition.arg1 not in values:
+                    values[condition.arg1] = self._operands[condition.arg1](
+                        model, page, memo
+                    )
+                operand = values[condition.arg1]
+            if not condition.matches(values[condition.arg0], operand):
+                return False
+        return True
+
+    def matching_triggers(self, model, page=None):
+        """Evaluate all triggers for the current event.
+
+        Args:
+            model (dict): The data model, including the :code:`event` key of the current push.
+            page (dict): The page state, see :meth:`gtm_manager.resolver.GTMVariableResolver.resolve`.
+
+        Returns:
+            A list of the ids of the matching triggers.
+        """
+        page = page or {}
+        values = {}
+        memo = {}
+        candidates = self._by_event.get(model.get("event"), []) + self._by_event.get(
+            None, []
+        )
+        return [
+            x for x in candidates if self._trigger_matches(x, model, page, values, memo)
+        ]
+
+    def firing_tags(self, model, page=None):
+        """Evaluate which tags fire for the current event.
+
+        Args:
+            model (dict): The data model, including the :code:`event` key of the current push.
+            page (dict): The page state, see :meth:`gtm_manager.resolver.GTMVariableResolver.resolve`.
+
+        Returns:
+            A list of the ids of the tags, that have a matching firing trigger and no matching
+            blocking trigger.
+        """
+        matching = set(self.matching_triggers(model, page))
+        return [
+            tag_id
+            for tag_id, firing, blocking in self._tags
+            if not firing.isdisjoint(matching) and blocking.isdisjoint(matching)
+        ]
+
+    def simulate(self, pushes, page=None):
+        """Simulate a sequence of dataLayer pushes event by event.
+
+        Args:
+            pushes (iterable): The pushed dicts in order.
+            page (dict): The page state, see :meth:`gtm_manager.resolver.GTMVariableResolver.resolve`.
+
+        Yields:
+            A tuple of the push index, the event name and the list of the ids of the firing tags
+            for every push with an :code:`event` key.
+        """
+        model = {}
+        for index, push in enumerate(pushes):
+            data_layer.merge(model, push)
+            if "event" in push:
+                yield index, push["event"], self.firing_tags(model, page)
+
+    def simulate_columns(self, pushes, page=None):
+        """Simulate a sequence of dataLayer pushes column-wise.
+
+        The values of all operands are read for all events first. Every distinct condition is then
+        evaluated once per distinct operand value and the results are combined as bit masks over
+        all pushes. This is much faster than :meth:`simulate` for large event logs, because
+        recorded events repeat the same values.
+
+        Args:
+            pushes (iterable): The pushed dicts in order.
+            page (dict): The page state, see :meth:`gtm_manager.resolver.GTMVariableResolver.resolve`.
+
+        Returns:
+            A dict with the ids of the tags, that fired at least once, as keys and int bit masks as
+            values. Bit :code:`i` is set if the tag fires on the push with index :code:`i`, see
+            :func:`mask_indices`.
+        """
+        operands = list(self._operands.items())
+        columns = {text: [] for text, _ in operands}
+        events = []
+
+        page = page or {}
+        model = {}
+        for push in pushes:
+            data_layer.merge(model, push)
+            if "event" in push:
+                events.append(push["event"])
+                memo = {}
+                for text, operand in operands:
+                    columns[text].append(operand(model, page, memo))
+            else:
+                events.append(None)
+                for text, _ in operands:
+                    columns[text].append(None)
+
+        event_flags = {event: bytearray(len(events)) for event in set(events)}
+        for index, event in enumerate(events):
+            event_flags[event][index] = 1
+        event_flags.pop(None, None)
+        event_masks = {event: _mask(flags) for event, flags in event_flags.items()}
+        all_events = 0
+        for mask in event_masks.values():
+            all_events |= mask
+
+        condition_masks = {}
+        trigger_masks = {}
+        for trigger_id, (event, conditions) in self._triggers.items():
+            mask = all_events if event is None else event_masks.get(event, 0)
+            for condition in conditions:
+                if not mask:
+                    break
+                if condition.key not in condition_masks:
+                    condition_masks[condition.key] = self._condition_mask(
+                        condition, columns
+                    )
+                mask &= condition_masks[condition.key]
+            trigger_masks[trigger_id] = mask
+
+        results = {}
+        for tag_id, firing, blocking in self._tags:
+            mask = 0
+            for trigger_id in firing:
+                mask |= trigger_masks.get(trigger_id, 0)
+            for trigger_id in blocking:
+                mask &= ~trigger_masks.get(trigger_id, 0)
+            if mask:
+                results[tag_id] = mask
+        return results
+
+    @staticmethod
+    def _condition_mask(condition, columns):
+        """Evaluate a condition once per distinct value of its operand columns."""
+        results = {None: 0}
+        values = columns[condition.arg0]
+
+        if condition.dynamic:
+            values = list(zip(values, columns[condition.arg1]))
+            for pair in set(values):
+                results[pair] = 0 if pair[0] is None else int(condition.matches(*pair))
+        else:
+            for value in set(values):
+                if value is not None:
+                    results[value] = int(condition.matches(value))
+
+        return _mask(map(results.__getitem__, values))
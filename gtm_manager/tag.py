@@ -1,101 +1,70 @@
 """tag.py"""
-import copy
+from googleapiclient.errors import HttpError
 
 import gtm_manager.base
 import gtm_manager.parameter
-from gtm_manager.utils import param_dict
+from gtm_manager.utils import param_dict, canonical_hash, is_fingerprint_conflict
+from gtm_manager.path import GTMPath
+from gtm_manager.validation import check_body
 
 
-class GTMTag(gtm_manager.base.GTMBase):
-    """Open a specific GTM Tag.
+class GTMTagView(object):
+    """Read-only view of a GTM Tag API representation. The view does not hold an API service
+    and can be pickled, i.e. to analyse exported versions in a process pool. A pickled
+    :class:`GTMTag` is unpickled without its API service, which is built again on first use.
 
     Args:
-        tag (dict): An API representation of the GTM Tag. If provided, the resource will be not be
-            loaded from the API. :code:`tag` or :code:`path` argument must be set.
-        path (str): The API path to the resource, i.e.
-            "accounts/1234/containers/1234/workspaces/1234/tags/123". If provided instead of
-            :code:`tag`, the representation will be loaded from the API. :code:`path` or :code:`tag`
-            argument must be set.
-        parent (str): Required, when the instance is initialized with a :code:`tag` argument to
-            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
-        **kwargs: Additional keyword args to initialize the base class.
+        tag (dict): An API representation of the GTM Tag.
+        path (str): The API path to the resource. Defaults to the :code:`path` of the
+            representation.
+        parent (str): The parent path used to build the resource path, if :code:`path` is not set,
+            i.e. "accounts/1234/containers/1234/workspaces/1234"
     """
 
-    def __init__(self, tag=None, path=None, parent=None, **kwargs):
-        super().__init__(**kwargs)
+    __slots__ = ("_raw_body", "_path", "_parameter")
 
-        self.tags_service = (
-            self.service.accounts().containers().workspaces().tags()
-        )  # pylint: disable=E1101
+    def __init__(self, tag, path=None, parent=None):
+        self._raw_body = tag
+        self._path = GTMPath(
+            path
+            or tag.get("path")
+            or "{}/tags/{}".format(parent, tag.get("tagId"))
+        )
+        self._parameter = None
 
-        if tag:
-            pass
-        elif path:
-            tag = self._get_tag(path)
-        else:
-            raise ValueError(
-                "Please pass either a container obj and parent or container path."
-            )
-
-        self._paused = tag.get("paused")
-        self._setupTag = tag.get("setupTag")
-        self._firingRuleId = tag.get("firingRuleId", [])
-        self._accountId = tag.get("accountId")
-        self._teardownTag = tag.get("teardownTag")
-        self._priority = tag.get("priority")
-        self._workspaceId = tag.get("workspaceId")
-        self._parameter = tag.get("parameter", [])
-        self._parentFolderId = tag.get("parentFolderId")
-        self._scheduleStartMs = tag.get("scheduleStartMs")
-        self._scheduleEndMs = tag.get("scheduleEndMs")
-        self._containerId = tag.get("containerId")
-        self._tagFiringOption = tag.get("tagFiringOption")
-        self._tagId = tag.get("tagId")
-        self._blockingRuleId = tag.get("blockingRuleId", [])
-        self._tagManagerUrl = tag.get("tagManagerUrl")
-        self._fingerprint = tag.get("fingerprint")
-        self._firingTriggerId = tag.get("firingTriggerId", [])
-        self._name = tag.get("name")
-        self._type = tag.get("type")
-        self._notes = tag.get("notes")
-        self._liveOnly = tag.get("liveOnly")
-        self._blockingTriggerId = tag.get("blockingTriggerId", [])
-        self._path = path or "{}/tags/{}".format(parent, self._tagId)
-
-        self._parameter = [
-            gtm_manager.parameter.GTMParameter(x) for x in self._parameter
-        ]
+    def __reduce__(self):
+        return (GTMTagView, (self._raw_body, self._path))
 
     @property
     def paused(self):
         """bool: Indicates whether the tag is paused, which prevents the tag from firing.
         """
-        return self._paused
+        return self._raw_body.get("paused")
 
     @property
     def setupTag(self):
         """list: The list of setup tags. Currently we only allow one.
         """
-        return self._setupTag
+        return self._raw_body.get("setupTag")
 
     @property
     def firingRuleId(self):
         """bool: Firing rule IDs. A tag will fire when any of the listed rules are true and all of
         its blockingRuleIds (if any specified) are false.
         """
-        return self._firingRuleId
+        return self._raw_body.get("firingRuleId", [])
 
     @property
     def accountId(self):
         """str: GTM Account ID.
         """
-        return self._accountId
+        return self._raw_body.get("accountId")
 
     @property
     def teardownTag(self):
         """list: The list of teardown tags. Currently we only allow one.
         """
-        return self._teardownTag
+        return self._raw_body.get("teardownTag")
 
     @property
     def priority(self):
@@ -103,79 +72,84 @@ class GTMTag(gtm_manager.base.GTMBase):
         tag. Tags are fired asynchronously in order of priority. Tags with higher numeric value fire
         first. A tag's priority can be a positive or negative value. The default value is 0.
         """
-        return self._priority
+        return self._raw_body.get("priority")
 
     @property
     def workspaceId(self):
         """str: GTM Workspace ID.
         """
-        return self._workspaceId
+        return self._raw_body.get("workspaceId")
 
     @property
     def parameter(self):
         """list: The tag's parameters.
         """
+        if self._parameter is None:
+            self._parameter = [
+                gtm_manager.parameter.GTMParameter(x)
+                for x in self._raw_body.get("parameter") or []
+            ]
         return self._parameter
 
     @property
     def parentFolderId(self):
         """str: Parent folder id.
         """
-        return self._parentFolderId
+        return self._raw_body.get("parentFolderId")
 
     @property
     def scheduleStartMs(self):
         """str: The start timestamp in milliseconds to schedule a tag.
         """
-        return self._scheduleStartMs
+        return self._raw_body.get("scheduleStartMs")
 
     @property
     def scheduleEndMs(self):
         """str: The end timestamp in milliseconds to schedule a tag.
         """
-        return self._scheduleEndMs
+        return self._raw_body.get("scheduleEndMs")
 
     @property
     def containerId(self):
         """str: GTM Container ID.
         """
-        return self._containerId
+        return self._raw_body.get("containerId")
 
     @property
     def tagFiringOption(self):
         """str: Option to fire this tag.
         """
-        return self._tagFiringOption
+        return self._raw_body.get("tagFiringOption")
 
     @property
     def tagId(self):
         """str: The Tag ID uniquely identifies the GTM Tag.
         """
-        return self._tagId
+        return self._raw_body.get("tagId")
 
     @property
     def blockingRuleId(self):
         """list: Blocking rule IDs. If any of the listed rules evaluate to true, the tag will not
         fire.
         """
-        return self._blockingRuleId
+        return self._raw_body.get("blockingRuleId", [])
 
     @property
     def tagManagerUrl(self):
         """str: Auto generated link to the tag manager UI
         """
-        return self._tagManagerUrl
+        return self._raw_body.get("tagManagerUrl")
 
     @property
     def fingerprint(self):
         """str: The fingerprint of the GTM Tag as computed at storage time. This value is recomputed
         whenever the tag is modified.
         """
-        return self._fingerprint
+        return self._raw_body.get("fingerprint")
 
     @property
     def path(self):
-        """str: GTM Tag's API relative path.
+        """:class:`gtm_manager.path.GTMPath`: GTM Tag's API relative path.
         """
         return self._path
 
@@ -184,50 +158,111 @@ class GTMTag(gtm_manager.base.GTMBase):
         """list: Firing trigger IDs. A tag will fire when any of the listed triggers are true and
         all of its blockingTriggerIds (if any specified) are false.
         """
-        return self._firingTriggerId
+        return self._raw_body.get("firingTriggerId", [])
 
     @property
     def name(self):
         """str: Tag display name.
         """
-        return self._name
+        return self._raw_body.get("name")
 
     @property
     def type(self):
         """str: GTM Tag Type.
         """
-        return self._type
+        return self._raw_body.get("type")
 
     @property
     def notes(self):
         """str: User notes on how to apply this tag in the container.
         """
-        return self._notes
+        return self._raw_body.get("notes")
 
     @property
     def liveOnly(self):
         """bool: If set to true, this tag will only fire in the live environment (e.g. not in
         preview or debug mode).
         """
-        return self._liveOnly
+        return self._raw_body.get("liveOnly")
 
     @property
     def blockingTriggerId(self):
         """list: Blocking trigger IDs. If any of the listed triggers evaluate to true, the tag will
         not fire.
         """
-        return self._blockingTriggerId
+        return self._raw_body.get("blockingTriggerId", [])
+
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
 
     @property
     def parameter_dict(self):
-        """dict: Deepcopy of GTMParameters acceable via their key value.
+        """dict: Independent GTMParameters acceable via their key value. Changing them does not
+        change the cached parameters, until they are passed to :meth:`update`.
+        """
+        return param_dict(
+            gtm_manager.parameter.GTMParameter(x)
+            for x in self._raw_body.get("parameter") or []
+        )
+
+
+class GTMTag(GTMTagView, gtm_manager.base.GTMBase):
+    """Open a specific GTM Tag.
+
+    Args:
+        tag (dict): An API representation of the GTM Tag. If provided, the resource will be not be
+            loaded from the API. :code:`tag` or :code:`path` argument must be set.
+        path (str): The API path to the resource, i.e.
+            "accounts/1234/containers/1234/workspaces/1234/tags/123". If provided instead of
+            :code:`tag`, the representation will be loaded from the API. :code:`path` or :code:`tag`
+            argument must be set.
+        parent (str): Required, when the instance is initialized with a :code:`tag` argument to
+            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
+        **kwargs: Additional keyword args to initialize the base class.
+    """
+
+    __slots__ = ("_service", "_tags_service")
+
+    def __init__(self, tag=None, path=None, parent=None, **kwargs):
+        gtm_manager.base.GTMBase.__init__(self, **kwargs)
+
+        self._tags_service = None
+
+        if tag:
+            pass
+        elif path:
+            tag = self._get_tag(path)
+        else:
+            raise ValueError(
+                "Please pass either a container obj and parent or container path."
+            )
+
+        super().__init__(tag, path=path, parent=parent)
+
+    def __reduce__(self):
+        return (
+            gtm_manager.base.restore,
+            (GTMTag, GTMTagView(self._raw_body, self._path)),
+        )
+
+    @property
+    def tags_service(self):
+        """obj: The Tag Manager API resource for tags, created on first use.
         """
-        return param_dict(copy.deepcopy(self._parameter))
+        if self._tags_service is None:
+            self._tags_service = (
+                self.service.accounts().containers().workspaces().tags()
+            )  # pylint: disable=E1101
+        return self._tags_service
 
     def update(self, refresh=False, parameter=None, **kwargs):
-        """Update the current tag. The GTM API does not support a partial update. Therfore, this
-        method will send all fields expliztily set in the method arguments and those cached in the 
-        instance properties.
+        """Update the current tag. The GTM API does not support a partial update. Therefore, this
+        method sends the tag's API representation as cached in :attr:`raw_body`, patched with the
+        fields explicitly set in the method arguments. Fields not modelled by this class are sent
+        back unchanged.
 
         GTMParameters passed in a list as the `parameter` argument, will be merged recursivly with
         the exsisting parameters based on their parameter key.
@@ -236,56 +271,58 @@ class GTMTag(gtm_manager.base.GTMBase):
         keyword arguments on the method call. 
 
         Args:
-            refresh (bool): Force a refresh of the entire GTMTag instance to prevent implicitly
-                sending stale property data.
+            refresh (bool): The update is sent with the cached fingerprint. If the API rejects it
+                as stale, reload the tag, re-apply the update and send it again. Otherwise, the
+                API error is raised.
             parameter (list): :class:`gtm_manager.parameter.GTMParameter` s to be merged recursivly
                 with the exsisting parameters based on their parameter key.
             **kwargs: Additional resource properties to update with this call.
 
+        Returns:
+            :code:`True` if the tag was written, :code:`False` if the API request was skipped
+            because the update body did not differ from the cached state.
+
         Raises:
             ValueError
+            :class:`googleapiclient.errors.HttpError`: If the update failed, i.e. because the
+                cached fingerprint is stale and :code:`refresh` is not set.
+            :class:`gtm_manager.exceptions.ValidationError`: If the update body does not match the
+                discovery document.
         """
         if parameter and not isinstance(parameter, list):
             raise ValueError(
                 "'parameter' has to be a list of :class:`GTMParameters` or 'None'."
             )
 
-        if refresh:
-            self.__init__(path=self._path, service=self.service)
-
-        default_asset = {
-            "paused": self._paused,
-            "setupTag": self._setupTag,
-            "firingRuleId": self._firingRuleId,
-            "teardownTag": self._teardownTag,
-            "priority": self._priority,
-            "parentFolderId": self._parentFolderId,
-            "scheduleStartMs": self._scheduleStartMs,
-            "scheduleEndMs": self._scheduleEndMs,
-            "tagFiringOption": self._tagFiringOption,
-            "blockingRuleId": self._blockingRuleId,
-            "firingTriggerId": self._firingTriggerId,
-            "name": self._name,
-            "type": self._type,
-            "notes": self._notes,
-            "liveOnly": self._liveOnly,
-            "blockingTriggerId": self._blockingTriggerId,
-        }
-        update_asset = {**default_asset, **kwargs}
+        update_asset = {**self._raw_body, **kwargs}
 
         if parameter:
-            parameter_dict = {**param_dict(self._parameter), **param_dict(parameter)}
-            parameter = list(parameter_dict.values())
+            parameter_dict = {**param_dict(self.parameter), **param_dict(parameter)}
+            update_parameter = list(parameter_dict.values())
         else:
-            parameter = self._parameter
+            update_parameter = self.parameter
 
-        update_asset["parameter"] = [x.to_obj() for x in parameter]
+        update_asset["parameter"] = [x.to_obj() for x in update_parameter]
 
         update_asset = {k: v for k, v in update_asset.items() if v is not None}
 
-        request = self.tags_service.update(path=self.path, body=update_asset)
-        response = request.execute()
+        if canonical_hash(update_asset) == canonical_hash(self._raw_body):
+            return False
+
+        check_body(self.service, "Tag", update_asset)
+        request = self.tags_service.update(
+            path=self.path, body=update_asset, fingerprint=self.fingerprint
+        )
+        try:
+            response = request.execute()
+        except HttpError as error:
+            if not refresh or not is_fingerprint_conflict(error):
+                raise error
+            self.__init__(path=self._path, service=self.service)
+            return self.update(parameter=parameter, **kwargs)
+
         self.__init__(tag=response, service=self.service)
+        return True
 
     def _get_tag(self, path):
         """_get_tag"""
@@ -1,93 +1,53 @@
 """trigger.py"""
+from googleapiclient.errors import HttpError
+
 import gtm_manager.base
 import gtm_manager.parameter
-from gtm_manager.utils import param_dict
+from gtm_manager.utils import param_dict, canonical_hash, is_fingerprint_conflict
+from gtm_manager.path import GTMPath
+from gtm_manager.validation import check_body
 
 
-class GTMTrigger(gtm_manager.base.GTMBase):
-    """Open a specific GTM Trigger.
+class GTMTriggerView(object):
+    """Read-only view of a GTM Trigger API representation. The view does not hold an API service
+    and can be pickled, i.e. to analyse exported versions in a process pool. A pickled
+    :class:`GTMTrigger` is unpickled without its API service, which is built again on first use.
 
     Args:
-        trigger (dict): An API representation of the GTM Trigger. If provided, the resource will be
-            not be loaded from the API. :code:`trigger` or :code:`path` argument must be set.
-        path (str): The API path to the resource, i.e.
-            "accounts/1234/containers/1234/workspaces/1234/trigger/123". If provided instead of
-            :code:`trigger`, the representation will be loaded from the API. :code:`path` or
-            :code:`trigger` argument must be set.
-        parent (str): Required, when the instance is initialized with a :code:`trigger` argument to
-            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
-        **kwargs: Additional keyword args to initialize the base class.
+        trigger (dict): An API representation of the GTM Trigger.
+        path (str): The API path to the resource. Defaults to the :code:`path` of the
+            representation.
+        parent (str): The parent path used to build the resource path, if :code:`path` is not set,
+            i.e. "accounts/1234/containers/1234/workspaces/1234"
     """
 
-    def __init__(self, trigger=None, path=None, parent=None, **kwargs):
-        super().__init__(**kwargs)
-
-        self.triggers_service = (
-            self.service.accounts().containers().workspaces().triggers()
-        )  # pylint: disable=E1101
+    __slots__ = ("_raw_body", "_path", "_parameter")
 
-        if trigger:
-            pass
-        elif path:
-            trigger = self._get_trigger(path)
-        else:
-            raise ValueError("Please pass either a container obj or container path.")
-
-        self._maxTimerLengthSeconds = trigger.get("maxTimerLengthSeconds")
-        self._totalTimeMinMilliseconds = trigger.get("totalTimeMinMilliseconds")
-        self._uniqueTriggerId = trigger.get("uniqueTriggerId")
-        self._verticalScrollPercentageList = trigger.get("verticalScrollPercentageList")
-        self._horizontalScrollPercentageList = trigger.get(
-            "horizontalScrollPercentageList"
-        )
-        self._containerId = trigger.get("containerId")
-        self._waitForTagsTimeout = trigger.get("waitForTagsTimeout")
-        self._accountId = trigger.get("accountId")
-        self._waitForTags = trigger.get("waitForTags")
-        self._intervalSeconds = trigger.get("intervalSeconds")
-        self._eventName = trigger.get("eventName")
-        self._visibilitySelector = trigger.get("visibilitySelector")
-        self._workspaceId = trigger.get("workspaceId")
-        self._customEventFilter = trigger.get("customEventFilter")
-        self._parameter = trigger.get("parameter") or []
-        self._parentFolderId = trigger.get("parentFolderId")
-        self._continuousTimeMinMilliseconds = trigger.get(
-            "continuousTimeMinMilliseconds"
+    def __init__(self, trigger, path=None, parent=None):
+        self._raw_body = trigger
+        self._path = GTMPath(
+            path
+            or trigger.get("path")
+            or "{}/triggers/{}".format(parent, trigger.get("triggerId"))
         )
-        self._selector = trigger.get("selector")
-        self._triggerId = trigger.get("triggerId")
-        self._tagManagerUrl = trigger.get("tagManagerUrl")
-        self._fingerprint = trigger.get("fingerprint")
-        self._visiblePercentageMax = trigger.get("visiblePercentageMax")
-        self._name = trigger.get("name")
-        self._visiblePercentageMin = trigger.get("visiblePercentageMin")
-        self._type = trigger.get("type")
-        self._notes = trigger.get("notes")
-        self._interval = trigger.get("interval")
-        self._filter = trigger.get("filter")
-        self._autoEventFilter = trigger.get("autoEventFilter")
-        self._limit = trigger.get("limit")
-        self._checkValidation = trigger.get("checkValidation")
-
-        self._path = path or "{}/triggers/{}".format(parent, self._triggerId)
-
-        self._parameter = [
-            gtm_manager.parameter.GTMParameter(x) for x in self._parameter
-        ]
+        self._parameter = None
+
+    def __reduce__(self):
+        return (GTMTriggerView, (self._raw_body, self._path))
 
     @property
     def maxTimerLengthSeconds(self):
         """obj: Represents a Google Tag Manager Parameter. - Max time to fire Timer Events (in
         seconds). Only valid for AMP Timer trigger.
         """
-        return self._maxTimerLengthSeconds
+        return self._raw_body.get("maxTimerLengthSeconds")
 
     @property
     def totalTimeMinMilliseconds(self):
         """obj:  Represents a Google Tag Manager Parameter. - A visibility trigger minimum total
         visible time (in milliseconds). Only valid for AMP Visibility trigger.
         """
-        return self._totalTimeMinMilliseconds
+        return self._raw_body.get("totalTimeMinMilliseconds")
 
     @property
     def uniqueTriggerId(self):
@@ -97,7 +57,7 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         value is populated during output generation since the tags implied by triggers don"t exist
         until then. Only valid for Form Submit, Link Click and Timer triggers.
         """
-        return self._uniqueTriggerId
+        return self._raw_body.get("uniqueTriggerId")
 
     @property
     def verticalScrollPercentageList(self):
@@ -105,7 +65,7 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         scroll triggers. The trigger will fire when each percentage is reached when the view is
         scrolled vertically. Only valid for AMP scroll triggers.
         """
-        return self._verticalScrollPercentageList
+        return self._raw_body.get("verticalScrollPercentageList")
 
     @property
     def horizontalScrollPercentageList(self):
@@ -113,13 +73,13 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         scroll triggers. The trigger will fire when each percentage is reached when the view is
         scrolled horizontally. Only valid for AMP scroll triggers.
         """
-        return self._horizontalScrollPercentageList
+        return self._raw_body.get("horizontalScrollPercentageList")
 
     @property
     def containerId(self):
         """str: GTM Container ID.
         """
-        return self._containerId
+        return self._raw_body.get("containerId")
 
     @property
     def waitForTagsTimeout(self):
@@ -127,13 +87,13 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         tags to fire when "waits_for_tags" above evaluates to true. Only valid for Form Submission
         and Link Click triggers.
         """
-        return self._waitForTagsTimeout
+        return self._raw_body.get("waitForTagsTimeout")
 
     @property
     def accountId(self):
         """str: GTM Account ID.
         """
-        return self._accountId
+        return self._raw_body.get("accountId")
 
     @property
     def waitForTags(self):
@@ -142,96 +102,101 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         action and later simulating the default action). Only valid for Form Submission and Link
         Click triggers.
         """
-        return self._waitForTags
+        return self._raw_body.get("waitForTags")
 
     @property
     def intervalSeconds(self):
         """obj: Represents a Google Tag Manager Parameter. - Time between Timer Events to fire (in
         seconds). Only valid for AMP Timer trigger.
         """
-        return self._intervalSeconds
+        return self._raw_body.get("intervalSeconds")
 
     @property
     def eventName(self):
         """obj: Represents a Google Tag Manager Parameter. - Name of the GTM event that is fired.
         Only valid for Timer triggers.
         """
-        return self._eventName
+        return self._raw_body.get("eventName")
 
     @property
     def visibilitySelector(self):
         """obj: Represents a Google Tag Manager Parameter. - A visibility trigger CSS selector (i.e.
         "-id"). Only valid for AMP Visibility trigger.
         """
-        return self._visibilitySelector
+        return self._raw_body.get("visibilitySelector")
 
     @property
     def workspaceId(self):
         """str: GTM Workspace ID.
         """
-        return self._workspaceId
+        return self._raw_body.get("workspaceId")
 
     @property
     def customEventFilter(self):
         """list: Used in the case of custom event, which is fired iff all Conditions are true.
         """
-        return self._customEventFilter
+        return self._raw_body.get("customEventFilter")
 
     @property
     def parameter(self):
         """list: Additional parameters.
         """
+        if self._parameter is None:
+            self._parameter = [
+                gtm_manager.parameter.GTMParameter(x)
+                for x in self._raw_body.get("parameter") or []
+            ]
         return self._parameter
 
     @property
     def parentFolderId(self):
         """str: Parent folder id.
         """
-        return self._parentFolderId
+        return self._raw_body.get("parentFolderId")
 
     @property
     def continuousTimeMinMilliseconds(self):
         """obj: Represents a Google Tag Manager Parameter. - A visibility trigger minimum continuous
         visible time (in milliseconds). Only valid for AMP Visibility trigger.
         """
-        return self._continuousTimeMinMilliseconds
+        return self._raw_body.get("continuousTimeMinMilliseconds")
 
     @property
     def selector(self):
         """obj: Represents a Google Tag Manager Parameter. - A click trigger CSS selector (i.e. "a",
         "button" etc.). Only valid for AMP Click trigger.
         """
-        return self._selector
+        return self._raw_body.get("selector")
 
     @property
     def triggerId(self):
         """str: The Trigger ID uniquely identifies the GTM Trigger.
         """
-        return self._triggerId
+        return self._raw_body.get("triggerId")
 
     @property
     def tagManagerUrl(self):
         """str: Auto generated link to the tag manager UI
         """
-        return self._tagManagerUrl
+        return self._raw_body.get("tagManagerUrl")
 
     @property
     def fingerprint(self):
         """str: The fingerprint of the GTM Trigger as computed at storage time. This value is
         recomputed whenever the trigger is modified.
         """
-        return self._fingerprint
+        return self._raw_body.get("fingerprint")
 
     @property
     def visiblePercentageMax(self):
         """obj: Represents a Google Tag Manager Parameter. - A visibility trigger maximum percent
         visibility. Only valid for AMP Visibility trigger.
         """
-        return self._visiblePercentageMax
+        return self._raw_body.get("visiblePercentageMax")
 
     @property
     def path(self):
-        """str: GTM Trigger"s API relative path.
+        """:class:`gtm_manager.path.GTMPath`: GTM Trigger"s API relative path.
         """
         return self._path
 
@@ -239,45 +204,45 @@ class GTMTrigger(gtm_manager.base.GTMBase):
     def name(self):
         """str: Trigger display name.
         """
-        return self._name
+        return self._raw_body.get("name")
 
     @property
     def visiblePercentageMin(self):
         """obj: Represents a Google Tag Manager Parameter. - A visibility trigger minimum percent
         visibility. Only valid for AMP Visibility trigger.
         """
-        return self._visiblePercentageMin
+        return self._raw_body.get("visiblePercentageMin")
 
     @property
     def type(self):
         """str: Defines the data layer event that causes this trigger.
         """
-        return self._type
+        return self._raw_body.get("type")
 
     @property
     def notes(self):
         """str: User notes on how to apply this trigger in the container.
         """
-        return self._notes
+        return self._raw_body.get("notes")
 
     @property
     def interval(self):
         """obj: Represents a Google Tag Manager Parameter. - Time between triggering recurring Timer
         Events (in milliseconds). Only valid for Timer triggers.
         """
-        return self._interval
+        return self._raw_body.get("interval")
 
     @property
     def filter(self):
         """list: The trigger will only fire iff all Conditions are true.
         """
-        return self._filter
+        return self._raw_body.get("filter")
 
     @property
     def autoEventFilter(self):
         """list: Used in the case of auto event tracking.
         """
-        return self._autoEventFilter
+        return self._raw_body.get("autoEventFilter")
 
     @property
     def limit(self):
@@ -285,7 +250,7 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         Timer Trigger will fire. If no limit is set, we will continue to fire GTM events until the
         user leaves the page. Only valid for Timer triggers.
         """
-        return self._limit
+        return self._raw_body.get("limit")
 
     @property
     def checkValidation(self):
@@ -293,12 +258,67 @@ class GTMTrigger(gtm_manager.base.GTMBase):
          if the form submit or link click event is not cancelled by some other event handler (e.g.
          because of validation). Only valid for Form Submission and Link Click triggers.
         """
-        return self._checkValidation
+        return self._raw_body.get("checkValidation")
+
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
+
+
+class GTMTrigger(GTMTriggerView, gtm_manager.base.GTMBase):
+    """Open a specific GTM Trigger.
+
+    Args:
+        trigger (dict): An API representation of the GTM Trigger. If provided, the resource will be
+            not be loaded from the API. :code:`trigger` or :code:`path` argument must be set.
+        path (str): The API path to the resource, i.e.
+            "accounts/1234/containers/1234/workspaces/1234/trigger/123". If provided instead of
+            :code:`trigger`, the representation will be loaded from the API. :code:`path` or
+            :code:`trigger` argument must be set.
+        parent (str): Required, when the instance is initialized with a :code:`trigger` argument to
+            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
+        **kwargs: Additional keyword args to initialize the base class.
+    """
+
+    __slots__ = ("_service", "_triggers_service")
+
+    def __init__(self, trigger=None, path=None, parent=None, **kwargs):
+        gtm_manager.base.GTMBase.__init__(self, **kwargs)
+
+        self._triggers_service = None
+
+        if trigger:
+            pass
+        elif path:
+            trigger = self._get_trigger(path)
+        else:
+            raise ValueError("Please pass either a container obj or container path.")
+
+        super().__init__(trigger, path=path, parent=parent)
+
+    def __reduce__(self):
+        return (
+            gtm_manager.base.restore,
+            (GTMTrigger, GTMTriggerView(self._raw_body, self._path)),
+        )
+
+    @property
+    def triggers_service(self):
+        """obj: The Tag Manager API resource for triggers, created on first use.
+        """
+        if self._triggers_service is None:
+            self._triggers_service = (
+                self.service.accounts().containers().workspaces().triggers()
+            )  # pylint: disable=E1101
+        return self._triggers_service
 
     def update(self, refresh=False, parameter=None, **kwargs):
-        """Update the current trigger. The GTM API does not support a partial update. Therfore, this
-        method will send all fields expliztily set in the method arguments and those cached in the 
-        instance properties.
+        """Update the current trigger. The GTM API does not support a partial update. Therefore, this
+        method sends the trigger's API representation as cached in :attr:`raw_body`, patched with the
+        fields explicitly set in the method arguments. Fields not modelled by this class are sent
+        back unchanged.
 
         GTMParameters passed in a list as the :code:`parameter` argument, will be merged recursivly
         with the exsisting parameters based on their parameter key.
@@ -307,66 +327,53 @@ class GTMTrigger(gtm_manager.base.GTMBase):
         keyword arguments on the method call. 
 
         Args:
-            refresh (bool): Force a refresh of the entire GTMTrigger instance to prevent implicitly
-                sending stale property data.
+            refresh (bool): The update is sent with the cached fingerprint. If the API rejects it
+                as stale, reload the trigger, re-apply the update and send it again. Otherwise, the
+                API error is raised.
             parameter (list): :class:`gtm_manager.parameter.GTMParameter` list to be merged
                 recursivly with the exsisting parameters based on their parameter key.
             **kwargs: Additional resource properties to update with this call.
 
+        Returns:
+            :code:`True` if the trigger was written, :code:`False` if the API request was skipped
+            because the update body did not differ from the cached state.
+
         Raises:
             ValueError
+            :class:`googleapiclient.errors.HttpError`: If the update failed, i.e. because the
+                cached fingerprint is stale and :code:`refresh` is not set.
+            :class:`gtm_manager.exceptions.ValidationError`: If the update body does not match the
+                discovery document.
         """
-        if refresh:
-            self.__init__(path=self._path, service=self.service)
-
-        default_asset = {
-            "maxTimerLengthSeconds": self._maxTimerLengthSeconds,
-            "totalTimeMinMilliseconds": self._totalTimeMinMilliseconds,
-            "uniqueTriggerId": self._uniqueTriggerId,
-            "verticalScrollPercentageList": self._verticalScrollPercentageList,
-            "horizontalScrollPercentageList": self._horizontalScrollPercentageList,
-            "containerId": self._containerId,
-            "waitForTagsTimeout": self._waitForTagsTimeout,
-            "accountId": self._accountId,
-            "waitForTags": self._waitForTags,
-            "intervalSeconds": self._intervalSeconds,
-            "eventName": self._eventName,
-            "visibilitySelector": self._visibilitySelector,
-            "workspaceId": self._workspaceId,
-            "customEventFilter": self._customEventFilter,
-            "parentFolderId": self._parentFolderId,
-            "continuousTimeMinMilliseconds": self._continuousTimeMinMilliseconds,
-            "selector": self._selector,
-            "triggerId": self._triggerId,
-            "tagManagerUrl": self._tagManagerUrl,
-            "fingerprint": self._fingerprint,
-            "visiblePercentageMax": self._visiblePercentageMax,
-            "path": self._path,
-            "name": self._name,
-            "visiblePercentageMin": self._visiblePercentageMin,
-            "type": self._type,
-            "notes": self._notes,
-            "interval": self._interval,
-            "filter": self._filter,
-            "autoEventFilter": self._autoEventFilter,
-            "limit": self._limit,
-            "checkValidation": self._checkValidation,
-        }
-        update_asset = {**default_asset, **kwargs}
+        update_asset = {**self._raw_body, **kwargs}
 
         if parameter:
-            parameter_dict = {**param_dict(self._parameter), **param_dict(parameter)}
-            parameter = list(parameter_dict.values())
+            parameter_dict = {**param_dict(self.parameter), **param_dict(parameter)}
+            update_parameter = list(parameter_dict.values())
         else:
-            parameter = self._parameter
+            update_parameter = self.parameter
 
-        update_asset["parameter"] = [x.to_obj() for x in parameter]
+        update_asset["parameter"] = [x.to_obj() for x in update_parameter]
 
         update_asset = {k: v for k, v in update_asset.items() if v is not None}
 
-        request = self.triggers_service.update(path=self.path, body=update_asset)
-        response = request.execute()
+        if canonical_hash(update_asset) == canonical_hash(self._raw_body):
+            return False
+
+        check_body(self.service, "Trigger", update_asset)
+        request = self.triggers_service.update(
+            path=self.path, body=update_asset, fingerprint=self.fingerprint
+        )
+        try:
+            response = request.execute()
+        except HttpError as error:
+            if not refresh or not is_fingerprint_conflict(error):
+                raise error
+            self.__init__(path=self._path, service=self.service)
+            return self.update(parameter=parameter, **kwargs)
+
         self.__init__(trigger=response, service=self.service)
+        return True
 
     def _get_trigger(self, path):
         """_get_trigger"""
@@ -1,4 +1,19 @@
 """utils.py"""
+import json
+import hashlib
+
+READ_ONLY_FIELDS = (
+    "accountId",
+    "containerId",
+    "workspaceId",
+    "tagId",
+    "triggerId",
+    "variableId",
+    "folderId",
+    "fingerprint",
+    "path",
+    "tagManagerUrl",
+)
 
 
 def param_dict(param_list):
@@ -7,3 +22,45 @@ def param_dict(param_list):
     for param in param_list:
         dct[param.key] = param
     return dct
+
+
+def strip_body(body):
+    """Remove read-only and empty fields from an asset body, so that bodies of the same asset in
+    different containers or states compare equal.
+    """
+    return {
+        k: v
+        for k, v in body.items()
+        if k not in READ_ONLY_FIELDS and v is not None and v != []
+    }
+
+
+def canonical_hash(body):
+    """Hash an asset body independent of its key order, read-only fields and empty values."""
+    canonical = json.dumps(strip_body(body), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+FINGERPRINT_CONFLICT_STATUS = (409, 412)
+FINGERPRINT_CONFLICT_REASONS = ("conflict",)
+
+
+def is_fingerprint_conflict(error):
+    """Whether an :class:`googleapiclient.errors.HttpError` was caused by a stale fingerprint.
+
+    Only the status and the reasons of the error response are checked. The error message contains
+    the request URI, which carries the fingerprint of every update.
+    """
+    if error.resp.status in FINGERPRINT_CONFLICT_STATUS:
+        return True
+
+    try:
+        content = json.loads(error.content.decode("utf-8"))
+    except (AttributeError, UnicodeDecodeError, ValueError):
+        return False
+    if not isinstance(content, dict):
+        return False
+    return any(
+        x.get("reason") in FINGERPRINT_CONFLICT_REASONS
+        for x in (content.get("error") or {}).get("errors") or []
+    )
@@ -1,5 +1,7 @@
 """utils_auth.py"""
 import json
+import threading
+import concurrent.futures
 
 from httplib2 import Http
 
@@ -21,8 +23,66 @@ from gtm_manager import (
 )
 
 
+COALESCED_METHODS = ("GET", "HEAD")
+
+
+class SingleFlight(object):
+    """Share one in-flight call and its result between concurrent callers with the same key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """Call func, unless a call with the same key is in flight. In that case wait for it and
+        return its result or raise its exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = concurrent.futures.Future()
+
+        if not leader:
+            return call.result()
+
+        try:
+            result = func()
+        except BaseException as error:
+            with self._lock:
+                del self._calls[key]
+            call.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._calls[key]
+        call.set_result(result)
+        return result
+
+
+IN_FLIGHT = SingleFlight()
+
+
 class LimittedHttp(Http):
-    """LimittedHttp"""
+    """LimittedHttp
+
+    Concurrent identical read requests, also from different instances, share one request to the
+    API and its response. Only the first of them counts against the rate limit. Writes are never
+    coalesced.
+    """
+
+    def request(self, uri, method="GET", *args, **kwargs):
+        """request"""
+        if method not in COALESCED_METHODS:
+            return self._limitted_request(uri, method, *args, **kwargs)
+
+        headers = kwargs.get("headers") or (args[1] if len(args) > 1 else None) or {}
+        authorization = {k.lower(): v for k, v in headers.items()}.get("authorization")
+
+        return IN_FLIGHT.do(
+            (method, uri, authorization),
+            lambda: self._limitted_request(uri, method, *args, **kwargs),
+        )
 
     @retry(
         stop_max_attempt_number=6,
@@ -38,8 +98,8 @@ class LimittedHttp(Http):
     )
     @sleep_and_retry
     @limits(calls=RATE_LIMIT_CALLS, period=RATE_LIMIT_PERIOD)
-    def request(self, *args, **kwargs):
-        """request"""
+    def _limitted_request(self, *args, **kwargs):
+        """_limitted_request"""
         try:
             return super().request(*args, **kwargs)
         except HttpError as error:
@@ -0,0 +1,205 @@
+"""validation.py"""
+import threading
+
+import gtm_manager
+from gtm_manager.exceptions import ValidationError
+
+# The discovery document does not mark required fields, these are required by the API on create
+REQUIRED_FIELDS = {
+    "Tag": ("name", "type"),
+    "Trigger": ("name", "type"),
+    "Variable": ("name", "type"),
+    "Condition": ("type",),
+    "Parameter": ("type",),
+    "Parameter.keyed": ("type", "key"),
+}
+
+# Parameters in these array fields must have a key, i.e. Tag.parameter or Parameter.map
+KEYED_PARAMETER_FIELDS = ("parameter", "map")
+
+_TYPES = {
+    "string": (str,),
+    "boolean": (bool,),
+    "integer": (int,),
+    "number": (int, float),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+def _type_check(name, types):
+    """Compile a type check."""
+
+    def check(value, location, errors):
+        if not isinstance(value, types) or (
+            isinstance(value, bool) and bool not in types
+        ):
+            errors.append(
+                "{}: expected {}, got {}".format(location, name, type(value).__name__)
+            )
+            return False
+        return True
+
+    return check
+
+
+class GTMValidator(object):
+    """Validate asset bodies against the schemas of a discovery document without sending them.
+
+    The validators are compiled once per schema. They check the types of all known fields, enum
+    values (case insensitive) and the fields the API requires on create. Unknown fields are not
+    reported, because the API may know more fields than the discovery document in use.
+
+    Args:
+        root_desc (dict): The discovery document, i.e. :code:`service._rootDesc`.
+    """
+
+    def __init__(self, root_desc):
+        self._schemas = root_desc.get("schemas") or {}
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def validate(self, schema, body):
+        """Validate a body.
+
+        Args:
+            schema (str): The schema name, i.e. "Tag", "Trigger" or "Variable".
+            body (dict): The asset body.
+
+        Returns:
+            A list of error messages, empty if the body is valid.
+        """
+        errors = []
+        self._validator(schema)(body, schema, errors)
+        return errors
+
+    def check(self, schema, body):
+        """Validate a body and raise on errors.
+
+        Args:
+            schema (str): The schema name, i.e. "Tag", "Trigger" or "Variable".
+            body (dict): The asset body.
+
+        Raises:
+            :class:`gtm_manager.exceptions.ValidationError`: If the body is invalid.
+        """
+        errors = self.validate(schema, body)
+        if errors:
+            raise ValidationError(schema, errors)
+
+    def _validator(self, name):
+        """Return the compiled validator of a schema, compiling it on first use."""
+        validator = self._compiled.get(name)
+        if validator is None:
+            with self._lock:
+                validator = self._compiled.get(name)
+                if validator is None:
+                    validator = self._compile_schema(name)
+        return validator
+
+    def _compile_schema(self, name):
+        """Compile a named schema, optionally suffixed with a variant, i.e. "Parameter.keyed".
+        The validator is registered before its properties are compiled, so that recursive schemas
+        (i.e. Parameter) resolve to themselves.
+        """
+        schema = self._schemas.get(name.split(".")[0])
+        if schema is None:
+            raise ValueError("Unknown schema: {}".format(name))
+
+        properties = {}
+        required = REQUIRED_FIELDS.get(name, ())
+        is_object = _type_check("object", (dict,))
+
+        def validate(value, location, errors):
+            if not is_object(value, location, errors):
+                return
+            for field in required:
+                if value.get(field) in (None, ""):
+                    errors.append("{}.{}: required".format(location, field))
+            for field, field_value in value.items():
+                check = properties.get(field)
+                if check is not None and field_value is not None:
+                    check(field_value, "{}.{}".format(location, field), errors)
+
+        self._compiled[name] = validate
+
+        for field, field_schema in (schema.get("properties") or {}).items():
+            items = field_schema.get("items") or {}
+            if field in KEYED_PARAMETER_FIELDS and items.get("$ref") == "Parameter":
+                field_schema = {"type": "array", "items": {"$ref": "Parameter.keyed"}}
+            properties[field] = self._compile(field_schema)
+
+        return validate
+
+    def _compile(self, schema):
+        """Compile an inline schema."""
+        if "$ref" in schema:
+            ref = schema["$ref"]
+            return lambda value, location, errors: self._validator(ref)(
+                value, location, errors
+            )
+
+        schema_type = schema.get("type")
+        if schema_type == "string" and schema.get("format") in ("int64", "uint64"):
+            type_check = _type_check("int64 string", (str, int))
+        else:
+            type_check = _type_check(schema_type, _TYPES.get(schema_type, (object,)))
+
+        if schema.get("enum"):
+            enum = frozenset(x.lower() for x in schema["enum"])
+            allowed = ", ".join(schema["enum"])
+
+            def check(value, location, errors):
+                if type_check(value, location, errors) and value.lower() not in enum:
+                    errors.append(
+                        "{}: {!r} is not one of {}".format(location, value, allowed)
+                    )
+
+            return check
+
+        if schema_type == "array" and schema.get("items"):
+            item_check = self._compile(schema["items"])
+
+            def check(value, location, errors):
+                if type_check(value, location, errors):
+                    for index, item in enumerate(value):
+                        item_check(item, "{}[{}]".format(location, index), errors)
+
+            return check
+
+        return type_check
+
+
+_VALIDATORS = {}
+
+
+def get_validator(service):
+    """Return the validator for the discovery document of a Tag Manager API service, compiled on
+    first use.
+
+    Args:
+        service (obj): The Tag Manager API service.
+
+    Returns:
+        A :class:`GTMValidator`.
+    """
+    root_desc = service._rootDesc  # pylint: disable=protected-access
+    key = (root_desc.get("id"), root_desc.get("revision"))
+    if key not in _VALIDATORS:
+        _VALIDATORS[key] = GTMValidator(root_desc)
+    return _VALIDATORS[key]
+
+
+def check_body(service, schema, body):
+    """Validate a body before it is sent, if :code:`gtm_manager.VALIDATE_BODIES` is set.
+
+    Args:
+        service (obj): The Tag Manager API service the body is sent with.
+        schema (str): The schema name, i.e. "Tag", "Trigger" or "Variable".
+        body (dict): The asset body.
+
+    Raises:
+        :class:`gtm_manager.exceptions.ValidationError`: If the body is invalid.
+    """
+    if gtm_manager.VALIDATE_BODIES:
+        get_validator(service).check(schema, body)
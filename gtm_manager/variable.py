@@ -1,97 +1,75 @@
 """variable.py"""
-import copy
+from googleapiclient.errors import HttpError
 
 import gtm_manager.base
 import gtm_manager.parameter
-from gtm_manager.utils import param_dict
+from gtm_manager.utils import param_dict, canonical_hash, is_fingerprint_conflict
+from gtm_manager.path import GTMPath
+from gtm_manager.validation import check_body
 
 
-class GTMVariable(gtm_manager.base.GTMBase):
-    """Open a specific GTM Variable.
+class GTMVariableView(object):
+    """Read-only view of a GTM Variable API representation. The view does not hold an API service
+    and can be pickled, i.e. to analyse exported versions in a process pool. A pickled
+    :class:`GTMVariable` is unpickled without its API service, which is built again on first use.
 
     Args:
-        trigger (dict): An API representation of the GTM trigger. If provided, the resource will be
-            not be loaded from the API. :code:`trigger` or :code:`path` argument must be set.
-        path (str): The API path to the resource, i.e.
-            "accounts/1234/containers/1234/workspaces/1234/trigger/123". If provided instead of
-            :code:`trigger`, the representation will be loaded from the API. :code:`path` or
-            :code:`trigger` argument must be set.
-        parent (str): Required, when the instance is initialized with a trigger argument to
-            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
-        **kwargs: Additional keyword args to initialize the base class.
+        variable (dict): An API representation of the GTM Variable.
+        path (str): The API path to the resource. Defaults to the :code:`path` of the
+            representation.
+        parent (str): The parent path used to build the resource path, if :code:`path` is not set,
+            i.e. "accounts/1234/containers/1234/workspaces/1234"
     """
 
-    def __init__(self, variable=None, path=None, parent=None, **kwargs):
-        super().__init__(**kwargs)
-
-        self.variables_service = (
-            self.service.accounts().containers().workspaces().variables()
-        )  # pylint: disable=E1101
+    __slots__ = ("_raw_body", "_path", "_parameter")
 
-        if variable:
-            pass
-        elif path:
-            variable = self._get_variable(path)
-        else:
-            raise ValueError("Please pass either a container obj or container path.")
+    def __init__(self, variable, path=None, parent=None):
+        self._raw_body = variable
+        self._path = GTMPath(
+            path
+            or variable.get("path")
+            or "{}/variables/{}".format(parent, variable.get("variableId"))
+        )
+        self._parameter = None
 
-        self._scheduleStartMs = variable.get("scheduleStartMs")
-        self._scheduleEndMs = variable.get("scheduleEndMs")
-        self._name = variable.get("name")
-        self._variableId = variable.get("variableId")
-        self._type = variable.get("type")
-        self._notes = variable.get("notes")
-        self._enablingTriggerId = variable.get("enablingTriggerId")
-        self._workspaceId = variable.get("workspaceId")
-        self._tagManagerUrl = variable.get("tagManagerUrl")
-        self._fingerprint = variable.get("fingerprint")
-        self._accountId = variable.get("accountId")
-        self._parameter = variable.get("parameter") or []
-        self._parentFolderId = variable.get("parentFolderId")
-        self._disablingTriggerId = variable.get("disablingTriggerId")
-        self._containerId = variable.get("containerId")
-
-        self._path = path or "{}/variables/{}".format(parent, self._variableId)
-
-        self._parameter = [
-            gtm_manager.parameter.GTMParameter(x) for x in self._parameter
-        ]
+    def __reduce__(self):
+        return (GTMVariableView, (self._raw_body, self._path))
 
     @property
     def scheduleStartMs(self):
         """str: The start timestamp in milliseconds to schedule a variable.
         """
-        return self._scheduleStartMs
+        return self._raw_body.get("scheduleStartMs")
 
     @property
     def scheduleEndMs(self):
         """str: The end timestamp in milliseconds to schedule a variable.
         """
-        return self._scheduleEndMs
+        return self._raw_body.get("scheduleEndMs")
 
     @property
     def name(self):
         """str: Variable display name.
         """
-        return self._name
+        return self._raw_body.get("name")
 
     @property
     def variableId(self):
         """str: The Variable ID uniquely identifies the GTM Variable.
         """
-        return self._variableId
+        return self._raw_body.get("variableId")
 
     @property
     def type(self):
         """str: GTM Variable Type.
         """
-        return self._type
+        return self._raw_body.get("type")
 
     @property
     def notes(self):
         """str: User notes on how to apply this variable in the container.
         """
-        return self._notes
+        return self._raw_body.get("notes")
 
     @property
     def enablingTriggerId(self):
@@ -100,30 +78,30 @@ class GTMVariable(gtm_manager.base.GTMBase):
         triggers is true while all the disabling triggers are false.
         Treated as an unordered set.
         """
-        return self._enablingTriggerId
+        return self._raw_body.get("enablingTriggerId")
 
     @property
     def workspaceId(self):
         """str: GTM Workspace ID.
         """
-        return self._workspaceId
+        return self._raw_body.get("workspaceId")
 
     @property
     def tagManagerUrl(self):
         """str: Auto generated link to the tag manager UI
         """
-        return self._tagManagerUrl
+        return self._raw_body.get("tagManagerUrl")
 
     @property
     def fingerprint(self):
         """str: The fingerprint of the GTM Variable as computed at storage
         time. This value is recomputed whenever the variable is modified.
         """
-        return self._fingerprint
+        return self._raw_body.get("fingerprint")
 
     @property
     def path(self):
-        """str: GTM Variable's API relative path.
+        """:class:`gtm_manager.path.GTMPath`: GTM Variable's API relative path.
         """
         return self._path
 
@@ -131,19 +109,24 @@ class GTMVariable(gtm_manager.base.GTMBase):
     def accountId(self):
         """str: GTM Account ID.
         """
-        return self._accountId
+        return self._raw_body.get("accountId")
 
     @property
     def parameter(self):
         """list: The variable's parameters.
         """
+        if self._parameter is None:
+            self._parameter = [
+                gtm_manager.parameter.GTMParameter(x)
+                for x in self._raw_body.get("parameter") or []
+            ]
         return self._parameter
 
     @property
     def parentFolderId(self):
         """str: Parent folder id.
         """
-        return self._parentFolderId
+        return self._raw_body.get("parentFolderId")
 
     @property
     def disablingTriggerId(self):
@@ -152,19 +135,84 @@ class GTMVariable(gtm_manager.base.GTMBase):
         trigger is true while all the disabling trigger are false. Treated as an
         unordered set.
         """
-        return self._disablingTriggerId
+        return self._raw_body.get("disablingTriggerId")
 
     @property
     def containerId(self):
         """str: GTM Container ID.
         """
-        return self._containerId
+        return self._raw_body.get("containerId")
+
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
 
     @property
     def parameter_dict(self):
-        """dict: GTM parameters acceable via their key value.
+        """dict: Independent GTM parameters acceable via their key value. Changing them does not
+        change the cached parameters, until they are passed to :meth:`update`.
+        """
+        return param_dict(
+            gtm_manager.parameter.GTMParameter(x)
+            for x in self._raw_body.get("parameter") or []
+        )
+
+    def constant_value(self):
+        """constant_value"""
+        if self.type == "c" and "value" in self.parameter_dict:
+            return self.parameter_dict["value"].value
+        else:
+            return None
+
+
+class GTMVariable(GTMVariableView, gtm_manager.base.GTMBase):
+    """Open a specific GTM Variable.
+
+    Args:
+        trigger (dict): An API representation of the GTM trigger. If provided, the resource will be
+            not be loaded from the API. :code:`trigger` or :code:`path` argument must be set.
+        path (str): The API path to the resource, i.e.
+            "accounts/1234/containers/1234/workspaces/1234/trigger/123". If provided instead of
+            :code:`trigger`, the representation will be loaded from the API. :code:`path` or
+            :code:`trigger` argument must be set.
+        parent (str): Required, when the instance is initialized with a trigger argument to
+            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
+        **kwargs: Additional keyword args to initialize the base class.
+    """
+
+    __slots__ = ("_service", "_variables_service")
+
+    def __init__(self, variable=None, path=None, parent=None, **kwargs):
+        gtm_manager.base.GTMBase.__init__(self, **kwargs)
+
+        self._variables_service = None
+
+        if variable:
+            pass
+        elif path:
+            variable = self._get_variable(path)
+        else:
+            raise ValueError("Please pass either a container obj or container path.")
+
+        super().__init__(variable, path=path, parent=parent)
+
+    def __reduce__(self):
+        return (
+            gtm_manager.base.restore,
+            (GTMVariable, GTMVariableView(self._raw_body, self._path)),
+        )
+
+    @property
+    def variables_service(self):
+        """obj: The Tag Manager API resource for variables, created on first use.
         """
-        return param_dict(copy.deepcopy(self._parameter))
+        if self._variables_service is None:
+            self._variables_service = (
+                self.service.accounts().containers().workspaces().variables()
+            )  # pylint: disable=E1101
+        return self._variables_service
 
     def _get_variable(self, path):
         """_get_variable"""
@@ -172,17 +220,11 @@ class GTMVariable(gtm_manager.base.GTMBase):
         response = request.execute()
         return response
 
-    def constant_value(self):
-        """constant_value"""
-        if self.type == "c":
-            return self.parameter[0]["value"]
-        else:
-            return None
-
     def update(self, refresh=False, parameter=None, **kwargs):
-        """Update the current variable. The GTM API does not support a partial update. Therfore,
-        this method will send all fields expliztily set in the method arguments and those cached in
-        the instance properties.
+        """Update the current variable. The GTM API does not support a partial update. Therefore, this
+        method sends the variable's API representation as cached in :attr:`raw_body`, patched with the
+        fields explicitly set in the method arguments. Fields not modelled by this class are sent
+        back unchanged.
 
         GTMParameters passed in a list as the :code:`parameter` argument, will be merged recursivly
         with the exsisting parameters based on their parameter key.
@@ -191,50 +233,53 @@ class GTMVariable(gtm_manager.base.GTMBase):
         keyword arguments on the method call.
 
         Args:
-            refresh (bool): Force a refresh of the entire GTMVariable instance to prevent implicitly
-                sending stale property data.
+            refresh (bool): The update is sent with the cached fingerprint. If the API rejects it
+                as stale, reload the variable, re-apply the update and send it again. Otherwise, the
+                API error is raised.
             parameter (list): :class:`gtm_manager.parameter.GTMParameter` list to be merged
                 recursivly with the exsisting parameters based on their parameter key.
             **kwargs: Additional resource properties to update with this call.
 
+        Returns:
+            :code:`True` if the variable was written, :code:`False` if the API request was skipped
+            because the update body did not differ from the cached state.
+
         Raises:
             ValueError
+            :class:`googleapiclient.errors.HttpError`: If the update failed, i.e. because the
+                cached fingerprint is stale and :code:`refresh` is not set.
+            :class:`gtm_manager.exceptions.ValidationError`: If the update body does not match the
+                discovery document.
         """
-        if refresh:
-            self.__init__(path=self._path, service=self.service)
-
-        default_asset = {
-            "scheduleStartMs": self._scheduleStartMs,
-            "scheduleEndMs": self._scheduleEndMs,
-            "name": self._name,
-            "variableId": self._variableId,
-            "type": self._type,
-            "notes": self._notes,
-            "enablingTriggerId": self._enablingTriggerId,
-            "workspaceId": self._workspaceId,
-            "tagManagerUrl": self._tagManagerUrl,
-            "fingerprint": self._fingerprint,
-            "path": self._path,
-            "accountId": self._accountId,
-            "parentFolderId": self._parentFolderId,
-            "disablingTriggerId": self._disablingTriggerId,
-            "containerId": self._containerId,
-        }
-        update_asset = {**default_asset, **kwargs}
+        update_asset = {**self._raw_body, **kwargs}
 
         if parameter:
-            parameter_dict = {**param_dict(self._parameter), **param_dict(parameter)}
-            parameter = list(parameter_dict.values())
+            parameter_dict = {**param_dict(self.parameter), **param_dict(parameter)}
+            update_parameter = list(parameter_dict.values())
         else:
-            parameter = self._parameter
+            update_parameter = self.parameter
 
-        update_asset["parameter"] = [x.to_obj() for x in parameter]
+        update_asset["parameter"] = [x.to_obj() for x in update_parameter]
 
         update_asset = {k: v for k, v in update_asset.items() if v is not None}
 
-        request = self.variables_service.update(path=self.path, body=update_asset)
-        response = request.execute()
+        if canonical_hash(update_asset) == canonical_hash(self._raw_body):
+            return False
+
+        check_body(self.service, "Variable", update_asset)
+        request = self.variables_service.update(
+            path=self.path, body=update_asset, fingerprint=self.fingerprint
+        )
+        try:
+            response = request.execute()
+        except HttpError as error:
+            if not refresh or not is_fingerprint_conflict(error):
+                raise error
+            self.__init__(path=self._path, service=self.service)
+            return self.update(parameter=parameter, **kwargs)
+
         self.__init__(variable=response, service=self.service)
+        return True
 
     def delete(self):
         """Delete the current variable.
@@ -1,187 +1,251 @@
 """version"""
 import gtm_manager
+import gtm_manager.base
 import gtm_manager.container
+import gtm_manager.folder
+import gtm_manager.tag
+import gtm_manager.trigger
+import gtm_manager.variable
+from gtm_manager.path import GTMPath
 
 
-class GTMVersion(gtm_manager.base.GTMBase):
-    """Open a specific GTM Version.
+class GTMVersionView(object):
+    """Read-only view of a GTM Version API representation. The view does not hold an API service
+    and can be pickled, i.e. to analyse exported versions in a process pool. Its entities are
+    :class:`gtm_manager.tag.GTMTagView`, :class:`gtm_manager.trigger.GTMTriggerView`,
+    :class:`gtm_manager.variable.GTMVariableView` and :class:`gtm_manager.folder.GTMFolderView`
+    instances. A pickled :class:`GTMVersion` is unpickled without its API service, which is built
+    again on first use.
 
     Args:
-        version (dict): An API representation of the GTM Forlder. If provided, the resource will be
-            not be loaded from the API. :code:`version` or :code:`path` argument must be set.
-        path (str): The API path to the resource, i.e.
-            "accounts/1234/containers/1234/version/123". If provided instead of
-            :code:`version`, the representation will be loaded from the API. :code:`path` or
-            :code:`version` argument must be set.
-        parent (str): Required, when the instance is initialized with a :code:`version` argument to
-            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
-        **kwargs: Additional keyword args to initialize the base class.
+        version (dict): An API representation of the GTM Version.
+        workspaceId (str): The id of the workspace the version was taken from, used to build the
+            entity paths.
     """
 
-    def __init__(self, version=None, path=None, workspaceId=None, **kwargs):
-        super().__init__(**kwargs)
-
-        self.versions_service = (
-            self.service.accounts().containers().versions
-        )  # pylint: disable=E1101
+    __slots__ = ("raw_body", "_workspaceId", "_tag", "_trigger", "_variable", "_folder")
 
-        if version:
-            pass
-        elif path:
-            version = self._get_version(path)
-        else:
-            raise ValueError("Please pass either a version obj or version path.")
+    _views = {
+        "tag": gtm_manager.tag.GTMTagView,
+        "trigger": gtm_manager.trigger.GTMTriggerView,
+        "variable": gtm_manager.variable.GTMVariableView,
+        "folder": gtm_manager.folder.GTMFolderView,
+    }
 
-        self._container = gtm_manager.container.GTMContainer(
-            container=version.get("container"), service=self.service
-        )
-        self._containerId = version.get("containerId")
-        self._zone = version.get("zone")
-        self._deleted = version.get("deleted")
-        self._trigger = version.get("trigger") or []
-        self._description = version.get("description")
-        self._builtInVariable = version.get("builtInVariable")
-        self._name = version.get("name")
-        self._tag = version.get("tag") or []
-        self._tagManagerUrl = version.get("tagManagerUrl")
-        self._containerVersionId = version.get("containerVersionId")
+    def __init__(self, version, workspaceId=None):
         self._workspaceId = workspaceId
-        self._fingerprint = version.get("fingerprint")
-        self._variable = version.get("variable") or []
-        self._path = version.get("path")
-        self._folder = version.get("folder") or []
-        self._accountId = version.get("accountId")
+        self._tag = None
+        self._trigger = None
+        self._variable = None
+        self._folder = None
 
-        workspace_path = (
-            "accounts/{}/containers/{}/workspaces/{}".format(
-                self._accountId, self._containerId, self._workspaceId
-            )
-            if workspaceId
-            else None
-        )
+        self.raw_body = version
 
-        self._tag = [
-            gtm_manager.tag.GTMTag(tag=x, parent=workspace_path, service=self.service)
-            for x in self._tag
-        ]
-        self._trigger = [
-            gtm_manager.trigger.GTMTrigger(
-                trigger=x, parent=workspace_path, service=self.service
-            )
-            for x in self._trigger
-        ]
-        self._variable = [
-            gtm_manager.variable.GTMVariable(
-                variable=x, parent=workspace_path, service=self.service
-            )
-            for x in self._variable
-        ]
-        self._folder = [
-            gtm_manager.folder.GTMFolder(
-                folder=x, parent=workspace_path, service=self.service
-            )
-            for x in self._folder
-        ]
+    def __reduce__(self):
+        return (GTMVersionView, (self.raw_body, self._workspaceId))
 
-        self.raw_body = version
+    def _entity(self, entity_type, entity):
+        """Wrap an entity representation of this version."""
+        return self._views[entity_type](entity, parent=self.workspace_path)
 
     @property
-    def container(self):
-        """:class:`gtm_manager.container.GTMContainer`: The container that this version was taken
-        from.
+    def workspace_path(self):
+        """:class:`gtm_manager.path.GTMPath`: The API path of the workspace this version was taken
+        from or :code:`None`, if the version was not initialized with a :code:`workspaceId`.
         """
-        return self._container
+        if not self._workspaceId:
+            return None
+        return GTMPath(
+            "accounts/{}/containers/{}/workspaces/{}".format(
+                self.accountId, self.containerId, self._workspaceId
+            )
+        )
 
     @property
     def containerId(self):
         """str: GTM Container ID.
         """
-        return self._containerId
+        return self.raw_body.get("containerId")
 
     @property
     def zone(self):
         """list: The zones in the container that this version was taken from.
         """
-        return self._zone
+        return self.raw_body.get("zone")
 
     @property
     def deleted(self):
         """bool: A value of true indicates this container version has been deleted.
         """
-        return self._deleted
+        return self.raw_body.get("deleted")
 
     @property
     def trigger(self):
         """list: The triggers in the container that this version was taken from.
         """
+        if self._trigger is None:
+            self._trigger = [
+                self._entity("trigger", x)
+                for x in self.raw_body.get("trigger") or []
+            ]
         return self._trigger
 
     @property
     def description(self):
         """str: Container version description.
         """
-        return self._description
+        return self.raw_body.get("description")
 
     @property
     def builtInVariable(self):
         """list: The built-in variables in the container that this version was taken from.
         """
-        return self._builtInVariable
+        return self.raw_body.get("builtInVariable")
 
     @property
     def name(self):
         """str: Container version display name.
         """
-        return self._name
+        return self.raw_body.get("name")
 
     @property
     def tag(self):
         """list: The tags in the container that this version was taken from.
         """
+        if self._tag is None:
+            self._tag = [
+                self._entity("tag", x)
+                for x in self.raw_body.get("tag") or []
+            ]
         return self._tag
 
     @property
     def tagManagerUrl(self):
         """str: Auto generated link to the tag manager UI
         """
-        return self._tagManagerUrl
+        return self.raw_body.get("tagManagerUrl")
 
     @property
     def containerVersionId(self):
         """str: The Container Version ID uniquely identifies the GTM Container Version.
         """
-        return self._containerVersionId
+        return self.raw_body.get("containerVersionId")
 
     @property
     def fingerprint(self):
         """str: The fingerprint of the GTM Container Version as computed at storage
         time. This value is recomputed whenever the container version is modified.
         """
-        return self._fingerprint
+        return self.raw_body.get("fingerprint")
 
     @property
     def variable(self):
         """list: The variables in the container that this version was taken from.
         """
+        if self._variable is None:
+            self._variable = [
+                self._entity("variable", x)
+                for x in self.raw_body.get("variable") or []
+            ]
         return self._variable
 
     @property
     def path(self):
-        """str: GTM ContainerVersions's API relative path.
+        """:class:`gtm_manager.path.GTMPath`: GTM ContainerVersions's API relative path.
         """
-        return self._path
+        path = self.raw_body.get("path")
+        return GTMPath(path) if path else None
 
     @property
     def folder(self):
         """list: The folders in the container that this version was taken from.
         """
+        if self._folder is None:
+            self._folder = [
+                self._entity("folder", x)
+                for x in self.raw_body.get("folder") or []
+            ]
         return self._folder
 
     @property
     def accountId(self):
         """str: GTM Account ID.
         """
-        return self._accountId
+        return self.raw_body.get("accountId")
+
+
+class GTMVersion(GTMVersionView, gtm_manager.base.GTMBase):
+    """Open a specific GTM Version.
+
+    Args:
+        version (dict): An API representation of the GTM Forlder. If provided, the resource will be
+            not be loaded from the API. :code:`version` or :code:`path` argument must be set.
+        path (str): The API path to the resource, i.e.
+            "accounts/1234/containers/1234/version/123". If provided instead of
+            :code:`version`, the representation will be loaded from the API. :code:`path` or
+            :code:`version` argument must be set.
+        parent (str): Required, when the instance is initialized with a :code:`version` argument to
+            explizitly set the parent path, i.e. "accounts/1234/containers/1234/workspaces/1234"
+        **kwargs: Additional keyword args to initialize the base class.
+    """
+
+    __slots__ = ("_service", "_versions_service", "_container")
+
+    _entities = {
+        "tag": gtm_manager.tag.GTMTag,
+        "trigger": gtm_manager.trigger.GTMTrigger,
+        "variable": gtm_manager.variable.GTMVariable,
+        "folder": gtm_manager.folder.GTMFolder,
+    }
+
+    def __init__(self, version=None, path=None, workspaceId=None, **kwargs):
+        gtm_manager.base.GTMBase.__init__(self, **kwargs)
+
+        self._versions_service = None
+
+        if version:
+            pass
+        elif path:
+            version = self._get_version(path)
+        else:
+            raise ValueError("Please pass either a version obj or version path.")
+
+        self._container = None
+
+        super().__init__(version, workspaceId=workspaceId)
+
+    def __reduce__(self):
+        return (
+            gtm_manager.base.restore,
+            (GTMVersion, GTMVersionView(self.raw_body, self._workspaceId)),
+        )
+
+    def _entity(self, entity_type, entity):
+        """Wrap an entity representation of this version."""
+        return self._entities[entity_type](
+            **{entity_type: entity}, parent=self.workspace_path, service=self.service
+        )
+
+    @property
+    def versions_service(self):
+        """obj: The Tag Manager API resource for versions, created on first use.
+        """
+        if self._versions_service is None:
+            self._versions_service = (
+                self.service.accounts().containers().versions
+            )  # pylint: disable=E1101
+        return self._versions_service
+
+    @property
+    def container(self):
+        """:class:`gtm_manager.container.GTMContainer`: The container that this version was taken
+        from.
+        """
+        if self._container is None:
+            self._container = gtm_manager.container.GTMContainer(
+                container=self.raw_body.get("container"), service=self.service
+            )
+        return self._container
 
     def _get_version(self, path):
         """_get_version"""
@@ -200,7 +264,9 @@ class GTMVersionHeader(object):
     """GTMVersionHeader"""
 
     def __init__(self, versionHeader):
-        self._path = versionHeader.get("path")
+        self._path = (
+            GTMPath(versionHeader["path"]) if versionHeader.get("path") else None
+        )
         self._accountId = versionHeader.get("accountId")
         self._containerId = versionHeader.get("containerId")
         self._containerVersionId = versionHeader.get("containerVersionId")
@@ -214,3 +280,75 @@ class GTMVersionHeader(object):
         self._numZones = versionHeader.get("numZones")
 
         self.raw_body = versionHeader
+
+    @property
+    def path(self):
+        """:class:`gtm_manager.path.GTMPath`: GTM ContainerVersion's API relative path.
+        """
+        return self._path
+
+    @property
+    def accountId(self):
+        """str: GTM Account ID.
+        """
+        return self._accountId
+
+    @property
+    def containerId(self):
+        """str: GTM Container ID.
+        """
+        return self._containerId
+
+    @property
+    def containerVersionId(self):
+        """str: The Container Version ID uniquely identifies the GTM Container Version.
+        """
+        return self._containerVersionId
+
+    @property
+    def name(self):
+        """str: Container version display name.
+        """
+        return self._name
+
+    @property
+    def deleted(self):
+        """bool: A value of true indicates this container version has been deleted.
+        """
+        return self._deleted
+
+    @property
+    def numTags(self):
+        """str: Number of tags in the container version.
+        """
+        return self._numTags
+
+    @property
+    def numTriggers(self):
+        """str: Number of triggers in the container version.
+        """
+        return self._numTriggers
+
+    @property
+    def numVariables(self):
+        """str: Number of variables in the container version.
+        """
+        return self._numVariables
+
+    @property
+    def numZones(self):
+        """str: Number of zones in the container version.
+        """
+        return self._numZones
+
+    @property
+    def numMacros(self):
+        """str: Number of macros in the container version, the legacy name of variables.
+        """
+        return self._numMacros
+
+    @property
+    def numRules(self):
+        """str: Number of rules in the container version, the legacy name of triggers.
+        """
+        return self._numRules
@@ -0,0 +1,334 @@
+"""watcher.py"""
+import time
+import logging
+
+import gtm_manager.version
+from gtm_manager import RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD
+from gtm_manager.utils import canonical_hash
+
+DIFFED_ENTITIES = (
+    ("tag", "tagId"),
+    ("trigger", "triggerId"),
+    ("variable", "variableId"),
+    ("folder", "folderId"),
+)
+
+
+def diff_versions(previous, current):
+    """Compare the tags, triggers, variables and folders of two versions by id.
+
+    Args:
+        previous (:class:`gtm_manager.version.GTMVersionView`): The earlier version.
+        current (:class:`gtm_manager.version.GTMVersionView`): The later version.
+
+    Returns:
+        A list of changes as dicts with the keys :code:`action` ("added", "deleted" or "updated"),
+        :code:`type`, :code:`id` and :code:`name`.
+    """
+    changes = []
+    for entity_type, id_field in DIFFED_ENTITIES:
+        before = {x.get(id_field): x for x in previous.raw_body.get(entity_type) or []}
+        after = {x.get(id_field): x for x in current.raw_body.get(entity_type) or []}
+
+        for entity_id, entity in after.items():
+            if entity_id not in before:
+                action = "added"
+            elif canonical_hash(entity) != canonical_hash(before[entity_id]):
+                action = "updated"
+            else:
+                continue
+            changes.append(
+                {
+                    "action": action,
+                    "type": entity_type,
+                    "id": entity_id,
+                    "name": entity.get("name"),
+                }
+            )
+        for entity_id, entity in before.items():
+            if entity_id not in after:
+                changes.append(
+                    {
+                        "action": "deleted",
+                        "type": entity_type,
+                        "id": entity_id,
+                        "name": entity.get("name"),
+                    }
+                )
+    return changes
+
+
+def workspace_changes(status):
+    """Convert a workspace status, see :meth:`gtm_manager.workspace.GTMWorkspace.get_status`,
+    into a list of changes like :func:`diff_versions`.
+    """
+    changes = []
+    for change in status.get("workspaceChange") or []:
+        for entity_type, entity in change.items():
+            if entity_type == "changeStatus" or not isinstance(entity, dict):
+                continue
+            changes.append(
+                {
+                    "action": change.get("changeStatus"),
+                    "type": entity_type,
+                    "id": entity.get("{}Id".format(entity_type)),
+                    "name": entity.get("name"),
+                }
+            )
+    return changes
+
+
+class GTMWatcher(object):
+    """Watch containers for new versions, publishes and workspace edits.
+
+    A poll of a container lists its version headers and its workspaces. The status of a workspace
+    is only requested if its :code:`fingerprint` changed, new versions are compared with the
+    previous version, which is loaded from the cache if possible. Publishing, rolling back or
+    re-publishing an existing version adds no version header. The live version, a full version
+    request, is therefore loaded at the slower :code:`live_interval` and compared with the last
+    seen live version. The first poll of a container records its state and emits no events.
+
+    Every container has its own polling interval: it is reset to :code:`min_interval` when a
+    change was found and doubled after every poll without changes, up to :code:`max_interval`.
+    If the polls of all containers would need more API calls than the budget allows, all
+    intervals are stretched evenly, so that the watcher stays within its share of the quota.
+
+    Args:
+        containers (list): The :class:`gtm_manager.container.GTMContainer` s to watch.
+        cache (dict): The version paths as keys and versions as values, see
+            :meth:`gtm_manager.container.GTMContainer.bisect`.
+        min_interval (float): The shortest polling interval in seconds.
+        max_interval (float): The longest polling interval in seconds.
+        live_interval (float): The interval in seconds the live version is polled at, as part of
+            the next due poll. :code:`None` disables publish events.
+        calls (int): The number of API calls the watcher may use per :code:`period`.
+        period (float): The quota period in seconds.
+        clock (callable): Returns the current time in seconds.
+    """
+
+    def __init__(
+        self,
+        containers,
+        cache=None,
+        min_interval=60,
+        max_interval=3600,
+        live_interval=3600,
+        calls=RATE_LIMIT_CALLS,
+        period=RATE_LIMIT_PERIOD,
+        clock=time.monotonic,
+    ):
+        self.cache = {} if cache is None else cache
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self.calls = calls
+        self.period = period
+        self.clock = clock
+        self._loads = 0
+
+        now = clock()
+        self._containers = {
+            x.path: {
+                "container": x,
+                "interval": min_interval,
+                "next_poll": now,
+                "calls": 2,
+                "versions": None,
+                "workspaces": None,
+                "live": None,
+                "next_live": now,
+            }
+            for x in containers
+        }
+
+    def _stretch(self):
+        """The factor all intervals are stretched by to stay within the call budget."""
+        demand = sum(
+            x["calls"] * self.period / x["interval"] for x in self._containers.values()
+        )
+        return max(1.0, demand / self.calls)
+
+    def next_poll(self):
+        """float: The time the next container is due."""
+        return min(
+            (x["next_poll"] for x in self._containers.values()), default=self.clock()
+        )
+
+    def poll_due(self):
+        """Poll all containers, that are due.
+
+        Returns:
+            A list of events, see :meth:`poll`.
+        """
+        events = []
+        for path, state in self._containers.items():
+            if state["next_poll"] > self.clock():
+                continue
+            try:
+                container_events = self.poll(path)
+            except Exception as error:  # pylint: disable=broad-except
+                logging.error(error)
+                container_events = []
+            events.extend(container_events)
+
+            state["interval"] = (
+                self.min_interval
+                if container_events
+                else min(state["interval"] * 2, self.max_interval)
+            )
+            state["next_poll"] = self.clock() + state["interval"] * self._stretch()
+        return events
+
+    def poll(self, path):
+        """Poll a container now.
+
+        Args:
+            path (str): The container path.
+
+        Returns:
+            A list of events as dicts with the keys :code:`type` ("version", "publish" or
+            "workspace"), :code:`container` (the container path), :code:`path` (the version or
+            workspace path), :code:`name` and :code:`changes` (see :func:`diff_versions` and
+            :func:`workspace_changes`).
+        """
+        state = self._containers[path]
+        container = state["container"]
+        first = state["versions"] is None
+        loads = self._loads
+        events = []
+
+        headers = {x.path: x for x in container.list_version_headers() if not x.deleted}
+        if not first:
+            new = sorted(
+                (x for x in headers.values() if x.path not in state["versions"]),
+                key=lambda x: int(x.containerVersionId),
+            )
+            previous = max(
+                (headers[x] for x in state["versions"] if x in headers),
+                key=lambda x: int(x.containerVersionId),
+                default=None,
+            )
+            for header in new:
+                changes = []
+                if previous is not None:
+                    changes = diff_versions(
+                        self._version(previous.path, container.service),
+                        self._version(header.path, container.service),
+                    )
+                events.append(
+                    {
+                        "type": "version",
+                        "container": path,
+                        "path": header.path,
+                        "name": header.name,
+                        "changes": changes,
+                    }
+                )
+                previous = header
+
+        workspaces = container.list_workspaces()
+        fingerprints = {x.path: x.fingerprint for x in workspaces}
+        status_calls = 0
+        if not first:
+            for workspace in workspaces:
+                if state["workspaces"].get(workspace.path) == workspace.fingerprint:
+                    continue
+                status_calls += 1
+                changes = workspace_changes(workspace.get_status())
+                if workspace.path not in state["workspaces"] and not changes:
+                    continue
+                events.append(
+                    {
+                        "type": "workspace",
+                        "container": path,
+                        "path": workspace.path,
+                        "name": workspace.name,
+                        "changes": changes,
+                    }
+                )
+
+        live = state["live"]
+        next_live = state["next_live"]
+        if self.live_interval is not None and next_live <= self.clock():
+            live, event = self._poll_live(path, first)
+            if event:
+                events.append(event)
+            next_live = self.clock() + self.live_interval
+
+        # the state is only updated once the whole poll succeeded, so that failed polls are
+        # repeated and no event is lost
+        state.update(
+            versions=set(headers),
+            workspaces=fingerprints,
+            live=live,
+            next_live=next_live,
+            # version headers, workspaces, workspace status and loaded versions
+            calls=2 + status_calls + self._loads - loads,
+        )
+        return events
+
+    def _poll_live(self, path, first):
+        """Load the live version of a container and compare it with the last seen live version.
+
+        Returns:
+            A tuple of the live version path, or :code:`None` if the container has no live
+            version, and a "publish" event or :code:`None`.
+        """
+        state = self._containers[path]
+        container = state["container"]
+
+        version = container.live_version()
+        self._loads += 1
+        live = version.path if version is not None else None
+        if live is not None:
+            version = gtm_manager.version.GTMVersionView(version.raw_body)
+            self.cache[live] = version
+        if first or live == state["live"] or live is None:
+            return live, None
+
+        changes = []
+        if state["live"] is not None:
+            changes = diff_versions(
+                self._version(state["live"], container.service), version
+            )
+        return (
+            live,
+            {
+                "type": "publish",
+                "container": path,
+                "path": live,
+                "name": version.name,
+                "changes": changes,
+            },
+        )
+
+    def _version(self, path, service):
+        """Load a version from the cache or the API. Versions are cached as views, which hold no
+        API service.
+        """
+        version = self.cache.get(path)
+        if version is None:
+            version = gtm_manager.version.GTMVersionView(
+                gtm_manager.version.GTMVersion(path=path, service=service).raw_body
+            )
+            self.cache[path] = version
+            self._loads += 1
+        return version
+
+    def run(self, callback, sleep=time.sleep, iterations=None):
+        """Poll the containers, whenever they are due.
+
+        Args:
+            callback (callable): Called with every event. Exceptions are logged.
+            sleep (callable): Called with the seconds to wait until the next container is due.
+            iterations (int): Stop after this many rounds of polls, defaults to run forever.
+        """
+        count = 0
+        while iterations is None or count < iterations:
+            count += 1
+            for event in self.poll_due():
+                try:
+                    callback(event)
+                except Exception as error:  # pylint: disable=broad-except
+                    logging.error(error)
+            sleep(max(0, self.next_poll() - self.clock()))
@@ -6,7 +6,10 @@ import gtm_manager.trigger
 import gtm_manager.variable
 import gtm_manager.folder
 import gtm_manager.built_in_variable
+from gtm_manager import ALL_PAGES_TRIGGER_ID
+from gtm_manager.validation import check_body
 from gtm_manager.exceptions import TagNotFound, TriggerNotFound, VariableNotFound
+from gtm_manager.path import GTMPath
 
 
 class GTMWorkspace(gtm_manager.base.GTMBase):
@@ -42,7 +45,7 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
         self._workspaceId = workspace.get("workspaceId")
         self._tagManagerUrl = workspace.get("tagManagerUrl")
         self._fingerprint = workspace.get("fingerprint")
-        self._path = workspace.get("path")
+        self._path = GTMPath(workspace["path"]) if workspace.get("path") else None
         self._accountId = workspace.get("accountId")
         self._containerId = workspace.get("containerId")
         self._tags = []
@@ -51,6 +54,7 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
         self._folders = []
         self._built_in_variables = []
         self._quick_preview = None
+        self._raw_body = workspace
 
     def __repr__(self):
         return "<GTM Workspace: {}>".format(self.name)
@@ -103,6 +107,12 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
         """
         return self._containerId
 
+    @property
+    def raw_body(self):
+        """obj: The raw asset body as returned from the API
+        """
+        return self._raw_body
+
     def quick_preview(self, refresh=True):
         """Get a quick_preview of the current workspace state from the API.
 
@@ -178,7 +188,10 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
         if refresh or not self._quick_preview:
             self._refresh_quick_preview()
 
-        trigger_map = {"2147479553": "All Pages", "All Pages": "2147479553"}
+        trigger_map = {
+            ALL_PAGES_TRIGGER_ID: "All Pages",
+            "All Pages": ALL_PAGES_TRIGGER_ID,
+        }
 
         if not self._quick_preview.trigger:
             return trigger_map
@@ -244,7 +257,12 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
 
         Returns:
             An instance of :class:`gtm_manager.tag.GTMTag`
+
+        Raises:
+            :class:`gtm_manager.exceptions.ValidationError`: If the body does not match the
+                discovery document.
         """
+        check_body(self.service, "Tag", asset_body)
         request = self.workspaces_service.tags().create(
             parent=self.path, body=asset_body
         )
@@ -262,7 +280,12 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
 
         Returns:
             An instance of :class:`gtm_manager.trigger.GTMTrigger`
+
+        Raises:
+            :class:`gtm_manager.exceptions.ValidationError`: If the body does not match the
+                discovery document.
         """
+        check_body(self.service, "Trigger", asset_body)
         request = self.workspaces_service.triggers().create(
             parent=self.path, body=asset_body
         )
@@ -280,7 +303,12 @@ class GTMWorkspace(gtm_manager.base.GTMBase):
 
         Returns:
             An instance of :class:`gtm_manager.variable.GTMVariable`
+
+        Raises:
+            :class:`gtm_manager.exceptions.ValidationError`: If the body does not match the
+                discovery document.
         """
+        check_body(self.service, "Variable", asset_body)
         request = self.workspaces_service.variables().create(
             parent=self.path, body=asset_body
         )
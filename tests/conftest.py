@@ -34,11 +34,12 @@ def data_file():
 @pytest.fixture
 def mock_service(data_file):
     def func(*args):
-        arg_files = [data_file(x) for x in list(args)]
+        # responses are either file names or (status, file name) tuples
+        args = [x if isinstance(x, tuple) else ("200", x) for x in args]
+        arg_files = [data_file(x) for _, x in args]
 
-        sequence = [
-            ({"status": "200"}, x)
-            for x in [data_file("tagmanager_v2_discovery.json"), *arg_files]
+        sequence = [({"status": "200"}, data_file("tagmanager_v2_discovery.json"))] + [
+            ({"status": status}, x) for (status, _), x in zip(args, arg_files)
         ]
 
         http = HttpMockSequence(sequence)
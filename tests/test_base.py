@@ -3,10 +3,14 @@ from unittest.mock import patch
 from gtm_manager.base import GTMBase
 
 
+class Resource(GTMBase):
+    pass
+
+
 @patch("gtm_manager.utils_auth.build_http")
 def test_base_service(build_http_mock, mock_service):
     service, _ = mock_service()
-    base = GTMBase(service=service)
+    base = Resource(service=service)
     assert base.service == service
 
     build_http_mock.assert_not_called()
@@ -18,7 +22,7 @@ def test_base_credentials_empty(build_mock, get_credentials_mock):
     get_credentials_mock.return_value = True
     build_mock.return_value = True
 
-    GTMBase(service=None, credentials=None)
+    Resource(service=None, credentials=None)
 
     assert get_credentials_mock.mock_calls
     assert build_mock.mock_calls
@@ -30,7 +34,7 @@ def test_base_credentials_true(build_mock, get_credentials_mock):
     get_credentials_mock.return_value = True
     build_mock.return_value = True
 
-    GTMBase(service=None, credentials=True)
+    Resource(service=None, credentials=True)
 
     get_credentials_mock.assert_not_called()
     assert build_mock.mock_calls
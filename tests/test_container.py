@@ -1,7 +1,7 @@
 # pylint: disable=missing-docstring
 from gtm_manager.container import GTMContainer
 from gtm_manager.workspace import GTMWorkspace
-from gtm_manager.version import GTMVersionHeader, GTMVersion
+from gtm_manager.version import GTMVersionHeader, GTMVersion, GTMVersionView
 
 
 def test_init_container(mock_service):
@@ -103,3 +103,41 @@ def test_list_version_headers_empty(mock_service):
     assert container_list == []
 
     container.list_version_headers(refresh=False)
+
+
+def test_bisect(mock_service):
+    service, responses = mock_service(
+        "container_get.json", "version_headers_bisect.json", "empty.json"
+    )
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+
+    cache = {
+        x["path"]: GTMVersionView({**x, "tag": [{}] * int(x["numTags"])})
+        for x in responses[1]["containerVersionHeader"]
+        if not x.get("deleted")
+    }
+    tested = []
+
+    def predicate(version):
+        tested.append(version.containerVersionId)
+        return len(version.tag) >= 7
+
+    assert container.bisect(predicate, cache=cache).containerVersionId == "7"
+    assert len(tested) <= 5
+    assert container.bisect(lambda x: False, cache=cache, refresh=False) is None
+    first = container.bisect(lambda x: True, cache=cache, refresh=False)
+    assert first.name == "Version 1"
+    assert container.bisect(lambda x: True, refresh=True) is None
+
+
+def test_bisect_load(mock_service):
+    service, responses = mock_service(
+        "container_get.json", "version_headers_list.json", "version_get.json"
+    )
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+    cache = {}
+
+    header = container.bisect(lambda x: x.name == responses[2]["name"], cache=cache)
+    assert header.path == responses[1]["containerVersionHeader"][0]["path"]
+    version = cache[header.path]
+    assert type(version) is GTMVersionView  # pylint: disable=unidiomatic-typecheck
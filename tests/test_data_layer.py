@@ -0,0 +1,26 @@
+# pylint: disable=missing-docstring
+from gtm_manager import data_layer
+
+
+def test_merge():
+    push = {"ecommerce": {"currency": "EUR"}}
+    model = data_layer.merge({"event": "gtm.js", "ecommerce": {"value": 1}}, push)
+
+    assert model == {"event": "gtm.js", "ecommerce": {"value": 1, "currency": "EUR"}}
+
+    data_layer.merge(model, {"event": "purchase", "ecommerce": {"value": 2}})
+    assert model["event"] == "purchase"
+    assert model["ecommerce"] == {"value": 2, "currency": "EUR"}
+    assert push == {"ecommerce": {"currency": "EUR"}}
+
+
+def test_get():
+    model = {
+        "gtm.element": "a",
+        "ecommerce": {"products": [{"id": "1"}, {"id": "2"}]},
+    }
+
+    assert data_layer.get(model, "gtm.element") == "a"
+    assert data_layer.get(model, "ecommerce.products.1.id") == "2"
+    assert data_layer.get(model, "ecommerce.products.2.id") is None
+    assert data_layer.get(model, "ecommerce.missing") is None
@@ -0,0 +1,101 @@
+# pylint: disable=missing-docstring
+import pytest
+
+from gtm_manager.version import GTMVersionView
+from gtm_manager.dedupe import (
+    GTMDedupe,
+    canonical_tag_hash,
+    shingles,
+    minhash,
+    jaccard,
+)
+
+
+def html_tag(tag_id, html, **kwargs):
+    return {
+        "tagId": tag_id,
+        "name": "Tag {}".format(tag_id),
+        "type": "html",
+        "parameter": [{"type": "template", "key": "html", "value": html}],
+        **kwargs,
+    }
+
+
+SNIPPET = (
+    "<script>(function(w,d){var s=d.createElement('script');s.async=true;"
+    "s.src='https://cdn.example.com/pixel.js?id=12345&env=prod&v=2';"
+    "d.head.appendChild(s);w.pixel=w.pixel||[];w.pixel.push(['init','12345']);"
+    "w.pixel.push(['track','PageView']);})(window,document);</script>"
+)
+
+
+def version(container_id, tags):
+    return GTMVersionView(
+        {
+            "path": "accounts/1/containers/{}/versions/1".format(container_id),
+            "tag": tags,
+        }
+    )
+
+
+def test_canonical_tag_hash():
+    tag = html_tag("1", SNIPPET, firingTriggerId=["1"], parentFolderId="2")
+    copy = html_tag("7", SNIPPET, firingTriggerId=["9"], fingerprint="123")
+    copy["path"] = "accounts/1/containers/2/workspaces/3/tags/7"
+
+    assert canonical_tag_hash(tag) == canonical_tag_hash(copy)
+    assert canonical_tag_hash(tag) != canonical_tag_hash(html_tag("1", SNIPPET + " "))
+
+
+def test_minhash_estimates_jaccard():
+    first = shingles(html_tag("1", SNIPPET))
+    second = shingles(html_tag("2", SNIPPET.replace("12345", "67890")))
+
+    signature_first = minhash(first, 256)
+    signature_second = minhash(second, 256)
+    estimate = sum(x == y for x, y in zip(signature_first, signature_second)) / 256
+
+    assert len(signature_first) == 256
+    assert estimate == pytest.approx(jaccard(first, second), abs=0.15)
+    assert minhash(first, 256) == signature_first
+    assert len(minhash(set(), 16)) == 16
+
+
+def test_dedupe():
+    dedupe = GTMDedupe(threshold=0.7)
+    dedupe.add_version(
+        version(
+            "1",
+            [
+                html_tag("1", SNIPPET),
+                html_tag("2", "<script>console.log('unrelated')</script>"),
+            ],
+        )
+    )
+    dedupe.add_version(
+        version(
+            "2",
+            [
+                html_tag("5", SNIPPET, firingTriggerId=["3"]),
+                html_tag("6", SNIPPET.replace("env=prod", "env=stage")),
+                {"tagId": "7", "name": "UA", "type": "ua", "parameter": []},
+            ],
+        )
+    )
+
+    exact = dedupe.exact_duplicates()
+    assert len(exact) == 1
+    assert [(x["parent"].split("/")[3], x["id"]) for x in exact[0]] == [
+        ("1", "1"),
+        ("2", "5"),
+    ]
+
+    near = dedupe.near_duplicates()
+    assert len(near) == 1
+    assert sorted(x["id"] for x in near[0]["tags"]) == ["1", "5", "6"]
+    assert 0.7 <= near[0]["similarity"] < 1
+
+
+def test_dedupe_bands():
+    with pytest.raises(ValueError):
+        GTMDedupe(num_perm=128, bands=30)
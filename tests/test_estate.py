@@ -0,0 +1,95 @@
+# pylint: disable=missing-docstring
+from gtm_manager.container import GTMContainer
+from gtm_manager.version import GTMVersionHeader
+from gtm_manager.estate import GTMEstateReport, header_counts, load_version_headers
+
+PATH = "accounts/1/containers/1"
+
+
+def header(version_id, tags, **kwargs):
+    return GTMVersionHeader(
+        {
+            "path": "{}/versions/{}".format(PATH, version_id),
+            "containerVersionId": str(version_id),
+            "numTags": str(tags),
+            **kwargs,
+        }
+    )
+
+
+HEADERS = {
+    PATH: [
+        header(10, 12, numTriggers="4", numVariables="20"),
+        header(2, 3, numRules="1", numMacros="5"),
+        GTMVersionHeader({"path": PATH + "/versions/5", "deleted": True}),
+    ],
+    "accounts/1/containers/2": [],
+    "accounts/1/containers/3": ValueError("failed"),
+}
+
+FIRST_SEEN = {
+    PATH + "/versions/2": "2020-02-10",
+    PATH + "/versions/10": "2020-02-14",
+}
+
+
+def test_header_counts():
+    assert header_counts(HEADERS[PATH][1]) == {
+        "containerVersionId": "2",
+        "tags": 3,
+        "triggers": 1,
+        "variables": 5,
+        "zones": 0,
+    }
+
+
+def test_report():
+    report = GTMEstateReport(HEADERS, FIRST_SEEN)
+
+    counts = report.entity_counts()
+    assert sorted(counts) == [PATH, "accounts/1/containers/2"]
+    assert counts[PATH] == {
+        "containerVersionId": "10",
+        "tags": 12,
+        "triggers": 4,
+        "variables": 20,
+        "zones": 0,
+        "versions": 2,
+        "deleted": 1,
+    }
+    assert counts["accounts/1/containers/2"]["versions"] == 0
+
+    curve = report.growth_curves()[PATH]
+    assert [(x["containerVersionId"], x["tags"], x["date"]) for x in curve] == [
+        ("2", 3, "2020-02-10"),
+        ("10", 12, "2020-02-14"),
+    ]
+
+    assert report.versions_per_week() == {"2020-W07": 2}
+    assert list(
+        GTMEstateReport(HEADERS, {**FIRST_SEEN, PATH + "/versions/2": "2019-12-31"})
+        .versions_per_week()
+        .items()
+    ) == [("2020-W01", 1), ("2020-W07", 1)]
+    assert GTMEstateReport(HEADERS).versions_per_week() == {}
+
+    assert report.summary() == {
+        "containers": 2,
+        "versions": 2,
+        "tags": 12,
+        "triggers": 4,
+        "variables": 20,
+        "zones": 0,
+    }
+
+
+def test_load_version_headers(mock_service):
+    service, _ = mock_service("container_get.json", "version_headers_list.json")
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+
+    results = load_version_headers([container])
+    assert [x.containerVersionId for x in results[container.path]] == ["1"]
+
+    service, _ = mock_service("container_get.json", ("500", "empty.json"))
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+    assert isinstance(load_version_headers([container])[container.path], Exception)
@@ -0,0 +1,112 @@
+# pylint: disable=missing-docstring
+import gc
+import gzip
+import json
+import weakref
+
+from gtm_manager.export import GTMExporter
+
+CONTAINER = [
+    "version_get.json",
+    "workspace_list.json",
+    "tags_list.json",
+    "triggers_list.json",
+    "variables_list.json",
+    "folders_list.json",
+    "built_in_variables_list.json",
+]
+
+
+def _exporter(service):
+    return GTMExporter(service_factory=lambda: service, max_workers=1)
+
+
+def _types(lines):
+    return [json.loads(x)["type"] for x in lines]
+
+
+def test_export(mock_service, tmpdir):
+    service, _ = mock_service(
+        "account_list.json", "containers_list.json", "empty.json", *CONTAINER * 2
+    )
+    output = str(tmpdir.join("export.ndjson.gz"))
+
+    results = _exporter(service).export(output)
+
+    assert sorted(results.values()) == [14, 14]
+
+    with gzip.open(output, "rt") as file:
+        types = _types(file)
+
+    assert types[:4] == ["account", "container", "container", "account"]
+    assert types.count("version") == 2
+    assert types.count("tag") == 4
+    assert types.count("builtInVariable") == 14
+
+
+def test_export_resume(mock_service, tmpdir):
+    output = str(tmpdir.join("export.ndjson"))
+    checkpoint = str(tmpdir.join("checkpoint.json"))
+
+    # the second container fails and is not recorded in the checkpoint
+    service, responses = mock_service(
+        "account_list.json",
+        "containers_list.json",
+        "empty.json",
+        *CONTAINER,
+        ("500", "empty.json"),
+    )
+    results = _exporter(service).export(output, checkpoint=checkpoint)
+
+    failed = [path for path, result in results.items() if isinstance(result, Exception)]
+    assert len(failed) == 1
+
+    with open(checkpoint) as file:
+        completed = json.load(file)["completed"]
+    assert failed[0] not in completed
+    assert len(completed) == 3
+
+    service, _ = mock_service(
+        "account_list.json", "containers_list.json", "empty.json", *CONTAINER
+    )
+    results = _exporter(service).export(output, checkpoint=checkpoint)
+
+    assert list(results) == failed
+
+    with open(output) as file:
+        types = _types(file)
+
+    # accounts and containers are not exported again
+    assert types.count("account") == len(responses[0]["account"])
+    assert types.count("container") == 2
+    assert types.count("version") == 2
+
+
+class Records(list):
+    pass
+
+
+def test_export_releases_records(mock_service, tmpdir):
+    service, _ = mock_service(
+        "account_list.json", "containers_list.json", "empty.json", *CONTAINER * 2
+    )
+    exporter = _exporter(service)
+    container_records = exporter._container_records  # pylint: disable=protected-access
+    loaded = []
+    alive = []
+
+    def records(path):
+        result = Records(container_records(path))
+        loaded.append(weakref.ref(result))
+        return result
+
+    def save_checkpoint(checkpoint, completed, path, file):
+        gc.collect()
+        alive.append(sum(x() is not None for x in loaded))
+
+    exporter._container_records = records  # pylint: disable=protected-access
+    exporter._save_checkpoint = save_checkpoint  # pylint: disable=protected-access
+    exporter.export(str(tmpdir.join("export.ndjson")))
+
+    # the records of the first container are released before the second is written
+    assert alive[-2:] == [1, 1]
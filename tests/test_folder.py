@@ -1,5 +1,9 @@
 # pylint: disable=missing-docstring
-from gtm_manager.folder import GTMFolder
+import json
+import pickle
+
+from gtm_manager.base import GTMBase
+from gtm_manager.folder import GTMFolder, GTMFolderView
 
 
 def test_init(mock_service):
@@ -31,8 +35,20 @@ def test_init(mock_service):
     assert folder.name == folder_get.get("name")
 
 
-def test_update():
-    pass
+def test_update(mock_service):
+    service, responses = mock_service("folders_get.json", "echo_request_body")
+    folder_get = responses[0]
+
+    folder = GTMFolder(
+        path="accounts/1234/containers/1234/workspace/1/folders/1", service=service
+    )
+
+    assert not folder.update(name=folder_get["name"])
+    assert folder.update(name="New Folder Name", notes="New Folder Notes")
+
+    assert folder.name == "New Folder Name"
+    assert folder.notes == "New Folder Notes"
+    assert folder.raw_body["folderId"] == folder_get["folderId"]
 
 
 def test_delete(mock_service):
@@ -43,3 +59,24 @@ def test_delete(mock_service):
     )
 
     folder.delete()
+
+
+def test_view(mock_service, data_file):
+    folder_get = json.loads(data_file("folders_get.json"))
+    view = GTMFolderView(folder_get)
+
+    assert view.name == folder_get["name"]
+    assert view.path == folder_get["path"]
+    assert view.raw_body is folder_get
+    assert not hasattr(view, "service")
+    assert not hasattr(view, "__dict__")
+
+    view = pickle.loads(pickle.dumps(view))
+    assert view.raw_body == folder_get
+
+    service, _ = mock_service()
+    folder = GTMFolder(folder=folder_get, service=service)
+    copy = pickle.loads(pickle.dumps(folder))
+    assert type(copy) is GTMFolder  # pylint: disable=unidiomatic-typecheck
+    assert isinstance(copy, GTMBase)
+    assert copy.path == folder.path
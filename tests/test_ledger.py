@@ -0,0 +1,85 @@
+# pylint: disable=missing-docstring
+import json
+import datetime
+
+from gtm_manager.container import GTMContainer
+from gtm_manager.ledger import GTMLedger, GTMCrawler
+from gtm_manager.manager import GTMManager
+from gtm_manager.version import GTMVersionHeader
+
+CRAWL = [
+    "account_list.json",
+    "empty.json",
+    "containers_list.json",
+    "version_headers_list.json",
+    "empty.json",
+]
+
+
+def test_ledger(mock_service, data_file, tmpdir):
+    service, _ = mock_service()
+    container = GTMContainer(
+        container=json.loads(data_file("containers_list.json"))["container"][0],
+        service=service,
+    )
+    headers = [
+        GTMVersionHeader(x)
+        for x in json.loads(data_file("version_headers_list.json"))[
+            "containerVersionHeader"
+        ]
+    ]
+    path = str(tmpdir.join("ledger.json"))
+
+    ledger = GTMLedger(path)
+    assert ledger.changed(container, headers)
+
+    ledger.record(container, headers)
+    ledger.save()
+
+    ledger = GTMLedger(path)
+    assert not ledger.changed(container, headers)
+    assert ledger.changed(container, [])
+
+
+def test_first_seen(data_file, tmpdir):
+    headers = [
+        GTMVersionHeader(x)
+        for x in json.loads(data_file("version_headers_list.json"))[
+            "containerVersionHeader"
+        ]
+    ]
+    path = str(tmpdir.join("ledger.json"))
+
+    ledger = GTMLedger(path)
+    assert ledger.first_seen(headers, today=datetime.date(2020, 2, 10)) == {
+        headers[0].path: "2020-02-10"
+    }
+    ledger.save()
+
+    ledger = GTMLedger(path)
+    assert ledger.first_seen(headers, today=datetime.date(2020, 3, 1)) == {
+        headers[0].path: "2020-02-10"
+    }
+
+
+def test_crawl(mock_service, tmpdir):
+    path = str(tmpdir.join("ledger.json"))
+    visited = []
+
+    def visit(container):
+        visited.append(container.path)
+        if len(visited) == 2:
+            raise ValueError("failed")
+        return container.name
+
+    service, _ = mock_service(*CRAWL)
+    results = GTMCrawler(path, manager=GTMManager(service=service)).crawl(visit)
+
+    assert results[visited[0]] == "Container 1"
+    assert isinstance(results[visited[1]], ValueError)
+
+    # only the failed container is visited again
+    service, _ = mock_service(*CRAWL)
+    results = GTMCrawler(path, manager=GTMManager(service=service)).crawl(visit)
+
+    assert list(results) == [visited[1]]
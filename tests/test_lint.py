@@ -0,0 +1,167 @@
+# pylint: disable=missing-docstring,protected-access
+import os
+import pickle
+
+import pytest
+
+from gtm_manager.manager import GTMManager
+from gtm_manager.mirror import GTMMirror
+from gtm_manager.version import GTMVersionView
+from gtm_manager import lint
+from gtm_manager.lint import GTMLinter, lint_rule, latest_snapshots, RULES
+from gtm_manager.lint import _lint_snapshot
+
+NOW = 1600000000000
+
+VERSION = {
+    "path": "accounts/1/containers/1/versions/1",
+    "tag": [
+        {
+            "tagId": "1",
+            "name": "Pageview",
+            "type": "ua",
+            "parameter": [{"type": "template", "key": "trackingId", "value": "{{ID}}"}],
+            "firingTriggerId": ["1"],
+            "parentFolderId": "1",
+        },
+        {"tagId": "2", "name": "No Trigger", "type": "html"},
+        {
+            "tagId": "3",
+            "name": "Campaign",
+            "type": "html",
+            "firingTriggerId": ["2147479553"],
+            "scheduleEndMs": str(NOW - 1),
+        },
+        {
+            "tagId": "4",
+            "name": "Old Campaign",
+            "type": "html",
+            "firingTriggerId": ["3"],
+            "scheduleEndMs": str(NOW - 1),
+            "paused": True,
+        },
+    ],
+    "trigger": [
+        {"triggerId": "1", "name": "Click", "type": "click"},
+        {"triggerId": "2", "name": "Unused", "type": "pageview"},
+        {
+            "triggerId": "3",
+            "name": "Group",
+            "type": "triggerGroup",
+            "parameter": [
+                {
+                    "type": "list",
+                    "key": "triggerIds",
+                    "list": [{"type": "triggerReference", "value": "4"}],
+                }
+            ],
+        },
+        {"triggerId": "4", "name": "Scroll", "type": "scrollDepth"},
+    ],
+    "variable": [
+        {
+            "variableId": "1",
+            "name": "ID",
+            "type": "c",
+            "parameter": [{"type": "template", "key": "value", "value": "{{Env}}"}],
+        },
+        {"variableId": "2", "name": "Env", "type": "c"},
+        {"variableId": "3", "name": "Unused", "type": "c"},
+    ],
+    "folder": [{"folderId": "1", "name": "GA"}, {"folderId": "2", "name": "Empty"}],
+}
+
+
+def _issues(issues):
+    return sorted((x["rule"], x["type"], x["id"]) for x in issues)
+
+
+def test_lint():
+    linter = GTMLinter(now=NOW)
+
+    assert _issues(linter.lint(GTMVersionView(VERSION))) == [
+        ("empty-folder", "folder", "2"),
+        ("expired-schedule", "tag", "3"),
+        ("paused-expired-tag", "tag", "4"),
+        ("tag-without-trigger", "tag", "2"),
+        ("unused-trigger", "trigger", "2"),
+        ("unused-variable", "variable", "3"),
+    ]
+    assert (
+        GTMLinter(now=NOW - 2).lint(GTMVersionView({"tag": VERSION["tag"][2:]})) == []
+    )
+
+
+@lint_rule("tag", name="custom-html")
+def custom_html(tag, context):
+    return "Custom HTML" if tag.get("type") == "html" else None
+
+
+# keep the default rules of the other tests
+del RULES["custom-html"]
+
+
+def test_custom_rule():
+    linter = GTMLinter(rules=[custom_html])
+    issues = linter.lint(GTMVersionView(VERSION))
+
+    assert _issues(issues) == [
+        ("custom-html", "tag", "2"),
+        ("custom-html", "tag", "3"),
+        ("custom-html", "tag", "4"),
+    ]
+    assert issues[0]["name"] == "No Trigger"
+    assert issues[0]["message"] == "Custom HTML"
+    assert pickle.loads(pickle.dumps(linter)).rules == [custom_html]
+
+
+def test_lint_mirror(mock_service, tmpdir):
+    service, responses = mock_service(
+        "account_list.json",
+        "empty.json",
+        "containers_list.json",
+        "version_headers_list.json",
+        "version_get.json",
+        "workspace_list.json",
+        "tags_list.json",
+        "triggers_list.json",
+        "variables_list.json",
+        "folders_list.json",
+        "empty.json",
+        "empty.json",
+    )
+    database = str(tmpdir.join("mirror.db"))
+    mirror = GTMMirror(database, manager=GTMManager(service=service))
+    mirror.sync()
+    paths = latest_snapshots(mirror.connection)
+    mirror.close()
+
+    version_path = responses[4]["path"]
+    workspace_path = responses[5]["workspace"][0]["path"]
+    assert sorted(paths) == sorted([version_path, workspace_path])
+
+    linter = GTMLinter()
+    results = linter.lint_mirror(
+        database, paths + ["accounts/1/missing"], max_workers=2
+    )
+
+    assert results[version_path] == linter.lint(GTMVersionView(responses[4]))
+    assert isinstance(results[workspace_path], list)
+    assert isinstance(results["accounts/1/missing"], ValueError)
+
+
+def test_lint_snapshot_connections(tmpdir, monkeypatch):
+    database = str(tmpdir.join("mirror.db"))
+    GTMMirror(database, manager=object()).close()
+    linter = GTMLinter()
+
+    # a forked worker inherits the connections of its parent, but opens its own
+    monkeypatch.setattr(lint, "_connections", {})
+    for pid in (1, 1, 2):
+        monkeypatch.setattr(os, "getpid", lambda pid=pid: pid)
+        with pytest.raises(ValueError):
+            _lint_snapshot(linter, database, "accounts/1/missing")
+
+    assert sorted(lint._connections) == [(1, database), (2, database)]
+    for connection in lint._connections.values():
+        connection.close()
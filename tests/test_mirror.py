@@ -0,0 +1,118 @@
+# pylint: disable=missing-docstring
+from gtm_manager.manager import GTMManager
+from gtm_manager.mirror import GTMMirror
+from gtm_manager.version import GTMVersionView
+
+ACCOUNTS = ["account_list.json", "empty.json", "containers_list.json"]
+
+
+def _count(mirror, table):
+    return mirror.connection.execute(
+        "SELECT COUNT(*) FROM {}".format(table)
+    ).fetchone()[0]
+
+
+def test_sync(mock_service, tmpdir):
+    service, responses = mock_service(
+        *ACCOUNTS,
+        "version_headers_list.json",
+        "version_get.json",
+        "workspace_list.json",
+        "tags_list.json",
+        "triggers_list.json",
+        "variables_list.json",
+        "folders_list.json",
+        "empty.json",  # version headers of the second container
+        "empty.json",  # workspaces of the second container
+    )
+    database = str(tmpdir.join("mirror.db"))
+    mirror = GTMMirror(database, manager=GTMManager(service=service))
+
+    assert mirror.sync() == {
+        "accounts": 2,
+        "containers": 2,
+        "versions": 1,
+        "workspaces": 1,
+    }
+
+    version_get = responses[4]
+    assert _count(mirror, "versions") == 1
+    assert _count(mirror, "tags") == len(version_get["tag"]) + len(responses[6]["tag"])
+    assert _count(mirror, "folders") == len(version_get["folder"]) + 1
+
+    version = mirror.get_version(version_get["path"])
+    assert isinstance(version, GTMVersionView)
+    assert version.raw_body == version_get
+    assert mirror.get_version("accounts/1/containers/1/versions/1") is None
+
+    mirror.close()
+
+    # unchanged fingerprints and known versions are not loaded again
+    service, _ = mock_service(
+        *ACCOUNTS,
+        "version_headers_list.json",
+        "workspace_list.json",
+        "empty.json",
+        "empty.json",
+    )
+    mirror = GTMMirror(database, manager=GTMManager(service=service))
+
+    assert mirror.sync() == {
+        "accounts": 0,
+        "containers": 0,
+        "versions": 0,
+        "workspaces": 0,
+    }
+    assert _count(mirror, "tags") == len(version_get["tag"]) + len(responses[6]["tag"])
+
+    # removed containers are removed with all their versions, workspaces and entities
+    service, _ = mock_service("account_list.json", "empty.json", "empty.json")
+    mirror.manager = GTMManager(service=service)
+    mirror.sync()
+
+    assert _count(mirror, "containers") == 0
+    assert _count(mirror, "versions") == 0
+    assert _count(mirror, "workspaces") == 0
+    assert _count(mirror, "tags") == 0
+    assert _count(mirror, "accounts") == 2
+
+
+def test_sync_workspace_changed(mock_service, tmpdir):
+    service, _ = mock_service(
+        *ACCOUNTS,
+        "version_headers_list.json",
+        "version_get.json",
+        "workspace_list.json",
+        "tags_list.json",
+        "triggers_list.json",
+        "variables_list.json",
+        "folders_list.json",
+        "empty.json",
+        "empty.json",
+    )
+    database = str(tmpdir.join("mirror.db"))
+    mirror = GTMMirror(database, manager=GTMManager(service=service))
+    mirror.sync()
+
+    # the workspace fingerprint changed, the container fingerprint did not
+    service, responses = mock_service(
+        *ACCOUNTS,
+        "version_headers_list.json",
+        "workspace_list_edited.json",
+        "tags_list.json",
+        "triggers_list.json",
+        "variables_list.json",
+        "folders_list.json",
+        "empty.json",
+        "empty.json",
+    )
+    mirror.manager = GTMManager(service=service)
+
+    assert mirror.sync() == {
+        "accounts": 0,
+        "containers": 0,
+        "versions": 0,
+        "workspaces": 1,
+    }
+    rows = mirror.connection.execute("SELECT fingerprint FROM workspaces").fetchall()
+    assert rows == [(responses[4]["workspace"][0]["fingerprint"],)]
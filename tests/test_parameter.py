@@ -78,3 +78,75 @@ def test_copy():
     parameter = GTMParameter(parameter_dict)
 
     assert parameter_dict == parameter.copy().to_obj()
+
+
+def test_to_obj_repeated():
+    parameter_dict = {
+        "type": "list",
+        "key": "fieldsToSet",
+        "list": [{"type": "map", "key": "anonymizeIp", "value": "true"}],
+    }
+
+    parameter = GTMParameter(parameter_dict)
+
+    assert parameter.to_obj() == parameter.to_obj() == parameter_dict
+    assert isinstance(parameter.list[0], GTMParameter)
+
+
+def test_copy_on_write():
+    parameter_dict = {
+        "type": "list",
+        "key": "fieldsToSet",
+        "list": [
+            {"type": "map", "key": "anonymizeIp", "value": "true"},
+            {"type": "map", "key": "page", "value": "/home"},
+        ],
+    }
+
+    parameter = GTMParameter(parameter_dict)
+
+    # unchanged parameters are serialized without copies
+    assert parameter.to_obj() is parameter_dict
+    assert parameter.list[0].to_obj() is parameter_dict["list"][0]
+
+    parameter.list[1].value = "/checkout"
+
+    obj = parameter.to_obj()
+    assert obj["list"][0] is parameter_dict["list"][0]
+    assert obj["list"][1] == {"type": "map", "key": "page", "value": "/checkout"}
+    assert parameter_dict["list"][1]["value"] == "/home"
+
+    copied = parameter.copy()
+    copied.key = "fieldsToSetCopy"
+
+    assert copied.list[1].value == "/checkout"
+    assert parameter.key == "fieldsToSet"
+
+
+def test_map_copy_on_write():
+    parameter_dict = {
+        "type": "map",
+        "key": "row",
+        "map": [{"type": "template", "key": "key", "value": "a"}],
+    }
+
+    parameter = GTMParameter(parameter_dict)
+
+    # reads return the wrapped entries without copies
+    assert parameter.map is parameter_dict["map"]
+    assert parameter.to_obj() is parameter_dict
+
+    parameter.set_map_value("key", "b")
+    parameter.set_map_value("value", "c")
+
+    assert parameter.to_obj()["map"] == [
+        {"type": "template", "key": "key", "value": "b"},
+        {"type": "template", "key": "value", "value": "c"},
+    ]
+    assert parameter_dict["map"] == [{"type": "template", "key": "key", "value": "a"}]
+
+    parameter = GTMParameter(parameter_dict)
+    parameter.edit_map()[0]["value"] = "d"
+
+    assert parameter.map[0]["value"] == "d"
+    assert parameter_dict["map"][0]["value"] == "a"
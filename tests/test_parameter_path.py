@@ -0,0 +1,77 @@
+# pylint: disable=missing-docstring
+import pytest
+
+from gtm_manager.parameter import GTMParameter
+from gtm_manager.parameter_path import GTMParameterPath, compile_path
+from gtm_manager.tag import GTMTag, GTMTagView
+
+
+def _field(name, value):
+    return {
+        "type": "map",
+        "map": [
+            {"type": "template", "key": "fieldName", "value": name},
+            {"type": "template", "key": "value", "value": value},
+        ],
+    }
+
+
+TAG = {
+    "tagId": "1",
+    "name": "UA - Pageview",
+    "type": "ua",
+    "fingerprint": "1",
+    "parameter": [
+        {"type": "template", "key": "trackingId", "value": "UA-1234-1"},
+        {
+            "type": "list",
+            "key": "fieldsToSet",
+            "list": [_field("anonymizeIp", "true"), _field("page.path", "/home")],
+        },
+    ],
+}
+
+
+def test_init():
+    assert compile_path("fieldsToSet") is compile_path("fieldsToSet")
+
+    for expression in ["", ".value", "fieldsToSet[", "fieldsToSet[a=b", "a..b", "a b"]:
+        with pytest.raises(ValueError):
+            GTMParameterPath(expression)
+
+
+def test_get():
+    tag = GTMTagView(TAG)
+
+    assert compile_path("trackingId").get(tag) == ["UA-1234-1"]
+    assert compile_path("fieldsToSet.fieldName").get(tag) == ["anonymizeIp", "page.path"]
+    assert compile_path("fieldsToSet[fieldName=anonymizeIp].value").get(tag) == [
+        "true"
+    ]
+    assert compile_path('fieldsToSet[fieldName="page.path"].value').get(tag) == [
+        "/home"
+    ]
+    assert compile_path("fieldsToSet[-1].value").get(tag) == ["/home"]
+    assert compile_path("fieldsToSet[*].value").get(tag) == ["true", "/home"]
+    assert compile_path("fieldsToSet[5].value").get(tag) == []
+    assert compile_path("fieldsToSet[fieldName=x].value").first(tag, "n/a") == "n/a"
+
+    parameters = [GTMParameter(x) for x in TAG["parameter"]]
+    assert compile_path("trackingId").first(parameters) == "UA-1234-1"
+
+
+def test_set(mock_service):
+    service, _ = mock_service("echo_request_body")
+    tag = GTMTag(tag=TAG, parent="accounts/1/containers/1/workspaces/1", service=service)
+    path = compile_path("fieldsToSet[fieldName=anonymizeIp].value")
+
+    changed = path.set(tag, "false")
+
+    assert [x.key for x in changed] == ["fieldsToSet"]
+    assert path.get(tag) == ["true"]
+    assert path.get(changed) == ["false"]
+    assert TAG["parameter"][1]["list"][0]["map"][1]["value"] == "true"
+
+    assert tag.update(parameter=changed)
+    assert path.get(tag) == ["false"]
+    assert compile_path("fieldsToSet[1].value").get(tag) == ["/home"]
@@ -0,0 +1,48 @@
+# pylint: disable=missing-docstring
+import pickle
+
+import pytest
+
+from gtm_manager.path import GTMPath
+from gtm_manager.tag import GTMTagView
+
+
+def test_init():
+    path = GTMPath("accounts/1/containers/2/workspaces/3/tags/4")
+
+    assert path == "accounts/1/containers/2/workspaces/3/tags/4"
+    assert GTMPath("accounts/1/containers/2/workspaces/3/tags/4") is path
+    assert GTMPath(path) is path
+    assert pickle.loads(pickle.dumps(path)) is path
+
+    with pytest.raises(TypeError):
+        GTMPath(None)
+
+
+def test_accessors():
+    path = GTMPath("accounts/1/containers/2/workspaces/3/tags/4")
+
+    assert path.account_id == "1"
+    assert path.container_id == "2"
+    assert path.workspace_id == "3"
+    assert path.version_id is None
+    assert path.entity_type == "tag"
+    assert path.entity_id == "4"
+
+    assert path.parent == "accounts/1/containers/2/workspaces/3"
+    assert path.parent.entity_type == "workspace"
+    assert path.parent.parent.parent == "accounts/1"
+    assert path.parent.parent.parent.parent is None
+    assert path.parent.child("tags", "4") is path
+
+    version = GTMPath("accounts/1/containers/2/versions/5")
+    assert version.version_id == "5"
+    assert version.entity_type == "version"
+
+
+def test_entity_paths():
+    tag = GTMTagView({"tagId": "4"}, parent="accounts/1/containers/2/workspaces/3")
+
+    assert isinstance(tag.path, GTMPath)
+    assert tag.path is GTMPath("accounts/1/containers/2/workspaces/3/tags/4")
+    assert tag.path.workspace_id == "3"
@@ -0,0 +1,145 @@
+# pylint: disable=missing-docstring
+from gtm_manager.container import GTMContainer
+from gtm_manager.version import GTMVersionView
+from gtm_manager.payload import (
+    GTMPayloadAnalyzer,
+    analyze_tag,
+    analyze_containers,
+    regressions,
+)
+
+
+def html_tag(tag_id, html, triggers, **kwargs):
+    return {
+        "tagId": tag_id,
+        "name": "Tag {}".format(tag_id),
+        "type": "html",
+        "parameter": [
+            {"type": "template", "key": "html", "value": html},
+            {"type": "boolean", "key": "supportDocumentWrite", "value": "true"},
+        ],
+        "firingTriggerId": triggers,
+        **kwargs,
+    }
+
+
+VERSION = {
+    "path": "accounts/1234/containers/1234/versions/2",
+    "containerVersionId": "2",
+    "trigger": [{"triggerId": "1", "name": "Click"}],
+    "tag": [
+        html_tag("1", '<script src="https://a.com/a.js"></script>', ["2147479553"]),
+        html_tag(
+            "2", '<script async src="https://b.com/b.js"></script>', ["2147479553"]
+        ),
+        html_tag("3", "<script>document.write('€')</script>", ["1"]),
+        html_tag("4", "<script>" + "x" * 1000 + "</script>", ["1"], paused=True),
+        {
+            "tagId": "5",
+            "type": "ua",
+            "parameter": [
+                {"type": "template", "key": "trackingId", "value": "UA-1"},
+                {
+                    "type": "list",
+                    "key": "fieldsToSet",
+                    "list": [
+                        {
+                            "type": "map",
+                            "map": [
+                                {
+                                    "type": "template",
+                                    "key": "fieldName",
+                                    "value": "page",
+                                },
+                                {
+                                    "type": "boolean",
+                                    "key": "anonymize",
+                                    "value": "true",
+                                },
+                            ],
+                        }
+                    ],
+                },
+            ],
+            "firingTriggerId": ["2147479553", "1"],
+        },
+    ],
+}
+
+
+def test_analyze_tag():
+    tag = analyze_tag(VERSION["tag"][2])
+    assert tag["size"] == len("<script>document.write('€')</script>") + 2
+    assert tag["document_write"]
+    assert tag["blocking_scripts"] == 0
+
+    tag = analyze_tag(VERSION["tag"][0])
+    assert not tag["document_write"]
+    assert tag["blocking_scripts"] == 1
+    assert analyze_tag(VERSION["tag"][1])["blocking_scripts"] == 0
+
+    # async and defer only count as attributes, not as parts of the URL
+    for html, blocking in (
+        ('<script src="https://a.com/async/lib.js?defer=1"></script>', 1),
+        ("<script src=https://a.com/async.js></script>", 1),
+        ('<script data-src="a.js"></script>', 0),
+        ('<script src = "a.js" async></script>', 0),
+        ('<script type="text/javascript"\nsrc="a.js" defer></script>', 0),
+        ("<script src='a.js' async=''></script>", 0),
+    ):
+        assert analyze_tag(html_tag("6", html, []))["blocking_scripts"] == blocking
+    assert analyze_tag(VERSION["tag"][4])["size"] == len("UA-1page")
+
+
+def test_analyzer():
+    analyzer = GTMPayloadAnalyzer(GTMVersionView(VERSION))
+    sizes = {x["id"]: x["size"] for x in analyzer.tags}
+
+    assert "4" not in sizes
+    assert analyzer.all_pages_size == sizes["1"] + sizes["2"] + sizes["5"]
+    assert analyzer.triggers["1"] == {
+        "name": "Click",
+        "size": sizes["3"] + sizes["5"],
+        "tags": ["3", "5"],
+    }
+    assert analyzer.triggers["2147479553"]["name"] == "All Pages"
+    assert [x["id"] for x in analyzer.offenders(limit=3)] == ["1", "3", "2"]
+
+    assert analyzer.summary() == {
+        "path": VERSION["path"],
+        "containerVersionId": "2",
+        "size": sum(sizes.values()),
+        "all_pages_size": analyzer.all_pages_size,
+        "document_write": 1,
+        "blocking_scripts": 1,
+    }
+
+
+def test_analyze_containers(mock_service):
+    service, responses = mock_service("container_get.json", "version_get.json")
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+
+    results = analyze_containers([container])
+    assert (
+        results[container.path]["containerVersionId"]
+        == responses[1]["containerVersionId"]
+    )
+
+    service, _ = mock_service("container_get.json", ("500", "empty.json"))
+    container = GTMContainer(path="accounts/1234/containers/1234", service=service)
+    assert isinstance(analyze_containers([container])[container.path], Exception)
+
+
+def test_regressions():
+    summary = {"containerVersionId": "1", "all_pages_size": 100}
+    previous = {"a": summary, "b": summary, "c": summary, "d": summary}
+    current = {
+        "a": {"containerVersionId": "2", "all_pages_size": 200},
+        "b": {"containerVersionId": "2", "all_pages_size": 50},
+        "c": {"containerVersionId": "1", "all_pages_size": 200},
+        "d": None,
+        "e": {"containerVersionId": "1", "all_pages_size": 200},
+    }
+
+    assert regressions(previous, current) == {"a": (summary, current["a"])}
+    assert regressions(previous, current, threshold=100) == {}
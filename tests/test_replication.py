@@ -0,0 +1,179 @@
+# pylint: disable=missing-docstring
+import json
+
+import pytest
+
+from gtm_manager.replication import GTMReplicator
+from gtm_manager.version import GTMVersion
+from gtm_manager.workspace import GTMWorkspace
+
+
+def _source(mock_service):
+    service, responses = mock_service("version_get.json")
+    return GTMVersion(version=responses[0], service=service)
+
+
+def _record_bodies(service):
+    bodies = []
+    request = service._http.request  # pylint: disable=protected-access
+
+    def recording_request(uri, method="GET", body=None, **kwargs):
+        if method != "GET" and ":quick_preview" not in uri:
+            bodies.append((method, uri, json.loads(body) if body else None))
+        return request(uri, method=method, body=body, **kwargs)
+
+    service._http.request = recording_request  # pylint: disable=protected-access
+    return bodies
+
+
+def test_init(mock_service):
+    with pytest.raises(ValueError):
+        GTMReplicator(None)
+
+    service, _ = mock_service("workspace_get.json", "quick_preview_get.json")
+    workspace = GTMWorkspace(
+        path="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+
+    assert isinstance(GTMReplicator(workspace), GTMReplicator)
+
+
+def test_replicate_to_dry_run(mock_service):
+    replicator = GTMReplicator(_source(mock_service))
+
+    service, _ = mock_service("workspace_get.json", "quick_preview_get.json")
+    workspace = GTMWorkspace(
+        path="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+
+    changes = replicator.replicate_to(workspace, dry_run=True)
+
+    assert changes == [
+        {"action": "create", "type": "builtInVariable", "name": "clickUrl"},
+        {"action": "create", "type": "variable", "name": "const.brand"},
+        {"action": "create", "type": "variable", "name": "const.productName"},
+        {"action": "create", "type": "tag", "name": "HTML - Helper"},
+    ]
+
+
+def test_replicate_to(mock_service):
+    replicator = GTMReplicator(_source(mock_service))
+
+    service, _ = mock_service(
+        "workspace_get.json",
+        "quick_preview_get.json",
+        "built_in_variables_get.json",
+        "echo_request_body",  # variable
+        "echo_request_body",  # variable
+        "echo_request_body",  # tag
+    )
+    workspace = GTMWorkspace(
+        path="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+    bodies = _record_bodies(service)
+
+    changes = replicator.replicate_to(workspace)
+
+    assert len(changes) == 4
+    assert len(bodies) == 4
+
+    # unknown folder ids are dropped, read-only fields are never sent
+    _, _, variable_body = bodies[1]
+    assert "parentFolderId" not in variable_body
+    assert "variableId" not in variable_body
+    assert "fingerprint" not in variable_body
+
+    _, uri, tag_body = bodies[3]
+    assert uri.endswith("accounts/1234/containers/1234/workspaces/1/tags?alt=json")
+    assert tag_body["firingTriggerId"] == ["2147479553"]
+
+
+def test_replicate_to_remaps_ids(mock_service, data_file):
+    source = json.loads(data_file("version_get.json"))
+    source["tag"][0]["firingTriggerId"] = ["11", "2147479553"]
+    source["tag"][0]["parentFolderId"] = "8"
+    source["builtInVariable"] = []
+    source["variable"] = []
+
+    target = json.loads(data_file("quick_preview_get.json"))["containerVersion"]
+    target["trigger"][0]["triggerId"] = "42"
+    target["trigger"][0]["parentFolderId"] = "9"
+    target["tag"][0]["name"] = "HTML - Helper"
+
+    service, responses = mock_service(
+        "workspace_get.json", "echo_request_body", "echo_request_body"
+    )
+    replicator = GTMReplicator(GTMVersion(version=source, service=service))
+    workspace = GTMWorkspace(workspace=responses[0], service=service)
+    workspace.quick_preview = lambda: GTMVersion(version=target, service=service)
+    bodies = _record_bodies(service)
+
+    changes = replicator.replicate_to(workspace)
+
+    assert changes == [
+        {"action": "update", "type": "trigger", "name": "Trigger 1"},
+        {"action": "update", "type": "tag", "name": "HTML - Helper"},
+    ]
+
+    method, uri, trigger_body = bodies[0]
+    assert method == "PUT"
+    assert "workspaces/1/triggers/42" in uri
+    assert trigger_body["parentFolderId"] == "7"
+
+    method, uri, tag_body = bodies[1]
+    assert method == "PUT"
+    assert "workspaces/1/tags/2" in uri
+    assert tag_body["firingTriggerId"] == ["42", "2147479553"]
+    assert tag_body["parentFolderId"] == "9"
+
+
+def test_replicate_to_created_trigger_ids(mock_service, data_file):
+    source = json.loads(data_file("version_get.json"))
+    source["builtInVariable"] = []
+    source["trigger"] = [{"triggerId": "21", "name": "New Trigger", "type": "click"}]
+    source["variable"] = [
+        {"variableId": "5", "name": "Enabled", "type": "c", "enablingTriggerId": ["21"]}
+    ]
+    source["tag"][0]["firingTriggerId"] = ["99"]
+
+    target = json.loads(data_file("quick_preview_get.json"))["containerVersion"]
+
+    service, responses = mock_service("trigger_get.json", "echo_request_body")
+    replicator = GTMReplicator(GTMVersion(version=source, service=service))
+    workspace = GTMWorkspace(
+        workspace=json.loads(data_file("workspace_get.json")), service=service
+    )
+    workspace.quick_preview = lambda: GTMVersion(version=target, service=service)
+    bodies = _record_bodies(service)
+
+    assert replicator.replicate_to(workspace, dry_run=True) == [
+        {"action": "create", "type": "trigger", "name": "New Trigger"},
+        {"action": "create", "type": "variable", "name": "Enabled"},
+        {"action": "skip", "type": "tag", "name": "HTML - Helper"},
+    ]
+    assert not bodies
+
+    changes = replicator.replicate_to(workspace)
+
+    # the trigger is created before the variable referencing it, the tag references a trigger,
+    # that does not exist in the source, and is not written
+    assert [x["action"] for x in changes] == ["create", "create", "skip"]
+    assert len(bodies) == 2
+    _, _, variable_body = bodies[1]
+    assert variable_body["enablingTriggerId"] == [responses[0]["triggerId"]]
+
+
+def test_replicate(mock_service, data_file):
+    replicator = GTMReplicator(_source(mock_service))
+
+    workspaces = []
+    for workspace_id in ["1", "2"]:
+        service, _ = mock_service("quick_preview_get.json")
+        workspace = json.loads(data_file("workspace_get.json"))
+        workspace["path"] = "accounts/1234/containers/1234/workspaces/" + workspace_id
+        workspaces.append(GTMWorkspace(workspace=workspace, service=service))
+
+    results = replicator.replicate(workspaces, max_workers=2, dry_run=True)
+
+    assert sorted(results.keys()) == sorted(x.path for x in workspaces)
+    assert all(len(x) == 4 for x in results.values())
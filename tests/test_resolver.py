@@ -0,0 +1,246 @@
+# pylint: disable=missing-docstring
+from gtm_manager.version import GTMVersionView
+from gtm_manager.resolver import GTMVariableResolver, url_component, has_backreference
+
+
+def param(key, value, param_type="template"):
+    return {"type": param_type, "key": key, "value": value}
+
+
+def table(*rows):
+    return {
+        "type": "list",
+        "key": "map",
+        "list": [
+            {"type": "map", "map": [param("key", k), param("value", v)]}
+            for k, v in rows
+        ],
+    }
+
+
+VERSION = {
+    "variable": [
+        {
+            "name": "DLV - product",
+            "type": "v",
+            "parameter": [
+                param("dataLayerVersion", "2", "integer"),
+                param("name", "ecommerce.products.0.id"),
+                param("setDefaultValue", "true", "boolean"),
+                param("defaultValue", "{{Constant - unknown}}"),
+            ],
+        },
+        {
+            "name": "Constant - unknown",
+            "type": "c",
+            "parameter": [param("value", "unknown")],
+        },
+        {
+            "name": "Constant - product",
+            "type": "c",
+            "parameter": [param("value", "product-{{DLV - product}}")],
+        },
+        {
+            "name": "Lookup - property",
+            "type": "smm",
+            "parameter": [
+                param("input", "{{Page Hostname}}"),
+                table(
+                    ("example.com", "UA-1"),
+                    ("example.com", "UA-2"),
+                    ("test.com", "{{DLV - product}}"),
+                ),
+                param("setDefaultValue", "true", "boolean"),
+                param("defaultValue", "UA-0"),
+            ],
+        },
+        {
+            "name": "Regex - section",
+            "type": "remm",
+            "parameter": [
+                param("input", "{{Page Path}}"),
+                table(("/shop/", "shop"), ("^/$", "home"), ("/shop/sale", "sale")),
+                param("fullMatch", "false", "boolean"),
+                param("ignoreCase", "true", "boolean"),
+            ],
+        },
+        {
+            "name": "Regex - full",
+            "type": "remm",
+            "parameter": [
+                param("input", "{{Page Path}}"),
+                table(("/shop", "shop"), ("/shop/(\\w+)", "category-$1")),
+                param("fullMatch", "true", "boolean"),
+                param("replaceAfterMatch", "true", "boolean"),
+            ],
+        },
+        {
+            "name": "URL - campaign",
+            "type": "u",
+            "parameter": [
+                param("component", "QUERY"),
+                param("queryKey", "utm_campaign"),
+            ],
+        },
+        {
+            "name": "Regex - repeated",
+            "type": "remm",
+            "parameter": [
+                param("input", "{{Page Path}}"),
+                table(("/(a)(b)", "ab"), ("(\\w)\\1", "double-$1")),
+                param("replaceAfterMatch", "true", "boolean"),
+            ],
+        },
+        {
+            "name": "Regex - backslash",
+            "type": "remm",
+            "parameter": [
+                param("input", "{{Page Path}}"),
+                table(("/(\\w+)", "C:\\b\\$1")),
+                param("fullMatch", "true", "boolean"),
+                param("replaceAfterMatch", "true", "boolean"),
+            ],
+        },
+        {"name": "Cycle A", "type": "c", "parameter": [param("value", "{{Cycle B}}")]},
+        {"name": "Cycle B", "type": "c", "parameter": [param("value", "{{Cycle A}}")]},
+        {"name": "Custom JavaScript", "type": "jsm", "parameter": []},
+    ]
+}
+
+
+def test_url_component():
+    url = "https://www.example.com:8080/shop/?utm_campaign=sale#top"
+
+    assert url_component(url, "URL") == url
+    assert url_component(url, "HOST") == "www.example.com"
+    assert url_component(url, "PORT") == "8080"
+    assert url_component(url, "PATH") == "/shop/"
+    assert url_component(url, "QUERY") == "utm_campaign=sale"
+    assert url_component(url, "QUERY", "utm_campaign") == "sale"
+    assert url_component(url, "QUERY", "utm_source") is None
+    assert url_component(url, "FRAGMENT") == "top"
+    assert url_component(None, "HOST") is None
+
+
+def test_resolve():
+    resolver = GTMVariableResolver(GTMVersionView(VERSION))
+    model = {"event": "gtm.js", "ecommerce": {"products": [{"id": 17}]}}
+    page = {"url": "https://example.com/Shop/sale?utm_campaign=spring"}
+
+    assert resolver.resolve("DLV - product", model) == 17
+    assert resolver.resolve("DLV - product", {}) == "unknown"
+    assert resolver.resolve("Constant - product", model) == "product-17"
+    assert resolver.resolve("Event", model) == "gtm.js"
+    assert resolver.resolve("unknown", {"unknown": 1}) == 1
+
+    assert resolver.resolve("Lookup - property", model, page) == "UA-1"
+    assert (
+        resolver.resolve("Lookup - property", model, {"url": "https://test.com"}) == 17
+    )
+    assert resolver.resolve("Lookup - property", model) == "UA-0"
+
+    # the first matching row wins, not the leftmost match
+    assert resolver.resolve("Regex - section", model, page) == "shop"
+    assert (
+        resolver.resolve("Regex - section", model, {"url": "https://a.com/"}) == "home"
+    )
+    assert (
+        resolver.resolve("Regex - section", model, {"url": "https://a.com/x"}) is None
+    )
+
+    assert (
+        resolver.resolve("Regex - full", model, {"url": "https://a.com/shop"}) == "shop"
+    )
+    assert (
+        resolver.resolve("Regex - full", model, {"url": "https://a.com/shop/shoes"})
+        == "category-shoes"
+    )
+    assert resolver.resolve("Regex - full", model, page) == "category-sale"
+
+    assert resolver.resolve("URL - campaign", model, page) == "spring"
+    assert resolver.resolve("Cycle A", model) is None
+    assert resolver.resolve("Custom JavaScript", model) is None
+
+    assert (
+        resolver.render("{{Page Path}}|{{DLV - product}}|{{missing}}", model, page)
+        == "/Shop/sale|17|undefined"
+    )
+
+
+def test_memo():
+    resolver = GTMVariableResolver(GTMVersionView(VERSION))
+    memo = {}
+
+    resolver.resolve("Constant - product", {}, memo=memo)
+    assert memo == {
+        "Constant - product": "product-unknown",
+        "DLV - product": "unknown",
+        "Constant - unknown": "unknown",
+    }
+
+    memo["DLV - product"] = "cached"
+    assert resolver.resolve("DLV - product", {}, memo=memo) == "cached"
+
+
+def test_has_backreference():
+    assert has_backreference(r"(\w)\1")
+    assert has_backreference(r"(?P<x>a)(?P=x)")
+    assert has_backreference(r"(a)?(?(1)b|c)")
+    assert not has_backreference(r"\\1")
+    assert not has_backreference(r"\101\d\(")
+    assert not has_backreference(r"/shop/(\w+)")
+
+
+def test_regex_table_groups():
+    resolver = GTMVariableResolver(GTMVersionView(VERSION))
+
+    # the group reference of the second row is not renumbered by the first row
+    assert (
+        resolver.resolve("Regex - repeated", {}, {"url": "https://a.com/xx"})
+        == "/double-x"
+    )
+    assert resolver.resolve("Regex - repeated", {}, {"url": "https://a.com/ab"}) == "ab"
+
+    # backslashes of the output are literals
+    assert (
+        resolver.resolve("Regex - backslash", {}, {"url": "https://a.com/shoes"})
+        == "C:\\b\\shoes"
+    )
+
+
+def test_regex_table_combined():
+    variables = [
+        {
+            "name": "DLV - input",
+            "type": "v",
+            "parameter": [
+                param("dataLayerVersion", "2", "integer"),
+                param("name", "x"),
+            ],
+        }
+    ]
+    for full_match in ("true", "false"):
+        for name, rows in (
+            ("combined", [("a.b", "hit")]),
+            # the group reference forces matching the rows one by one
+            ("rows", [("a.b", "hit"), ("(y)\\1", "double")]),
+        ):
+            variables.append(
+                {
+                    "name": "{} {}".format(name, full_match),
+                    "type": "remm",
+                    "parameter": [
+                        param("input", "{{DLV - input}}"),
+                        table(*rows),
+                        param("fullMatch", full_match, "boolean"),
+                    ],
+                }
+            )
+    resolver = GTMVariableResolver(GTMVersionView({"variable": variables}))
+
+    for full_match in ("true", "false"):
+        for value in ("a\nb", "a-b", "xa-b", "x\na-b"):
+            combined = resolver.resolve("combined " + full_match, {"x": value})
+            assert combined == resolver.resolve("rows " + full_match, {"x": value})
+    assert resolver.resolve("combined false", {"x": "a\nb"}) is None
+    assert resolver.resolve("combined false", {"x": "x\na-b"}) == "hit"
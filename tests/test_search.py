@@ -0,0 +1,100 @@
+# pylint: disable=missing-docstring
+import json
+
+from gtm_manager.manager import GTMManager
+from gtm_manager.mirror import GTMMirror
+from gtm_manager.search import GTMSearchIndex, regex_literals
+from gtm_manager.version import GTMVersionView
+
+
+def test_regex_literals():
+    assert regex_literals(r"connect\.facebook\.net/.*/fbevents\.js") == [
+        "connect.facebook.net/",
+        "/fbevents.js",
+    ]
+    assert regex_literals(r"abc?def") == ["ab", "def"]
+    assert regex_literals(r"(foo)bar\d+[a-z]{2}baz") == ["bar", "baz"]
+    assert regex_literals(r"foo|bar") == []
+    assert regex_literals(r"\x41BC") == ["BC"]
+    assert regex_literals(r"\101BC") == ["BC"]
+    assert regex_literals(r"\u00e9t\U000000e9\N{LATIN SMALL LETTER E}x") == [
+        "t",
+        "x",
+    ]
+    assert regex_literals(r"(a)\1bc") == ["bc"]
+
+
+def test_search_regex_escapes(tmpdir):
+    index = GTMSearchIndex(str(tmpdir.join("search.db")))
+    index.index(
+        "accounts/1/containers/1/versions/1",
+        {"tag": [{"tagId": "1", "name": "Caf\u00e9 ABC", "type": "html"}]},
+    )
+
+    for pattern in (r"\x41BC", r"\101BC", r"Caf\u00e9"):
+        assert [x["id"] for x in index.search_regex(pattern)] == ["1"], pattern
+
+
+def test_search(data_file, tmpdir):
+    version = GTMVersionView(json.loads(data_file("version_get.json")))
+    index = GTMSearchIndex(str(tmpdir.join("search.db")))
+
+    assert index.index_version(version)
+    assert not index.index_version(version)
+
+    results = index.search("CONSOLE.LOG")
+    assert len(results) == 1
+    assert results[0]["parent"] == version.path
+    assert results[0]["parent"].container_id == version.containerId
+    assert results[0]["type"] == "tag"
+    assert results[0]["id"] == "1"
+    assert results[0]["key"] == "html"
+
+    assert [x["id"] for x in index.search("pdf")] == ["11"]
+    assert [x["key"] for x in index.search("pdf")] == ["filter[0].arg1"]
+    assert [x["name"] for x in index.search_regex(r"const\.(brand|product)")] == [
+        "const.brand",
+        "const.productName",
+    ]
+    assert index.search_regex(r"console\.log\(.hello!") == []
+    assert len(index.search("a")) > 1
+    assert index.search("missing") == []
+
+    index.remove(version.path)
+    assert index.search("console.log") == []
+
+
+def test_index_mirror(mock_service, tmpdir):
+    service, _ = mock_service(
+        "account_list.json",
+        "empty.json",
+        "containers_list.json",
+        "version_headers_list.json",
+        "version_get.json",
+        "workspace_list.json",
+        "tags_list.json",
+        "triggers_list.json",
+        "variables_list.json",
+        "folders_list.json",
+        "empty.json",
+        "empty.json",
+    )
+    mirror = GTMMirror(
+        str(tmpdir.join("mirror.db")), manager=GTMManager(service=service)
+    )
+    mirror.sync()
+    index = GTMSearchIndex(str(tmpdir.join("search.db")))
+
+    assert index.index_mirror(mirror) == 2
+    assert index.index_mirror(mirror) == 0
+
+    results = index.search_regex(r"console\.log\(.hello")
+    assert sorted((x["parent"].entity_type, x["id"]) for x in results) == [
+        ("version", "1"),
+        ("workspace", "2"),
+        ("workspace", "3"),
+    ]
+
+    mirror.connection.execute("DELETE FROM workspaces")
+    assert index.index_mirror(mirror) == 0
+    assert [x["id"] for x in index.search("console.log")] == ["1"]
@@ -0,0 +1,106 @@
+# pylint: disable=missing-docstring
+import pytest
+
+from gtm_manager.version import GTMVersionView
+from gtm_manager.sequencing import GTMSequencingGraph
+
+
+def tag(name, triggers=(), setup=(), teardown=(), priority=None, **kwargs):
+    body = {
+        "tagId": name,
+        "name": name,
+        "firingTriggerId": list(triggers),
+        "setupTag": [{"tagName": x} for x in setup],
+        "teardownTag": [{"tagName": x} for x in teardown],
+        **kwargs,
+    }
+    if priority is not None:
+        body["priority"] = {"type": "integer", "value": str(priority)}
+    return body
+
+
+VERSION = {
+    "trigger": [{"triggerId": "1"}, {"triggerId": "2"}],
+    "tag": [
+        tag("Consent", priority=10),
+        tag("Loader", setup=["Consent"]),
+        tag("Pixel", ["1"], setup=["Loader"], teardown=["Cleanup"]),
+        tag("Cleanup"),
+        tag("Analytics", ["1", "2147479553"], priority=5),
+        tag("Heatmap", ["1"], priority=20),
+        tag("Broken", ["2", "99"], setup=["Missing", "Paused"]),
+        tag("Paused", paused=True),
+        tag("A", ["3"], setup=["B"]),
+        tag("B", ["3"], setup=["A"]),
+    ],
+}
+
+
+def test_dangling():
+    graph = GTMSequencingGraph(GTMVersionView(VERSION))
+
+    assert graph.dangling() == [
+        {
+            "tag": "Broken",
+            "field": "setupTag",
+            "reference": "Missing",
+            "reason": "missing",
+        },
+        {
+            "tag": "Broken",
+            "field": "setupTag",
+            "reference": "Paused",
+            "reason": "paused",
+        },
+        {
+            "tag": "Broken",
+            "field": "firingTriggerId",
+            "reference": "99",
+            "reason": "missing",
+        },
+        {"tag": "A", "field": "firingTriggerId", "reference": "3", "reason": "missing"},
+        {"tag": "B", "field": "firingTriggerId", "reference": "3", "reason": "missing"},
+    ]
+
+
+def test_cycles():
+    graph = GTMSequencingGraph(GTMVersionView(VERSION))
+    assert graph.cycles() == [["A", "B"]]
+
+    with pytest.raises(ValueError):
+        graph.firing_order("3")
+
+
+def test_firing_order():
+    graph = GTMSequencingGraph(GTMVersionView(VERSION))
+
+    assert graph.firing_order("1") == [
+        "Heatmap",
+        "Consent",
+        "Analytics",
+        "Loader",
+        "Pixel",
+        "Cleanup",
+    ]
+    assert graph.firing_order("2") == ["Broken"]
+    assert graph.firing_order("4") == []
+
+    assert graph.critical_path("1") == (4, ["Consent", "Loader", "Pixel", "Cleanup"])
+    assert graph.critical_path("1", weight=lambda x: 100 if x == "Heatmap" else 1) == (
+        100,
+        ["Heatmap"],
+    )
+    assert graph.critical_path("4") == (0, [])
+
+
+def test_report():
+    report = GTMSequencingGraph(GTMVersionView(VERSION)).report()
+
+    assert report["cycles"] == [["A", "B"]]
+    assert len(report["dangling"]) == 5
+    assert sorted(report["triggers"]) == ["1", "2", "2147479553", "3", "99"]
+    assert report["triggers"]["2147479553"] == {
+        "order": ["Analytics"],
+        "critical_path": (1, ["Analytics"]),
+    }
+    assert isinstance(report["triggers"]["3"], ValueError)
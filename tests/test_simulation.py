@@ -0,0 +1,167 @@
+# pylint: disable=missing-docstring
+from gtm_manager.version import GTMVersionView
+from gtm_manager.simulation import GTMTriggerSimulator, compile_predicate, mask_indices
+
+
+def condition(condition_type, arg0, arg1, **kwargs):
+    return {
+        "type": condition_type,
+        "parameter": [
+            {"type": "template", "key": "arg0", "value": arg0},
+            {"type": "template", "key": "arg1", "value": arg1},
+        ]
+        + [{"type": "boolean", "key": k, "value": v} for k, v in kwargs.items()],
+    }
+
+
+VERSION = {
+    "path": "accounts/1234/containers/1234/versions/1",
+    "variable": [
+        {
+            "variableId": "1",
+            "name": "DLV - value",
+            "type": "v",
+            "parameter": [
+                {"type": "integer", "key": "dataLayerVersion", "value": "2"},
+                {"type": "template", "key": "name", "value": "ecommerce.value"},
+            ],
+        }
+    ],
+    "trigger": [
+        {
+            "triggerId": "1",
+            "type": "linkClick",
+            "filter": [
+                condition("matchRegex", "{{Click URL}}", "pdf", ignore_case="true")
+            ],
+        },
+        {
+            "triggerId": "2",
+            "type": "customEvent",
+            "customEventFilter": [condition("equals", "{{_event}}", "purchase")],
+            "filter": [condition("greater", "{{DLV - value}}", "10")],
+        },
+        {
+            "triggerId": "3",
+            "type": "always",
+            "filter": [condition("equals", "{{debug}}", "true")],
+        },
+        {
+            "triggerId": "4",
+            "type": "customEvent",
+            "customEventFilter": [condition("equals", "{{_event}}", "refund")],
+            "filter": [condition("equals", "{{DLV - value}}", "{{expected}}")],
+        },
+        {"triggerId": "5", "type": "ampClick"},
+    ],
+    "tag": [
+        {"tagId": "1", "firingTriggerId": ["2147479553"]},
+        {"tagId": "2", "firingTriggerId": ["1", "5"]},
+        {"tagId": "3", "firingTriggerId": ["2"], "blockingTriggerId": ["3"]},
+        {"tagId": "4", "firingTriggerId": ["2"], "paused": True},
+        {"tagId": "5", "firingTriggerId": ["4"]},
+    ],
+}
+
+PUSHES = [
+    {"event": "gtm.js"},
+    {"debug": "true"},
+    {"event": "gtm.linkClick", "gtm.elementUrl": "https://example.com/a.PDF"},
+    {"event": "purchase", "ecommerce": {"value": 20}},
+    {"debug": "false", "event": "purchase", "ecommerce": {"value": 20}},
+    {"event": "purchase", "ecommerce": {"value": 5}},
+    {"event": "refund", "expected": "5"},
+]
+
+
+def test_compile_predicate():
+    assert compile_predicate("equals", "a") is compile_predicate("equals", "a")
+    assert compile_predicate("contains", "B", True)("abc")
+    assert not compile_predicate("startsWith", "b")("abc")
+    assert compile_predicate("lessOrEquals", "1.5")("1")
+    assert not compile_predicate("less", "1")("undefined")
+    assert not compile_predicate("matchRegex", "(")("(")
+    assert not compile_predicate("cssSelector", "a")("a")
+
+
+def test_simulate():
+    simulator = GTMTriggerSimulator(GTMVersionView(VERSION))
+
+    assert list(simulator.simulate(PUSHES)) == [
+        (0, "gtm.js", ["1"]),
+        (2, "gtm.linkClick", ["2"]),
+        (3, "purchase", []),
+        (4, "purchase", ["3"]),
+        (5, "purchase", []),
+        (6, "refund", ["5"]),
+    ]
+    assert simulator.matching_triggers({"event": "purchase", "debug": "true"}) == ["3"]
+
+
+def test_simulate_columns():
+    simulator = GTMTriggerSimulator(GTMVersionView(VERSION))
+
+    results = simulator.simulate_columns(PUSHES)
+
+    assert {k: mask_indices(v) for k, v in results.items()} == {
+        "1": [0],
+        "2": [2],
+        "3": [4],
+        "5": [6],
+    }
+
+    rows = simulator.simulate(PUSHES * 50)
+    columns = simulator.simulate_columns(PUSHES * 50)
+    for index, _, tags in rows:
+        assert tags == [k for k, v in columns.items() if v >> index & 1]
+
+
+def test_simulate_page():
+    version = GTMVersionView(
+        {
+            "trigger": [
+                {
+                    "triggerId": "1",
+                    "type": "pageview",
+                    "filter": [condition("startsWith", "{{Page Path}}", "/shop")],
+                }
+            ],
+            "tag": [{"tagId": "1", "firingTriggerId": ["1"]}],
+        }
+    )
+    simulator = GTMTriggerSimulator(version)
+    pushes = [{"event": "gtm.js"}]
+
+    assert list(simulator.simulate(pushes, page={"url": "https://a.com/shop"})) == [
+        (0, "gtm.js", ["1"])
+    ]
+    assert simulator.simulate_columns(pushes, page={"url": "https://a.com/"}) == {}
+
+
+def test_simulate_ignore_case():
+    version = GTMVersionView(
+        {
+            "trigger": [
+                {
+                    "triggerId": "1",
+                    "type": "customEvent",
+                    "customEventFilter": [
+                        condition(
+                            "equals", "{{_event}}", "Purchase", ignore_case="true"
+                        )
+                    ],
+                }
+            ],
+            "tag": [{"tagId": "1", "firingTriggerId": ["1"]}],
+        }
+    )
+    simulator = GTMTriggerSimulator(version)
+    pushes = [{"event": "purchase"}, {"event": "refund"}, {"event": "PURCHASE"}]
+
+    assert list(simulator.simulate(pushes)) == [
+        (0, "purchase", ["1"]),
+        (1, "refund", []),
+        (2, "PURCHASE", ["1"]),
+    ]
+    results = simulator.simulate_columns(pushes)
+    assert {k: mask_indices(v) for k, v in results.items()} == {"1": [0, 2]}
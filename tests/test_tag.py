@@ -1,5 +1,13 @@
 # pylint: disable=missing-docstring
-from gtm_manager.tag import GTMTag
+import json
+import pickle
+from unittest.mock import patch
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from gtm_manager.base import GTMBase
+from gtm_manager.tag import GTMTag, GTMTagView
 from gtm_manager.parameter import GTMParameter
 
 
@@ -70,6 +78,17 @@ def test_init(mock_service):
     assert isinstance(tag.parameter[0], GTMParameter)
 
 
+def test_slots(mock_service):
+    service, _ = mock_service()
+    tag = GTMTag(
+        tag={"tagId": "3"}, parent="accounts/1/containers/1/workspaces/1", service=service
+    )
+
+    assert not hasattr(tag, "__dict__")
+    assert tag.path == "accounts/1/containers/1/workspaces/1/tags/3"
+    assert tag.parameter == []
+
+
 def test_update(mock_service):
     service, responses = mock_service("tag_get.json", "echo_request_body")
     tag_get = responses[0]
@@ -82,7 +101,7 @@ def test_update(mock_service):
 
     new_paramter = {"type": "boolean", "key": "supportDocumentWrite", "value": "true"}
 
-    tag.update(parameter=[GTMParameter(new_paramter)], **update)
+    assert tag.update(parameter=[GTMParameter(new_paramter)], **update)
 
     tag_get_updated = {**tag_get, **update}
     tag_get_updated["parameter"][1] = new_paramter
@@ -100,6 +119,98 @@ def test_update(mock_service):
     assert tag.parameter[new_param_index].value == new_paramter["value"]
 
 
+def test_update_parameter_dict(mock_service):
+    service, responses = mock_service("tag_get.json", "echo_request_body")
+    tag_get = responses[0]
+    tag = GTMTag(
+        path="accounts/1234/containers/1234/workspaces/1/tags/3", service=service
+    )
+    key = tag_get["parameter"][0]["key"]
+
+    param = tag.parameter_dict[key]
+    param.value = "changed"
+
+    # the cached state is only changed by the update
+    assert tag.parameter[0].value == tag_get["parameter"][0].get("value")
+    assert tag.raw_body["parameter"][0].get("value") != "changed"
+
+    assert tag.update(parameter=[param])
+    assert tag.parameter_dict[key].value == "changed"
+
+
+def test_update_round_trip(mock_service, data_file):
+    tag_get = json.loads(data_file("tag_get.json"))
+    tag_get["consentSettings"] = {"consentStatus": "needed"}
+    tag_get["monitoringMetadataTagNameKey"] = "tagName"
+
+    service, _ = mock_service("echo_request_body")
+    tag = GTMTag(
+        tag=tag_get, parent="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+
+    assert tag.update(name="New Tag Name 1")
+
+    # fields not modelled by GTMTag are sent back unchanged
+    assert tag.raw_body["consentSettings"] == tag_get["consentSettings"]
+    assert tag.raw_body["monitoringMetadataTagNameKey"] == "tagName"
+    assert tag.raw_body["name"] == "New Tag Name 1"
+
+
+def test_update_unchanged(mock_service):
+    service, responses = mock_service("tag_get.json")
+    tag_get = responses[0]
+
+    tag = GTMTag(
+        path="accounts/1234/containers/1234/workspaces/1/tags/3", service=service
+    )
+
+    # no request is sent, the mocked http sequence would be exhausted otherwise
+    assert not tag.update()
+    assert not tag.update(name=tag_get["name"])
+    assert not tag.update(parameter=[tag.parameter[1]])
+    assert tag.raw_body == tag_get
+
+
+def test_update_fingerprint_conflict(mock_service):
+    service, _ = mock_service(
+        "tag_get.json",
+        ("409", "fingerprint_conflict.json"),
+        ("409", "fingerprint_conflict.json"),
+        "tag_get.json",
+        "echo_request_body",
+    )
+
+    tag = GTMTag(
+        path="accounts/1234/containers/1234/workspaces/1/tags/3", service=service
+    )
+
+    with pytest.raises(HttpError):
+        tag.update(name="New Tag Name 1")
+
+    # reload the tag and re-apply the update once the cached fingerprint is stale
+    assert tag.update(refresh=True, name="New Tag Name 1")
+    assert tag.name == "New Tag Name 1"
+
+
+def test_update_error_not_retried(mock_service):
+    service, _ = mock_service(
+        "tag_get.json",
+        ("400", "empty.json"),
+        "tag_get.json",
+        "echo_request_body",
+    )
+
+    tag = GTMTag(
+        path="accounts/1234/containers/1234/workspaces/1/tags/3", service=service
+    )
+
+    # the request URI carries the fingerprint, but only conflicts are retried
+    with pytest.raises(HttpError) as error:
+        tag.update(refresh=True, name="New Tag Name 1")
+    assert "fingerprint" in str(error.value)
+    assert error.value.resp.status == 400
+
+
 def test_delete(mock_service):
     service, _ = mock_service("tag_get.json", "echo_request_body")
 
@@ -108,3 +219,30 @@ def test_delete(mock_service):
     )
 
     tag.delete()
+
+
+def test_view(mock_service, data_file):
+    tag_get = json.loads(data_file("tag_get.json"))
+    view = GTMTagView(tag_get)
+
+    assert view.name == tag_get["name"]
+    assert view.path == tag_get["path"]
+    assert view.raw_body is tag_get
+    assert not hasattr(view, "service")
+    assert not hasattr(view, "__dict__")
+
+    view = pickle.loads(pickle.dumps(view))
+    assert view.raw_body == tag_get
+
+    service, _ = mock_service()
+    tag = GTMTag(tag=tag_get, service=service)
+    copy = pickle.loads(pickle.dumps(tag))
+    assert type(copy) is GTMTag  # pylint: disable=unidiomatic-typecheck
+    assert isinstance(copy, GTMBase)
+    assert copy.path == tag.path
+
+    # the API service is built on first use
+    with patch("gtm_manager.base.build_service", return_value=service) as build:
+        assert copy.service is service
+        assert copy.service is service
+    build.assert_called_once_with()
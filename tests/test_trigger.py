@@ -1,5 +1,9 @@
 # pylint: disable=missing-docstring
-from gtm_manager.trigger import GTMTrigger
+import json
+import pickle
+
+from gtm_manager.base import GTMBase
+from gtm_manager.trigger import GTMTrigger, GTMTriggerView
 
 
 def test_init(mock_service):
@@ -107,7 +111,7 @@ def test_update(mock_service):
 
     update = {"name": "New Trigger Name 1", "notes": "New Trigger Notes"}
 
-    trigger.update(**update)
+    assert trigger.update(**update)
 
     trigger_get_updated = {**trigger_get, **update}
 
@@ -115,6 +119,35 @@ def test_update(mock_service):
     assert trigger.notes == trigger_get_updated.get("notes")
 
 
+def test_update_unchanged(mock_service):
+    service, responses = mock_service("trigger_get.json")
+    trigger_get = responses[0]
+
+    trigger = GTMTrigger(
+        path="accounts/1234/containers/1234/workspaces/1/triggers/3", service=service
+    )
+
+    assert not trigger.update()
+    assert not trigger.update(name=trigger_get["name"], filter=trigger_get["filter"])
+    assert trigger.raw_body == trigger_get
+
+
+def test_update_fingerprint_conflict(mock_service):
+    service, _ = mock_service(
+        "trigger_get.json",
+        ("409", "fingerprint_conflict.json"),
+        "trigger_get.json",
+        "echo_request_body",
+    )
+
+    trigger = GTMTrigger(
+        path="accounts/1234/containers/1234/workspaces/1/triggers/3", service=service
+    )
+
+    assert trigger.update(refresh=True, name="New Trigger Name 1")
+    assert trigger.name == "New Trigger Name 1"
+
+
 def test_delete(mock_service):
     service, _ = mock_service("trigger_get.json", "echo_request_body")
 
@@ -123,3 +156,24 @@ def test_delete(mock_service):
     )
 
     trigger.delete()
+
+
+def test_view(mock_service, data_file):
+    trigger_get = json.loads(data_file("trigger_get.json"))
+    view = GTMTriggerView(trigger_get)
+
+    assert view.name == trigger_get["name"]
+    assert view.path == trigger_get["path"]
+    assert view.raw_body is trigger_get
+    assert not hasattr(view, "service")
+    assert not hasattr(view, "__dict__")
+
+    view = pickle.loads(pickle.dumps(view))
+    assert view.raw_body == trigger_get
+
+    service, _ = mock_service()
+    trigger = GTMTrigger(trigger=trigger_get, service=service)
+    copy = pickle.loads(pickle.dumps(trigger))
+    assert type(copy) is GTMTrigger  # pylint: disable=unidiomatic-typecheck
+    assert isinstance(copy, GTMBase)
+    assert copy.path == trigger.path
@@ -0,0 +1,32 @@
+# pylint: disable=missing-docstring
+from httplib2 import Response
+from googleapiclient.errors import HttpError
+
+from gtm_manager.utils import canonical_hash, strip_body, is_fingerprint_conflict
+
+
+def test_strip_body():
+    body = {"name": "Tag", "tagId": "1", "notes": None, "firingTriggerId": []}
+
+    assert strip_body(body) == {"name": "Tag"}
+
+
+def test_canonical_hash():
+    body = {"name": "Tag", "type": "html", "fingerprint": "1"}
+
+    assert canonical_hash(body) == canonical_hash(
+        {"type": "html", "name": "Tag", "fingerprint": "2", "blockingTriggerId": []}
+    )
+    assert canonical_hash(body) != canonical_hash({**body, "name": "Other Tag"})
+
+
+def test_is_fingerprint_conflict(data_file):
+    uri = "https://tagmanager.googleapis.com/v2/tags/1?fingerprint=1&alt=json"
+    conflict = data_file("fingerprint_conflict.json").encode("utf-8")
+
+    assert is_fingerprint_conflict(HttpError(Response({"status": 409}), b"", uri))
+    assert is_fingerprint_conflict(HttpError(Response({"status": 400}), conflict, uri))
+    assert not is_fingerprint_conflict(HttpError(Response({"status": 400}), b"", uri))
+    assert not is_fingerprint_conflict(
+        HttpError(Response({"status": 500}), b"fingerprint", uri)
+    )
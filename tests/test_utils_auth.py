@@ -1 +1,58 @@
 """test_utils_auth.py"""
+import time
+import threading
+from unittest import mock
+
+from httplib2 import Http
+
+from gtm_manager.utils_auth import LimittedHttp, SingleFlight
+
+
+def _concurrent(func, count=4):
+    barrier = threading.Barrier(count)
+    results = []
+
+    def run():
+        barrier.wait()
+        results.append(func())
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_single_flight():
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+        return len(calls)
+
+    flight = SingleFlight()
+
+    assert _concurrent(lambda: flight.do("key", slow)) == [1, 1, 1, 1]
+    assert flight.do("key", slow) == 2
+
+
+def test_coalesce_reads():
+    calls = []
+
+    def request(_, uri, method="GET", *args, **kwargs):
+        calls.append((method, uri))
+        time.sleep(0.2)
+        return ({"status": "200"}, b"{}")
+
+    uri = "https://www.googleapis.com/tagmanager/v2/accounts/1?alt=json"
+    headers = {"authorization": "Bearer 1"}
+
+    with mock.patch.object(Http, "request", request):
+        results = _concurrent(lambda: LimittedHttp().request(uri, headers=headers))
+        assert len(calls) == 1
+        assert all(x is results[0] for x in results)
+
+        _concurrent(lambda: LimittedHttp().request(uri, "PUT", b"{}", headers), 2)
+        assert len(calls) == 3
@@ -0,0 +1,106 @@
+# pylint: disable=missing-docstring
+import pytest
+
+import gtm_manager
+from gtm_manager.exceptions import ValidationError
+from gtm_manager.validation import get_validator
+from gtm_manager.workspace import GTMWorkspace
+from gtm_manager.tag import GTMTag
+
+
+def test_validate(mock_service):
+    service, _ = mock_service()
+    validator = get_validator(service)
+
+    assert get_validator(service) is validator
+
+    assert (
+        validator.validate(
+            "Tag",
+            {
+                "name": "Tag 1",
+                "type": "html",
+                "tagFiringOption": "ONCEPEREVENT",
+                "firingTriggerId": ["1", "2"],
+                "parameter": [
+                    {"type": "template", "key": "html", "value": "<script></script>"},
+                    {
+                        "type": "list",
+                        "key": "items",
+                        "list": [
+                            {"type": "map", "map": [{"type": "template", "key": "a"}]}
+                        ],
+                    },
+                ],
+                "unknownField": True,
+            },
+        )
+        == []
+    )
+
+    errors = validator.validate(
+        "Tag",
+        {
+            "type": "html",
+            "paused": "true",
+            "tagFiringOption": "always",
+            "parameter": [
+                {"type": "template", "value": "x"},
+                {"type": "list", "key": "items", "list": [{"type": "unknown"}]},
+            ],
+        },
+    )
+    assert errors == [
+        "Tag.name: required",
+        "Tag.paused: expected boolean, got str",
+        "Tag.tagFiringOption: 'always' is not one of "
+        + ", ".join(
+            service._rootDesc["schemas"]["Tag"]["properties"]["tagFiringOption"]["enum"]
+        ),
+        "Tag.parameter[0].key: required",
+        "Tag.parameter[1].list[0].type: 'unknown' is not one of "
+        + ", ".join(
+            service._rootDesc["schemas"]["Parameter"]["properties"]["type"]["enum"]
+        ),
+    ]
+
+    errors = validator.validate(
+        "Trigger",
+        {
+            "name": "Trigger 1",
+            "type": "click",
+            "waitForTags": {"type": "boolean", "value": "true"},
+            "filter": [{"type": "matchRegex", "parameter": [{"type": "template"}]}],
+        },
+    )
+    assert errors == ["Trigger.filter[0].parameter[0].key: required"]
+
+    with pytest.raises(ValueError):
+        validator.validate("Unknown", {})
+
+
+def test_create_tag_invalid(mock_service):
+    service, _ = mock_service("workspace_get.json")
+
+    workspace = GTMWorkspace(
+        path="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+
+    # no request is sent, the mock sequence has no further responses
+    with pytest.raises(ValidationError) as error:
+        workspace.create_tag({"name": "Tag 1", "parameter": {}})
+    assert error.value.errors == [
+        "Tag.type: required",
+        "Tag.parameter: expected array, got dict",
+    ]
+
+
+def test_validate_bodies_disabled(mock_service, monkeypatch):
+    service, _ = mock_service("workspace_get.json", "tag_get.json")
+    monkeypatch.setattr(gtm_manager, "VALIDATE_BODIES", False)
+
+    workspace = GTMWorkspace(
+        path="accounts/1234/containers/1234/workspaces/1", service=service
+    )
+
+    assert isinstance(workspace.create_tag({"name": "Tag 1"}), GTMTag)
@@ -1,5 +1,9 @@
 # pylint: disable=missing-docstring
-from gtm_manager.variable import GTMVariable
+import json
+import pickle
+
+from gtm_manager.base import GTMBase
+from gtm_manager.variable import GTMVariable, GTMVariableView
 from gtm_manager.parameter import GTMParameter
 
 
@@ -43,7 +47,7 @@ def test_update(mock_service):
 
     new_paramter = {"type": "template", "key": "value", "value": "brandss"}
 
-    variable.update(parameter=[GTMParameter(new_paramter)], **update)
+    assert variable.update(parameter=[GTMParameter(new_paramter)], **update)
 
     variable_get_updated = {**variable_get, **update}
     variable_get_updated["parameter"][0] = new_paramter
@@ -56,6 +60,35 @@ def test_update(mock_service):
     assert variable.parameter[0].value == new_paramter["value"]
 
 
+def test_update_unchanged(mock_service):
+    service, responses = mock_service("variable_get.json")
+    variable_get = responses[0]
+
+    variable = GTMVariable(
+        path="accounts/1234/containers/1234/workspaces/1/variables/3", service=service
+    )
+
+    assert not variable.update()
+    assert not variable.update(notes=None, parameter=[variable.parameter[0]])
+    assert variable.raw_body == variable_get
+
+
+def test_update_fingerprint_conflict(mock_service):
+    service, _ = mock_service(
+        "variable_get.json",
+        ("409", "fingerprint_conflict.json"),
+        "variable_get.json",
+        "echo_request_body",
+    )
+
+    variable = GTMVariable(
+        path="accounts/1234/containers/1234/workspaces/1/variables/3", service=service
+    )
+
+    assert variable.update(refresh=True, name="New Variable Name 1")
+    assert variable.name == "New Variable Name 1"
+
+
 def test_delete(mock_service):
     service, _ = mock_service("variable_get.json", "echo_request_body")
 
@@ -64,3 +97,32 @@ def test_delete(mock_service):
     )
 
     variable.delete()
+
+
+def test_view(mock_service, data_file):
+    variable_get = json.loads(data_file("variable_get.json"))
+    view = GTMVariableView(variable_get)
+
+    assert view.name == variable_get["name"]
+    assert view.path == variable_get["path"]
+    assert view.raw_body is variable_get
+    assert not hasattr(view, "service")
+    assert not hasattr(view, "__dict__")
+
+    view = pickle.loads(pickle.dumps(view))
+    assert view.raw_body == variable_get
+
+    service, _ = mock_service()
+    variable = GTMVariable(variable=variable_get, service=service)
+    copy = pickle.loads(pickle.dumps(variable))
+    assert type(copy) is GTMVariable  # pylint: disable=unidiomatic-typecheck
+    assert isinstance(copy, GTMBase)
+    assert copy.path == variable.path
+
+
+def test_constant_value(data_file):
+    variable_get = json.loads(data_file("variable_get.json"))
+    view = GTMVariableView(variable_get)
+
+    assert view.constant_value() == view.parameter_dict["value"].value
+    assert GTMVariableView({**variable_get, "type": "v"}).constant_value() is None
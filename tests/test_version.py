@@ -1,6 +1,10 @@
 # pylint: disable=missing-docstring
-from gtm_manager.tag import GTMTag
-from gtm_manager.version import GTMVersion
+import json
+import pickle
+
+from gtm_manager.base import GTMBase
+from gtm_manager.tag import GTMTag, GTMTagView
+from gtm_manager.version import GTMVersion, GTMVersionView, GTMVersionHeader
 from gtm_manager.trigger import GTMTrigger
 from gtm_manager.variable import GTMVariable
 from gtm_manager.folder import GTMFolder
@@ -56,3 +60,68 @@ def test_init(mock_service):
     assert all(isinstance(x, GTMVariable) for x in version.variable)
     assert all(isinstance(x, GTMFolder) for x in version.folder)
     assert isinstance(version.raw_body, dict)
+
+
+def test_lazy_entities(mock_service):
+    service, responses = mock_service("version_get.json")
+    version = GTMVersion(
+        path="accounts/1234/containers/1234/versions/1", service=service
+    )
+    version_get = responses[0]
+
+    # raw_body is the single source of truth, wrappers are created on first access
+    assert version.containerVersionId == version_get["containerVersionId"]
+    assert version.tag[0].raw_body == version_get["tag"][0]
+    assert version.tag is version.tag
+    assert version.container.raw_body == version_get["container"]
+
+    version = GTMVersion(version=version_get, workspaceId="1", service=service)
+
+    assert version.workspace_path == "accounts/1234/containers/1234/workspaces/1"
+    assert version.tag[0].path == "accounts/1234/containers/1234/workspaces/1/tags/1"
+    assert (
+        version.folder[0].path == "accounts/1234/containers/1234/workspaces/1/folders/7"
+    )
+
+
+def test_view(mock_service, data_file):
+    version_get = json.loads(data_file("version_get.json"))
+    view = GTMVersionView(version_get, workspaceId="1")
+
+    assert view.containerVersionId == version_get["containerVersionId"]
+    assert all(isinstance(x, GTMTagView) for x in view.tag)
+    assert view.tag[0].path == "accounts/1234/containers/1234/workspaces/1/tags/1"
+    assert not hasattr(view, "service")
+
+    view = pickle.loads(pickle.dumps(view))
+    assert view.raw_body == version_get
+    assert view.workspace_path == "accounts/1234/containers/1234/workspaces/1"
+
+    service, _ = mock_service()
+    version = GTMVersion(version=version_get, service=service)
+    copy = pickle.loads(pickle.dumps(version))
+    assert type(copy) is GTMVersion  # pylint: disable=unidiomatic-typecheck
+    assert isinstance(copy, GTMBase)
+    copy.service = service
+    assert [x.name for x in copy.trigger] == [x.name for x in version.trigger]
+
+
+def test_version_header(data_file):
+    body = json.loads(data_file("version_headers_list.json"))[
+        "containerVersionHeader"
+    ][0]
+    header = GTMVersionHeader(body)
+
+    assert header.path == body["path"]
+    assert header.path.container_id == body["containerId"]
+    assert header.accountId == body["accountId"]
+    assert header.containerId == body["containerId"]
+    assert header.containerVersionId == body["containerVersionId"]
+    assert header.name == body["name"]
+    assert header.numTags == body["numTags"]
+    assert header.numTriggers == body["numTriggers"]
+    assert header.numVariables == body["numVariables"]
+    assert header.numRules == body["numRules"]
+    assert header.numZones == body["numZones"]
+    assert header.numMacros is None
+    assert header.deleted is None
@@ -0,0 +1,191 @@
+# pylint: disable=missing-docstring
+import json
+
+from gtm_manager.container import GTMContainer
+from gtm_manager.version import GTMVersionView
+from gtm_manager.watcher import GTMWatcher, diff_versions, workspace_changes
+
+PATH = "accounts/1234/containers/1234"
+
+
+def test_diff_versions():
+    previous = GTMVersionView(
+        {
+            "tag": [
+                {"tagId": "1", "name": "A", "type": "html"},
+                {"tagId": "2", "name": "B", "type": "html"},
+            ],
+            "trigger": [{"triggerId": "1", "name": "Click", "fingerprint": "1"}],
+        }
+    )
+    current = GTMVersionView(
+        {
+            "tag": [
+                {"tagId": "1", "name": "A", "type": "ua"},
+                {"tagId": "3", "name": "C", "type": "html"},
+            ],
+            "trigger": [{"triggerId": "1", "name": "Click", "fingerprint": "2"}],
+        }
+    )
+
+    assert diff_versions(previous, current) == [
+        {"action": "updated", "type": "tag", "id": "1", "name": "A"},
+        {"action": "added", "type": "tag", "id": "3", "name": "C"},
+        {"action": "deleted", "type": "tag", "id": "2", "name": "B"},
+    ]
+    assert diff_versions(current, current) == []
+
+
+def test_workspace_changes(data_file):
+    status = json.loads(data_file("status_get.json"))
+
+    assert workspace_changes(status) == [
+        {"action": "updated", "type": "tag", "id": "2", "name": "Tag 1"}
+    ]
+    assert workspace_changes({}) == []
+
+
+def test_watcher(mock_service, data_file):
+    service, responses = mock_service(
+        "container_get.json",
+        "version_headers_list.json",
+        "workspace_list.json",
+        "version_headers_bisect.json",
+        "workspace_list_edited.json",
+        "status_get.json",
+        "version_headers_bisect.json",
+        "workspace_list_edited.json",
+    )
+    container = GTMContainer(path=PATH, service=service)
+
+    headers = json.loads(data_file("version_headers_bisect.json"))
+    cache = {
+        x["path"]: GTMVersionView(
+            {
+                "tag": [
+                    {"tagId": str(i), "name": str(i)} for i in range(int(x["numTags"]))
+                ]
+            }
+        )
+        for x in headers["containerVersionHeader"]
+        if not x.get("deleted")
+    }
+    now = [0]
+    watcher = GTMWatcher(
+        [container],
+        cache=cache,
+        min_interval=60,
+        max_interval=600,
+        live_interval=None,
+        clock=lambda: now[0],
+    )
+
+    # the first poll records the state
+    assert watcher.poll_due() == []
+    assert watcher.next_poll() == 120
+    assert watcher.poll_due() == []
+
+    # a new version and an edited workspace
+    now[0] = 120
+    events = watcher.poll_due()
+
+    assert [(x["type"], x["path"].split("/")[-1]) for x in events] == [
+        ("version", str(i)) for i in range(2, 11)
+    ] + [("workspace", "1")]
+    assert events[0]["changes"] == [
+        {"action": "added", "type": "tag", "id": "1", "name": "1"}
+    ]
+    assert events[-1]["changes"] == workspace_changes(responses[5])
+    assert watcher.next_poll() == 180
+
+    # no changes, the interval grows again
+    now[0] = 180
+    assert watcher.poll_due() == []
+    assert watcher.next_poll() == 300
+
+
+def test_watcher_failed_poll(mock_service):
+    service, _ = mock_service(
+        "container_get.json",
+        "version_headers_list.json",
+        "workspace_list.json",
+        "version_headers_bisect.json",
+        ("500", "empty.json"),
+        "version_headers_bisect.json",
+        "workspace_list.json",
+    )
+    container = GTMContainer(path=PATH, service=service)
+    cache = {"{}/versions/{}".format(PATH, i): GTMVersionView({}) for i in range(1, 11)}
+    now = [0]
+    watcher = GTMWatcher(
+        [container], cache=cache, live_interval=None, clock=lambda: now[0]
+    )
+
+    assert watcher.poll_due() == []
+
+    # the workspaces fail to load, the new versions are reported by the next poll
+    now[0] = 1000
+    assert watcher.poll_due() == []
+    now[0] = 2000
+    events = watcher.poll_due()
+    assert [x["path"].split("/")[-1] for x in events] == [str(i) for i in range(2, 11)]
+
+
+def test_watcher_publish(mock_service):
+    service, responses = mock_service(
+        "container_get.json",
+        "version_headers_bisect.json",
+        "workspace_list.json",
+        "version_live.json",
+        "version_headers_bisect.json",
+        "workspace_list.json",
+        "version_headers_bisect.json",
+        "workspace_list.json",
+        "version_get.json",
+    )
+    container = GTMContainer(path=PATH, service=service)
+    now = [0]
+    watcher = GTMWatcher(
+        [container], min_interval=60, live_interval=300, clock=lambda: now[0]
+    )
+
+    assert watcher.poll_due() == []
+
+    # the live version is not polled yet
+    now[0] = 120
+    assert watcher.poll_due() == []
+
+    # rolled back to an existing version, which adds no version header
+    now[0] = 360
+    events = watcher.poll_due()
+    assert [(x["type"], x["path"], x["name"]) for x in events] == [
+        ("publish", responses[8]["path"], "Version 1")
+    ]
+    assert events[0]["changes"] == [
+        {"action": "added", "type": "tag", "id": "1", "name": "HTML - Helper"}
+    ]
+    live = watcher.cache[responses[3]["path"]]
+    assert type(live) is GTMVersionView  # pylint: disable=unidiomatic-typecheck
+    assert live.containerVersionId == "2"
+    assert all(isinstance(x, GTMVersionView) for x in watcher.cache.values())
+
+
+def test_watcher_budget(mock_service):
+    service, _ = mock_service("container_get.json")
+    containers = [GTMContainer(path=PATH, service=service)]
+    watcher = GTMWatcher(
+        containers, min_interval=1, calls=1, period=10, clock=lambda: 0
+    )
+
+    # 2 calls every second need 20 calls per 10 seconds, 20 times the budget
+    assert watcher._stretch() == 20  # pylint: disable=protected-access
+
+
+def test_run(mock_service):
+    service, _ = mock_service("container_get.json", ("500", "empty.json"))
+    container = GTMContainer(path=PATH, service=service)
+    slept = []
+    watcher = GTMWatcher([container], min_interval=30, clock=lambda: 0)
+
+    watcher.run(print, sleep=slept.append, iterations=1)
+    assert slept == [60]